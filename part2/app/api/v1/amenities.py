@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.paging import page_parser
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -26,10 +27,12 @@ class AmenityList(Resource):
         except (ValueError, TypeError):
             return {"error": "Invalid input data"}, 400
 
+    @api.expect(page_parser)
     @api.response(200, 'List of amenities retrieved successfully')
     def get(self):
         """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
+        args = page_parser.parse_args()
+        amenities = facade.get_all_amenities(args["limit"], args["offset"])
         return amenities, 200
 
 
@@ -0,0 +1,11 @@
+"""
+limit and offset query parameters of the list endpoints.
+Both are optional: without them a list endpoint returns everything.
+"""
+from flask_restx import inputs, reqparse
+
+page_parser = reqparse.RequestParser()
+page_parser.add_argument("limit", type=inputs.natural, required=False,
+                         help="Return at most this many items")
+page_parser.add_argument("offset", type=inputs.natural, required=False, default=0,
+                         help="Skip this many items first")
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.paging import page_parser
 
 api = Namespace('places', description='Place operations')
 
@@ -41,10 +42,12 @@ class PlaceList(Resource):
         except Exception as e:
             return {"error": str(e)}, 400
 
+    @api.expect(page_parser)
     @api.response(200, 'List of places retrieved successfully')
     def get(self):
         """Retrieve a list of all places"""
-        result = facade.get_all_places()
+        args = page_parser.parse_args()
+        result = facade.get_all_places(args["limit"], args["offset"])
         return result, 200
 
 @api.route('/<place_id>')
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.paging import page_parser
 
 api = Namespace('reviews', description='Review operations')
 
@@ -30,10 +31,12 @@ class ReviewList(Resource):
         except (ValueError, TypeError):
             return {"error": "Invalid input data"}, 400
 
+    @api.expect(page_parser)
     @api.response(200, 'List of reviews retrieved successfully')
     def get(self):
         """Retrieve a list of all reviews"""
-        return facade.get_all_reviews(), 200
+        args = page_parser.parse_args()
+        return facade.get_all_reviews(args["limit"], args["offset"]), 200
 
 
 @api.route('/<review_id>')
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from ...services import facade
+from .paging import page_parser
 
 api = Namespace("users", description="User operations")
 
@@ -17,7 +18,7 @@ user_create_model = api.model("UserCreate", {
 })
 
 # Parser pour les query params
-user_query_parser = api.parser()
+user_query_parser = page_parser.copy()
 user_query_parser.add_argument(
     "email",
     type=str,
@@ -42,7 +43,7 @@ class UserList(Resource):
                 api.abort(404, "User not found")
             return [user]
 
-        return facade.get_all_users()
+        return facade.get_all_users(args["limit"], args["offset"])
 
     @api.expect(user_create_model, validate=True)
     @api.marshal_with(user_model, code=201)
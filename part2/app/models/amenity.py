@@ -2,6 +2,8 @@ from .base import BaseModel
 
 
 class Amenity(BaseModel):
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         super().__init__()
         self.name = self._validate_name(name)
@@ -2,6 +2,10 @@ import uuid
 from datetime import datetime
 
 class BaseModel:
+    # Attributes live in fixed slots instead of a per-instance dict:
+    # subclasses declare theirs, and undeclared attributes cannot be set.
+    __slots__ = ("id", "created_at", "updated_at")
+
     def __init__(self):
         self.id = str(uuid.uuid4())
         now = datetime.utcnow()
@@ -4,6 +4,9 @@ from .amenity import Amenity
 
 
 class Place(BaseModel):
+    __slots__ = ("title", "description", "price", "latitude", "longitude", "owner",
+                 "reviews", "amenities")
+
     def __init__(
         self,
         title: str,
@@ -92,5 +95,12 @@ class Place(BaseModel):
             self.longitude = self._validate_longitude(data["longitude"])
         if "owner" in data:
             self.owner = self._validate_owner(data["owner"])
+        if "amenities" in data:
+            amenities = []
+            for amenity in data["amenities"]:
+                if not isinstance(amenity, Amenity):
+                    raise ValueError("amenity must be an Amenity")
+                amenities.append(amenity)
+            self.amenities = amenities
 
         self.save()
\ No newline at end of file
@@ -4,6 +4,8 @@ from .place import Place
 
 
 class Review(BaseModel):
+    __slots__ = ("text", "rating", "place", "user")
+
     def __init__(self, text: str, rating: int, place: Place, user: User):
         super().__init__()
         self.text = self._validate_text(text)
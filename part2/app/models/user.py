@@ -5,6 +5,8 @@ EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 class User(BaseModel):
+    __slots__ = ("first_name", "last_name", "email", "is_admin")
+
     def __init__(self, first_name: str, last_name: str, email: str, is_admin: bool = False):
         super().__init__()
         self.first_name = self._validate_name(first_name, "first_name", 50)
@@ -0,0 +1,172 @@
+"""
+Columnar in-memory storage.
+
+ColumnarRepository keeps one list per model attribute (a column) instead
+of one object per entity: a stored entity is a row number in every
+column. Numeric fields (TYPECODES) go into typed arrays, 8 bytes per
+float or timestamp and 1 byte per rating instead of a pointer to a
+Python object. Empty reviews/amenities lists are only created when first
+read.
+
+get() and get_all() return row views: instances of a subclass of the
+model whose attributes read and write the columns, so the model's
+validation and methods (update(), add_amenity()) work unchanged. A view
+is created on each call and holds nothing but its row number: two views
+of a row are distinct objects that compare equal and always show the
+same values, and a view kept in another entity (a place's owner) follows
+later updates.
+
+Only the model's slot attributes are stored. Rows of deleted entities
+are not reused, so a view kept elsewhere never shows another entity.
+"""
+from array import array
+from datetime import datetime, timedelta
+
+from app.persistence.repository import Repository
+
+# Fields stored in typed arrays: floats as C doubles, ratings (1-5) as bytes,
+# timestamps as 64-bit microseconds since the epoch
+TYPECODES = {"price": "d", "latitude": "d", "longitude": "d", "rating": "b",
+             "created_at": "q", "updated_at": "q"}
+TIMESTAMPS = ("created_at", "updated_at")
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# List fields stored as None while empty
+LAZY_LISTS = ("reviews", "amenities")
+
+
+def _micros(value):
+    return (value - EPOCH) // _MICROSECOND
+
+
+def model_fields(model):
+    """Slot attributes of a model class and its bases, base class first."""
+    names = []
+    for klass in reversed(model.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                names.append(name)
+    return names
+
+
+def _same_row(view, other):
+    if type(other) is not type(view):
+        return NotImplemented
+    return view._row == other._row
+
+
+def _row_hash(view):
+    return hash(view._row)
+
+
+class _Column:
+    """Attribute of a row view, backed by one column of the repository."""
+
+    def __init__(self, column):
+        self.column = column
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return self.column[view._row]
+
+    def __set__(self, view, value):
+        self.column[view._row] = value
+
+
+class _TimestampColumn(_Column):
+    """Naive UTC datetimes, kept exactly as microseconds."""
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return EPOCH + timedelta(microseconds=self.column[view._row])
+
+    def __set__(self, view, value):
+        self.column[view._row] = _micros(value)
+
+
+class _LazyListColumn(_Column):
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = self.column[view._row]
+        if value is None:
+            value = self.column[view._row] = []
+        return value
+
+
+class ColumnarRepository(Repository):
+    def __init__(self, model):
+        self.model = model
+        self._fields = model_fields(model)
+        self._columns = {name: array(TYPECODES[name]) if name in TYPECODES else []
+                         for name in self._fields}
+        self._ids = self._columns["id"]
+        self._rows = {}   # id -> row number
+        attributes = {"__slots__": ("_row",), "__eq__": _same_row, "__hash__": _row_hash}
+        for name, column in self._columns.items():
+            if name in LAZY_LISTS:
+                attributes[name] = _LazyListColumn(column)
+            elif name in TIMESTAMPS:
+                attributes[name] = _TimestampColumn(column)
+            else:
+                attributes[name] = _Column(column)
+        self._view_class = type(model.__name__, (model,), attributes)
+
+    def _view(self, row):
+        view = object.__new__(self._view_class)
+        view._row = row
+        return view
+
+    def add(self, obj):
+        if not isinstance(obj, self.model):
+            raise ValueError(f"obj must be a {self.model.__name__}")
+        row = self._rows.get(obj.id)
+        if row is None:
+            row = len(self._ids)
+            for column in self._columns.values():
+                column.append(0 if isinstance(column, array) else None)
+        for name in self._fields:
+            value = getattr(obj, name, None)
+            if name in LAZY_LISTS and value == []:
+                value = None
+            elif name in TIMESTAMPS:
+                value = _micros(value)
+            self._columns[name][row] = value
+        self._rows[obj.id] = row
+
+    def get(self, obj_id):
+        row = self._rows.get(obj_id)
+        return None if row is None else self._view(row)
+
+    def get_all(self):
+        return [self._view(row) for row in self._rows.values()]
+
+    def update(self, obj_id, data):
+        obj = self.get(obj_id)
+        if obj:
+            obj.update(data)
+
+    def delete(self, obj_id):
+        row = self._rows.pop(obj_id, None)
+        if row is None:
+            return
+        for column in self._columns.values():
+            if not isinstance(column, array):
+                # Drop the references; the row number is never handed out again
+                column[row] = None
+
+    def get_by_attribute(self, attr_name, attr_value):
+        column = self._columns.get(attr_name)
+        if column is None:
+            return next((obj for obj in self.get_all()
+                         if getattr(obj, attr_name) == attr_value), None)
+        if attr_name in TIMESTAMPS and isinstance(attr_value, datetime):
+            attr_value = _micros(attr_value)
+        ids = self._ids
+        for row, value in enumerate(column):
+            if value == attr_value and ids[row] is not None:
+                return self._view(row)
+        return None
@@ -0,0 +1,360 @@
+"""
+Durable in-memory storage.
+
+DurableRepository is a ConcurrentRepository whose changes are also
+written to disk, so the data survives a restart. The repositories of one
+data directory share a DurableStore, which owns the files:
+
+- Write-ahead log: every add(), update() and delete() appends one record,
+  the entity's full state after the change (other entities as ids) or its
+  deletion. The record is handed to the OS before the call returns, so a
+  crash of the process loses nothing. It reaches the disk with its group:
+  one fsync every `group_size` records, or `group_interval` seconds after
+  the first record of the group, whichever comes first. A power loss
+  loses at most the last group.
+- Snapshots: once the log since the last snapshot holds `snapshot_every`
+  records, and at least as many records as the store holds entities, the
+  log starts a new segment and a thread writes the whole store to a new
+  snapshot file; the older segments and snapshots are removed once it is
+  on disk. Tying the interval to the store size keeps the snapshot cost
+  at most one entity written per record, and the log to replay no longer
+  than the snapshot.
+- Recovery: recover() loads the latest snapshot and replays the log
+  records after it. A record cut short by a crash ends the replay of its
+  segment.
+
+The models are changed in place (obj.update(data)), so a change is only
+logged when it goes through the repository: the facade calls update()
+for every change it makes.
+
+Files in the data directory:
+  snapshot-<seq>.ndjson  header line {"seq": last record before it}, then
+                         one {"model", "data"} line per entity
+  wal-<seq>.log          records from <seq> on, one per line:
+                         "<crc32 hex> <json>"
+  lock                   held by the open store: one store per directory
+"""
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: the directory is not locked
+    fcntl = None
+
+from app.models.base import BaseModel
+from app.persistence.columnar import model_fields
+from app.persistence.repository import ConcurrentRepository
+
+GROUP_SIZE = 64
+GROUP_INTERVAL = 0.01      # seconds
+SNAPSHOT_EVERY = 100_000   # records
+_PLAIN = (str, float, int, bool, type(None))
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _encode(value):
+    """JSON-ready value; entities become {"$ref": [model, id]}."""
+    if type(value) in _PLAIN:
+        return value
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, BaseModel):
+        return {"$ref": [type(value).__name__, value.id]}
+    return value
+
+
+def _decode(value, resolve):
+    if type(value) in _PLAIN:
+        return value
+    if isinstance(value, dict):
+        if "$ref" in value:
+            return resolve(*value["$ref"])
+        return datetime.fromisoformat(value["$dt"])
+    if isinstance(value, list):
+        return [_decode(item, resolve) for item in value]
+    return value
+
+
+def _seq_of(name):
+    return int(name.split("-", 1)[1].split(".", 1)[0])
+
+
+class DurableRepository(ConcurrentRepository):
+    """
+    ConcurrentRepository that logs its changes to a DurableStore. A change
+    is logged under the repository's write lock, so the log has the
+    changes of an entity in the order they were made.
+    """
+
+    def __init__(self, store, model, indexes=()):
+        super().__init__(indexes)
+        self.model = model
+        self._store = store
+
+    def _stored(self, obj):
+        self._store.log_put(self, obj)
+
+    def _removed(self, obj_id):
+        self._store.log_delete(self, obj_id)
+
+
+class DurableStore:
+    """Write-ahead log and snapshots of the repositories of one data directory."""
+
+    def __init__(self, directory, group_size=GROUP_SIZE, group_interval=GROUP_INTERVAL,
+                 snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self._repositories = {}   # model name -> DurableRepository
+        self._fields = {}
+        self._lock = threading.Lock()
+        self._group = threading.Condition(self._lock)
+        self._file = None
+        self._seq = 0             # last record written
+        self._pending = 0         # records written since the last fsync
+        self._since_snapshot = 0
+        self._closed = False
+        self._flusher = None
+        self._snapshotter = None
+        self._lock_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def repository(self, model, indexes=()):
+        """The DurableRepository of a model; create them all before recover()."""
+        repository = DurableRepository(self, model, indexes)
+        self._repositories[model.__name__] = repository
+        self._fields[model.__name__] = [name for name in model_fields(model) if name != "id"]
+        return repository
+
+    # Recovery
+
+    def recover(self):
+        """Load the latest snapshot and the log after it, then open the log for writing."""
+        self._lock_directory()
+        names = os.listdir(self.directory)
+        for name in names:
+            if name.endswith(".tmp"):
+                # A snapshot interrupted before its rename
+                os.remove(self._path(name))
+        snapshots = sorted((n for n in names if n.startswith("snapshot-") and n.endswith(".ndjson")),
+                           key=_seq_of)
+        segments = sorted((n for n in names if n.startswith("wal-") and n.endswith(".log")), key=_seq_of)
+
+        self._stubs = {}
+        snapshot_seq = 0
+        if snapshots:
+            snapshot_seq = self._load_snapshot(self._path(snapshots[-1]))
+        self._seq = snapshot_seq
+        for name in segments:
+            self._replay(self._path(name), snapshot_seq)
+        for name, obj_id in self._stubs:
+            # Referenced, but deleted before the snapshot: keep it out of the repository
+            self._repositories[name]._storage.pop(obj_id, None)
+        del self._stubs
+        for repository in self._repositories.values():
+            repository._reindex()
+
+        self._since_snapshot = self._seq - snapshot_seq
+        self._open_segment()
+        self._flusher = threading.Thread(target=self._flush_groups, name="wal-flusher", daemon=True)
+        self._flusher.start()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _lock_directory(self):
+        self._lock_file = open(self._path("lock"), "w")
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            raise RuntimeError(f"{self.directory} is already used by another store") from None
+
+    def _resolve(self, name, obj_id):
+        """The entity with this id, or an empty one that a later record fills in."""
+        storage = self._repositories[name]._storage
+        obj = storage.get(obj_id)
+        if obj is None:
+            obj = object.__new__(self._repositories[name].model)
+            obj.id = obj_id
+            storage[obj_id] = obj
+            self._stubs[name, obj_id] = obj
+        return obj
+
+    def _put(self, name, obj_id, data):
+        obj = self._resolve(name, obj_id)
+        self._stubs.pop((name, obj_id), None)
+        resolve = self._resolve
+        for field, value in data.items():
+            setattr(obj, field, value if type(value) in _PLAIN else _decode(value, resolve))
+
+    def _load_snapshot(self, path):
+        with open(path, encoding="utf-8") as f:
+            seq = json.loads(f.readline())["seq"]
+            for line in f:
+                entity = json.loads(line)
+                data = entity["data"]
+                self._put(entity["model"], data.pop("id"), data)
+        return seq
+
+    def _replay(self, path, after):
+        with open(path, "rb") as f:
+            for line in f:
+                crc, _, payload = line.rstrip(b"\n").partition(b" ")
+                if not line.endswith(b"\n") or crc != b"%08x" % zlib.crc32(payload):
+                    break   # cut short by a crash: nothing valid follows in this segment
+                record = json.loads(payload)
+                if record["seq"] <= after:
+                    continue
+                if record["op"] == "put":
+                    data = record["data"]
+                    self._put(record["model"], data.pop("id"), data)
+                else:
+                    self._repositories[record["model"]]._storage.pop(record["id"], None)
+                self._seq = record["seq"]
+
+    # Writing
+
+    def _state(self, repository, obj):
+        state = {"id": obj.id}
+        for field in self._fields[repository.model.__name__]:
+            state[field] = _encode(getattr(obj, field, None))
+        return state
+
+    def log_put(self, repository, obj):
+        self._append({"op": "put", "model": repository.model.__name__,
+                      "data": self._state(repository, obj)})
+
+    def log_delete(self, repository, obj_id):
+        self._append({"op": "delete", "model": repository.model.__name__, "id": obj_id})
+
+    def _append(self, record):
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("DurableStore.recover() has not been called")
+            self._seq += 1
+            record["seq"] = self._seq
+            payload = _dumps(record).encode()
+            self._file.write(b"%08x %s\n" % (zlib.crc32(payload), payload))
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.group_size:
+                self._sync()
+            elif self._pending == 1:
+                self._group.notify()
+            self._since_snapshot += 1
+            if (self._snapshotter is None and self._since_snapshot >= self.snapshot_every
+                    and self._since_snapshot >= self._entities()):
+                self._start_snapshot()
+
+    def _entities(self):
+        return sum(len(repository._storage) for repository in self._repositories.values())
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def _flush_groups(self):
+        """Fsync a group `group_interval` seconds after its first record."""
+        with self._group:
+            while not self._closed:
+                if not self._pending:
+                    self._group.wait()
+                    continue
+                self._group.wait(self.group_interval)
+                if self._pending and not self._closed:
+                    self._sync()
+
+    def sync(self):
+        """Fsync the records written so far."""
+        with self._lock:
+            if self._pending:
+                self._sync()
+
+    def _open_segment(self):
+        self._file = open(self._path(f"wal-{self._seq + 1:016d}.log"), "wb")
+        self._fsync_directory()
+
+    def _fsync_directory(self):
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    # Snapshots
+
+    def snapshot(self):
+        """Write a snapshot now and wait for it."""
+        with self._lock:
+            if self._snapshotter is None:
+                self._start_snapshot()
+            snapshotter = self._snapshotter
+        snapshotter.join()
+
+    def _start_snapshot(self):
+        """
+        Start a new log segment and write the snapshot from a thread, so
+        writes go on meanwhile. The snapshot is fuzzy: an entity changed
+        while it is written may be saved in either state, and the records
+        after `seq` that recovery replays over it bring it up to date.
+        Called with the lock held.
+        """
+        seq = self._seq
+        self._sync()
+        self._file.close()
+        self._open_segment()
+        self._since_snapshot = 0
+        # Not under the repositories' locks: a writer holds its repository's
+        # lock while it waits for this one. Copying a dict's values is atomic.
+        entities = [(name, repository, list(repository._storage.values()))
+                    for name, repository in self._repositories.items()]
+        self._snapshotter = threading.Thread(target=self._write_snapshot, args=(seq, entities),
+                                             name="snapshot", daemon=True)
+        self._snapshotter.start()
+
+    def _write_snapshot(self, seq, entities):
+        name = f"snapshot-{seq:016d}.ndjson"
+        try:
+            with open(self._path(name + ".tmp"), "w", encoding="utf-8") as f:
+                f.write(_dumps({"seq": seq}) + "\n")
+                for model_name, repository, objects in entities:
+                    for obj in objects:
+                        f.write(_dumps({"model": model_name, "data": self._state(repository, obj)}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self._path(name + ".tmp"), self._path(name))
+            self._fsync_directory()
+            for old in os.listdir(self.directory):
+                if old != name and (old.startswith("snapshot-") or
+                                    (old.startswith("wal-") and _seq_of(old) <= seq)):
+                    os.remove(self._path(old))
+        finally:
+            with self._lock:
+                self._snapshotter = None
+
+    def close(self):
+        """Wait for a running snapshot, fsync the last group and close the log."""
+        snapshotter = self._snapshotter
+        if snapshotter is not None:
+            snapshotter.join()
+        with self._lock:
+            if self._file is None or self._closed:
+                return
+            self._closed = True
+            self._group.notify()
+            self._sync()
+            self._file.close()
+        self._flusher.join()
+        self._lock_file.close()
@@ -1,4 +1,8 @@
+import threading
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from itertools import islice
+from operator import attrgetter
 
 class Repository(ABC):
     @abstractmethod
@@ -25,6 +29,23 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    def find(self, limit=None, offset=0, **attrs):
+        """
+        The objects whose attributes equal the keyword values, at most
+        limit of them after skipping offset, as an iterable.
+        """
+        matches = (obj for obj in self.get_all()
+                   if all(getattr(obj, name) == value for name, value in attrs.items()))
+        return islice(matches, offset, None if limit is None else offset + limit)
+
+    def locked(self):
+        """
+        Context in which a check followed by writes (is this email taken?
+        then add) is not interleaved with other writes. Only thread-safe
+        repositories lock anything.
+        """
+        return nullcontext()
+
 
 class InMemoryRepository(Repository):
     def __init__(self):
@@ -49,4 +70,371 @@ class InMemoryRepository(Repository):
             del self._storage[obj_id]
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
\ No newline at end of file
+        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+
+class ReadWriteLock:
+    """
+    Many readers or one writer: `with lock.read():` / `with lock.write():`.
+    A waiting writer goes before new readers. The writing thread may take
+    the lock again, to read or to write; a reader must not take it again.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None   # ident of the writing thread
+        self._depth = 0       # nested acquisitions by the writer
+        self._waiting_writers = 0
+        self._read = _ReadSide(self)
+        self._write = _WriteSide(self)
+
+    def read(self):
+        return self._read
+
+    def write(self):
+        return self._write
+
+    def _acquire_read(self):
+        if self._writer == threading.get_ident():
+            self._depth += 1
+            return
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def _release_read(self):
+        if self._writer == threading.get_ident():
+            self._depth -= 1
+            return
+        with self._cond:
+            self._readers -= 1
+            if not self._readers and self._waiting_writers:
+                self._cond.notify_all()
+
+    def _acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._depth += 1
+            return
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+
+    def _release_write(self):
+        if self._depth:
+            self._depth -= 1
+            return
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+
+
+class _ReadSide:
+    # Plain __enter__/__exit__: a @contextmanager generator costs more than the lock
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock._acquire_read()
+
+    def __exit__(self, *exc):
+        self._lock._release_read()
+
+
+class _WriteSide(_ReadSide):
+    __slots__ = ()
+
+    def __enter__(self):
+        self._lock._acquire_write()
+
+    def __exit__(self, *exc):
+        self._lock._release_write()
+
+
+class _Entry:
+    """A stored object with the versions of the writes that added and deleted it."""
+    __slots__ = ("obj", "added", "deleted")
+
+    def __init__(self, obj, added):
+        self.obj = obj
+        self.added = added
+        self.deleted = None
+
+
+_entry_obj = attrgetter("obj")
+
+
+class SnapshotView:
+    """
+    The objects of a ConcurrentRepository as of one version, returned by
+    get_all(). Taking it copies nothing: it keeps the repository's entry
+    list and the version, and iterating it skips the entries added or
+    deleted by later writes. The objects themselves are the live ones, as
+    in a list copy.
+
+    where() and limit() return narrower views; nothing is read before the
+    view is iterated, and iteration stops once the limit is reached. Only
+    the views of get_all() have a len(), their size being known: list()
+    would otherwise read a narrower view twice, once to size the list.
+
+    A view is dense when the list held no deleted entries as it was taken:
+    its objects are then the first `count` entries, since the list only
+    grows at the end (compaction builds a new one), and an unfiltered
+    dense view is iterated without checking the entries.
+    """
+    __slots__ = ("_repository", "_entries", "_version", "_count", "_dense", "_attrs",
+                 "_predicate", "_offset", "_limit")
+
+    def __init__(self, repository, entries, version, count, dense=False, attrs=(),
+                 predicate=None, offset=0, limit=None):
+        self._repository = repository
+        self._entries = entries
+        self._version = version
+        self._count = count
+        self._dense = dense
+        self._attrs = attrs
+        self._predicate = predicate
+        self._offset = offset
+        self._limit = limit
+
+    def _narrow(self, **changes):
+        fields = {name.lstrip("_"): getattr(self, name) for name in SnapshotView.__slots__[1:]}
+        fields.update(changes)
+        return SnapshotView(self._repository, **fields)
+
+    def where(self, predicate=None, **attrs):
+        """Objects for which predicate(obj) is true and each attribute equals its value."""
+        if self._offset or self._limit is not None:
+            raise ValueError("where() must come before limit()")
+        if predicate is not None and self._predicate is not None:
+            first, second = self._predicate, predicate
+            predicate = lambda obj: first(obj) and second(obj)
+        return self._narrow(attrs=self._attrs + tuple(attrs.items()),
+                            predicate=predicate or self._predicate)
+
+    def limit(self, count, offset=0):
+        """At most count objects (None: no limit), after skipping offset of them."""
+        if self._limit is not None:
+            remaining = max(self._limit - offset, 0)
+            count = remaining if count is None else min(count, remaining)
+        return self._narrow(offset=self._offset + offset, limit=count)
+
+    def first(self):
+        return next(iter(self), None)
+
+    def _candidates(self):
+        """The entries to check: an index's holders while the view is current, else all."""
+        repository = self._repository
+        for name, value in self._attrs:
+            index = repository._indexes.get(name)
+            if index is None:
+                continue
+            with repository._lock.read():
+                # The index only knows the current objects
+                if repository._version != self._version:
+                    break
+                try:
+                    holders = index.get(value, {})
+                except TypeError:   # unhashable: no object holds it
+                    return []
+                entries = [repository._live[obj_id] for obj_id in holders]
+            entries.sort(key=lambda entry: entry.added)
+            return entries
+        return self._entries
+
+    def __iter__(self):
+        if self._dense and not self._attrs and self._predicate is None:
+            stop = self._count
+            if self._limit is not None:
+                stop = min(stop, self._offset + self._limit)
+            return map(_entry_obj, islice(self._entries, self._offset, stop))
+        return self._scan()
+
+    def _scan(self):
+        version, attrs, predicate = self._version, self._attrs, self._predicate
+        skip, left = self._offset, self._limit
+        if left == 0:
+            return
+        for entry in self._candidates():
+            if entry.added > version:
+                break   # entries are in version order: the rest came later
+            deleted = entry.deleted
+            if deleted is not None and deleted <= version:
+                continue
+            obj = entry.obj
+            if attrs and any(getattr(obj, name) != value for name, value in attrs):
+                continue
+            if predicate is not None and not predicate(obj):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            yield obj
+            if left is not None:
+                left -= 1
+                if not left:
+                    return
+
+    def __bool__(self):
+        return any(True for _ in self)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return list(self)[item]
+        if item < 0:
+            return list(self)[item]
+        try:
+            return next(islice(self, item, None))
+        except StopIteration:
+            raise IndexError("view index out of range") from None
+
+
+class _AllView(SnapshotView):
+    """Every object as of the version: the view get_all() returns."""
+    __slots__ = ()
+
+    def __len__(self):
+        return self._count
+
+
+class ConcurrentRepository(InMemoryRepository):
+    """
+    InMemoryRepository safe to share between threads, with optional
+    secondary indexes and lazy get_all() views.
+
+    Writes hold the write lock, so they run one at a time; scans hold the
+    read lock, so they run in parallel. get() takes no lock: a dict lookup
+    is atomic. Each attribute in `indexes` gets a map from value to the
+    objects holding it, updated with the storage under the write lock, so
+    get_by_attribute() on it does not scan. Indexed attributes must only
+    change through update().
+
+    Besides the id map, the objects are kept in a list of entries in the
+    order they were added, each with the version of the write that added
+    it and, once deleted, of the one that deleted it. get_all() returns a
+    SnapshotView of that list at the current version, in constant time.
+    Deleted entries are dropped from the list once they are half of it;
+    the dropping builds a new list, so the views still reading the old one
+    are unaffected.
+    """
+
+    def __init__(self, indexes=()):
+        super().__init__()
+        self._lock = ReadWriteLock()
+        self._indexes = {name: {} for name in indexes}   # name -> value -> {id: obj}
+        self._entries = []   # _Entry, in version order
+        self._live = {}      # id -> _Entry of the stored objects
+        self._version = 0    # last write that added or deleted objects
+        self._dead = 0       # deleted entries still in _entries
+
+    def locked(self):
+        return self._lock.write()
+
+    def _index(self, obj):
+        for name, index in self._indexes.items():
+            index.setdefault(getattr(obj, name), {})[obj.id] = obj
+
+    def _unindex(self, obj):
+        for name, index in self._indexes.items():
+            value = getattr(obj, name)
+            holders = index.get(value)
+            if holders is not None:
+                holders.pop(obj.id, None)
+                if not holders:
+                    del index[value]
+
+    def _reindex(self):
+        """Rebuild the entries and indexes from the storage, after writing it directly."""
+        with self._lock.write():
+            for index in self._indexes.values():
+                index.clear()
+            self._version += 1
+            self._entries = [_Entry(obj, self._version) for obj in self._storage.values()]
+            self._live = {entry.obj.id: entry for entry in self._entries}
+            self._dead = 0
+            for obj in self._storage.values():
+                self._index(obj)
+
+    def _stored(self, obj):
+        """Called with the write lock held once obj is added or changed."""
+
+    def _removed(self, obj_id):
+        """Called with the write lock held once obj_id is deleted."""
+
+    def _retire(self, entry, version):
+        entry.deleted = version
+        self._dead += 1
+
+    def _compact(self):
+        if self._dead > 64 and self._dead * 2 > len(self._entries):
+            # A new list: the views keep reading the old one
+            self._entries = [entry for entry in self._entries if entry.deleted is None]
+            self._dead = 0
+
+    def add(self, obj):
+        with self._lock.write():
+            version = self._version + 1
+            old = self._live.get(obj.id)
+            if old is not None:
+                self._unindex(old.obj)
+                self._retire(old, version)
+            entry = _Entry(obj, version)
+            self._entries.append(entry)
+            self._live[obj.id] = entry
+            self._storage[obj.id] = obj
+            self._index(obj)
+            self._version = version
+            self._compact()
+            self._stored(obj)
+
+    def get_all(self):
+        with self._lock.read():
+            return _AllView(self, self._entries, self._version, len(self._live),
+                                dense=not self._dead)
+
+    def find(self, limit=None, offset=0, **attrs):
+        return self.get_all().where(**attrs).limit(limit, offset)
+
+    def update(self, obj_id, data):
+        with self._lock.write():
+            obj = self._storage.get(obj_id)
+            if not obj:
+                return
+            self._unindex(obj)
+            try:
+                obj.update(data)
+            finally:
+                # A failed update may have changed some attributes already
+                self._index(obj)
+                self._stored(obj)
+
+    def delete(self, obj_id):
+        with self._lock.write():
+            entry = self._live.pop(obj_id, None)
+            if entry is None:
+                return
+            del self._storage[obj_id]
+            self._unindex(entry.obj)
+            self._version += 1
+            self._retire(entry, self._version)
+            self._compact()
+            self._removed(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        with self._lock.read():
+            index = self._indexes.get(attr_name)
+            if index is not None:
+                try:
+                    holders = index.get(attr_value)
+                except TypeError:   # unhashable: no object holds it
+                    return None
+                return next(iter(holders.values())) if holders else None
+            return next((obj for obj in self._storage.values()
+                         if getattr(obj, attr_name) == attr_value), None)
@@ -1,11 +1,55 @@
-from app.persistence.repository import InMemoryRepository
+import atexit
+import os
+
+from app.persistence.repository import ConcurrentRepository
+
+# "objects" keeps the model instances, "columnar" one typed column per field
+# (app/persistence/columnar.py)
+STORES = ("objects", "columnar")
+# Attributes looked up by value (uniqueness checks, reviews of a place),
+# indexed by the objects store
+USER_INDEXES = ("email",)
+AMENITY_INDEXES = ("name",)
+REVIEW_INDEXES = ("place",)
+
 
 class HBnBFacade:
-    def __init__(self):
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def __init__(self, store=None, data_dir=None):
+        from app.models.amenity import Amenity
+        from app.models.place import Place
+        from app.models.review import Review
+        from app.models.user import User
+        from app.persistence.columnar import ColumnarRepository
+        from app.persistence.durable import DurableStore
+
+        store = store or os.getenv("HBNB_STORE", "objects")
+        if store not in STORES:
+            raise ValueError(f"unknown store '{store}', expected one of {STORES}")
+        # With a data directory the objects store is kept on disk
+        # (app/persistence/durable.py) and reloaded from it here
+        data_dir = data_dir or os.getenv("HBNB_DATA_DIR")
+        self.durable = None
+        if data_dir and store != "objects":
+            raise ValueError("HBNB_DATA_DIR is only supported by the objects store")
+        if data_dir:
+            self.durable = DurableStore(data_dir)
+            self.user_repo = self.durable.repository(User, USER_INDEXES)
+            self.amenity_repo = self.durable.repository(Amenity, AMENITY_INDEXES)
+            self.place_repo = self.durable.repository(Place)
+            self.review_repo = self.durable.repository(Review, REVIEW_INDEXES)
+            self.durable.recover()
+            atexit.register(self.durable.close)
+        elif store == "columnar":
+            self.user_repo = ColumnarRepository(User)
+            self.place_repo = ColumnarRepository(Place)
+            self.review_repo = ColumnarRepository(Review)
+            self.amenity_repo = ColumnarRepository(Amenity)
+        else:
+            # Thread-safe: the Flask server handles requests in threads
+            self.user_repo = ConcurrentRepository(USER_INDEXES)
+            self.place_repo = ConcurrentRepository()
+            self.review_repo = ConcurrentRepository(REVIEW_INDEXES)
+            self.amenity_repo = ConcurrentRepository(AMENITY_INDEXES)
 
     # User Management Methods
     def create_user(self, user_data):
@@ -24,12 +68,13 @@ class HBnBFacade:
         if not last_name:
             raise ValueError("Last name cannot be empty")
 
-        for user in self.user_repo.get_all():
-            if user.email == email:
+        # Locked so that two requests cannot both find the email free
+        with self.user_repo.locked():
+            if self.user_repo.get_by_attribute("email", email):
                 raise ValueError(f"User with email '{email}' already exists")
 
-        user = User(**user_data)
-        self.user_repo.add(user)
+            user = User(**user_data)
+            self.user_repo.add(user)
 
         return {
             "id": user.id,
@@ -51,7 +96,7 @@ class HBnBFacade:
             "email": user.email
         }
 
-    def get_all_users(self):
+    def get_all_users(self, limit=None, offset=0):
         """Retourne tous les users sous forme de liste de dicts"""
         return [
             {
@@ -60,18 +105,18 @@ class HBnBFacade:
                 "last_name": u.last_name,
                 "email": u.email
             }
-            for u in self.user_repo.get_all()
+            for u in self.user_repo.find(limit, offset)
         ]
 
     def get_user_by_email(self, email):
-        for user in self.user_repo.get_all():
-            if user.email == email:
-                return {
-                    "id": user.id,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "email": user.email
-                }
+        user = self.user_repo.get_by_attribute("email", email)
+        if user:
+            return {
+                "id": user.id,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "email": user.email
+            }
 
         return None
     
@@ -80,13 +125,14 @@ class HBnBFacade:
         if not user:
             return None
 
-        if "email" in data:
-            new_email = data.get("email")
-            for u in self.user_repo.get_all():
-                if u.email == new_email and u.id != user_id:
+        with self.user_repo.locked():
+            if "email" in data:
+                new_email = data.get("email")
+                holder = self.user_repo.get_by_attribute("email", new_email)
+                if holder and holder.id != user_id:
                     raise ValueError(f"User with email '{new_email}' already exists")
 
-        user.update(data)
+            self.user_repo.update(user_id, data)
 
         return {
             "id": user.id,
@@ -157,8 +203,8 @@ class HBnBFacade:
             "amenities": [{"id": a.id, "name": a.name} for a in place.amenities]
         }
 
-    def get_all_places(self):
-        places = self.place_repo.get_all()
+    def get_all_places(self, limit=None, offset=0):
+        places = self.place_repo.find(limit, offset)
         return [
             {
                 "id": p.id,
@@ -174,15 +220,14 @@ class HBnBFacade:
         if not place:
             return None
 
-        simple_fields = {k: v for k, v in place_data.items()
-                        if k in {"title", "description", "price", "latitude", "longitude"}}
-        place.update(simple_fields)
+        changes = {k: v for k, v in place_data.items()
+                   if k in {"title", "description", "price", "latitude", "longitude"}}
 
         if "owner_id" in place_data:
             owner = self.user_repo.get(place_data["owner_id"])
             if not owner:
                 raise ValueError(f"Owner {place_data['owner_id']} does not exist")
-            place.owner = owner
+            changes["owner"] = owner
 
         if "amenities" in place_data:
             amenities = []
@@ -191,7 +236,10 @@ class HBnBFacade:
                 if not amenity:
                     raise ValueError(f"Amenity {a_id} does not exist")
                 amenities.append(amenity)
-            place.amenities = amenities
+            changes["amenities"] = amenities
+
+        # One repository update, so the change is stored (and logged) as a whole
+        self.place_repo.update(place_id, changes)
 
         return {"message": "Place updated successfully"}
 
@@ -231,7 +279,7 @@ class HBnBFacade:
             "place_id": review.place.id
         }
 
-    def get_all_reviews(self):
+    def get_all_reviews(self, limit=None, offset=0):
         return [
             {
                 "id": r.id,
@@ -240,7 +288,7 @@ class HBnBFacade:
                 "user_id": r.user.id,
                 "place_id": r.place.id
             }
-            for r in self.review_repo.get_all()
+            for r in self.review_repo.find(limit, offset)
         ]
 
     def get_reviews_by_place(self, place_id):
@@ -255,14 +303,14 @@ class HBnBFacade:
                 "user_id": r.user.id,
                 "place_id": r.place.id
             }
-            for r in self.review_repo.get_all() if r.place.id == place_id
+            for r in self.review_repo.find(place=place)
         ]
 
     def update_review(self, review_id, update_data):
         review = self.review_repo.get(review_id)
         if not review:
             return None
-        review.update(update_data)
+        self.review_repo.update(review_id, update_data)
         return {
             "id": review.id,
             "text": review.text,
@@ -286,12 +334,12 @@ class HBnBFacade:
         if not name:
             raise ValueError("Amenity name is required")
 
-        for amenity in self.amenity_repo.get_all():
-            if amenity.name == name:
+        with self.amenity_repo.locked():
+            if self.amenity_repo.get_by_attribute("name", name):
                 raise ValueError(f"Amenity '{name}' already exists")
 
-        amenity = Amenity(name=name)
-        self.amenity_repo.add(amenity)
+            amenity = Amenity(name=name)
+            self.amenity_repo.add(amenity)
 
         return {
             "id": amenity.id,
@@ -308,13 +356,13 @@ class HBnBFacade:
             "name": amenity.name
         }
 
-    def get_all_amenities(self):
+    def get_all_amenities(self, limit=None, offset=0):
         return [
             {
                 "id": a.id,
                 "name": a.name
             }
-            for a in self.amenity_repo.get_all()
+            for a in self.amenity_repo.find(limit, offset)
         ]
 
     def update_amenity(self, amenity_id, amenity_data):
@@ -326,11 +374,12 @@ class HBnBFacade:
             if not amenity_data["name"]:
                 raise ValueError("Amenity name cannott be empty")
 
-            for a in self.amenity_repo.get_all():
-                if a.name == amenity_data["name"] and a.id != amenity_id:
+            with self.amenity_repo.locked():
+                holder = self.amenity_repo.get_by_attribute("name", amenity_data["name"])
+                if holder and holder.id != amenity_id:
                     raise ValueError(f"Amenity '{amenity_data['name']}' already exists")
 
-            amenity.name = amenity_data["name"]
+                self.amenity_repo.update(amenity_id, {"name": amenity_data["name"]})
 
         return {
             "id": amenity.id,
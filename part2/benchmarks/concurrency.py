@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Throughput of the in-memory repositories under concurrent threads.
+
+--users users are stored in each repository, then 1, 2, 4... --threads
+threads run --ops operations between them, as the API would:
+
+- get: a user by id
+- email: a user by email (get_by_attribute)
+- list: all users (get_all), --list-share of the operations
+- update: a new first name (update), --write-share of the operations
+
+Each run uses a ConcurrentRepository with an email index, locked with:
+
+- unlocked: no lock, the reference for the cost of locking (unsafe)
+- mutex: one lock for every call, reads included
+- rwlock: the repository's reader/writer lock
+
+The report gives the operations per second for each thread count, and
+checks after each run that the email index matches the stored users.
+Whether threads add throughput depends on the interpreter: with the GIL
+(every CPython before the free-threaded 3.13t build) only one thread runs
+Python code at a time, and the lock can only keep the overhead flat.
+
+Run this from the `part2` folder:
+  python3 benchmarks/concurrency.py --threads 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.user import User
+from app.persistence.repository import ConcurrentRepository
+
+
+class MutexLock:
+    """One lock for readers and writers alike, with the ReadWriteLock interface."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def read(self):
+        return self._lock
+
+    write = read
+
+
+class NoLock:
+    """No locking at all: the reference for the cost of the locks (not thread-safe)."""
+
+    def read(self):
+        return nullcontext()
+
+    write = read
+
+
+def with_lock(lock_class):
+    def make():
+        repository = ConcurrentRepository(indexes=("email",))
+        if lock_class is not None:
+            repository._lock = lock_class()
+        return repository
+    return make
+
+
+REPOSITORIES = {
+    "unlocked": with_lock(NoLock),
+    "mutex": with_lock(MutexLock),
+    "rwlock": with_lock(None),
+}
+
+
+def worker(repository, users, ops, list_share, write_share, seed, barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for i in range(ops):
+        user = rng.choice(users)
+        roll = rng.random()
+        if roll < write_share:
+            repository.update(user.id, {"first_name": f"Name{i % 50}"})
+        elif roll < write_share + list_share:
+            repository.get_all()
+        elif roll < 0.5:
+            repository.get_by_attribute("email", user.email)
+        else:
+            repository.get(user.id)
+
+
+def run(make_repository, threads, args):
+    repository = make_repository()
+    users = [User("Ada", "Lovelace", f"user{i}@example.com") for i in range(args.users)]
+    for user in users:
+        repository.add(user)
+    ops = args.ops // threads
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(repository, users, ops, args.list_share,
+                                                  args.write_share, args.seed + n, barrier))
+            for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    # Every user is found by its email, and the index holds nothing else
+    assert all(repository.get_by_attribute("email", user.email) is user for user in users)
+    assert sum(map(len, repository._indexes["email"].values())) == len(users)
+    return round(ops * threads / seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=400_000, help="Operations per run, all threads")
+    parser.add_argument("--threads", type=int, default=8, help="Highest thread count")
+    parser.add_argument("--list-share", type=float, default=0.001)
+    parser.add_argument("--write-share", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    results = {"python": sys.version.split()[0], "gil": gil, "users": args.users,
+               "ops_per_second": {}}
+    counts = [1]
+    while counts[-1] * 2 <= args.threads:
+        counts.append(counts[-1] * 2)
+    for name, make_repository in REPOSITORIES.items():
+        results["ops_per_second"][name] = {}
+        for threads in counts:
+            results["ops_per_second"][name][threads] = run(make_repository, threads, args)
+            print(f"{name} x{threads}: {results['ops_per_second'][name][threads]}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
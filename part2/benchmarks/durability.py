@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Write throughput and recovery time of the durable in-memory store.
+
+Writes --count places (owned by --count / 100 users) through the
+repositories of a DurableStore and reports:
+
+- writes: records per second for each --groups size (1 = one fsync per
+  record). Group sizes below 8 only write --sync-count places, as each
+  record then waits for the disk.
+- snapshot: seconds to write a snapshot of the whole store, and its size.
+- recovery: seconds to reload the store from the log alone, from the
+  snapshot alone, and from the snapshot plus a log tail of --tail records
+  (updates).
+
+The data goes to a temporary directory under --dir, which should be on the
+disk to measure.
+
+Run this from the `part2` folder:
+  python3 benchmarks/durability.py --count 1000000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.durable import DurableStore
+
+
+def open_store(directory, **options):
+    store = DurableStore(directory, **options)
+    users, places = store.repository(User), store.repository(Place)
+    store.recover()
+    return store, users, places
+
+
+def fill(directory, count, rng, **options):
+    """Write count places and their owners; return the open store, the records, the seconds."""
+    store, users, places = open_store(directory, **options)
+    owners = []
+    start = time.perf_counter()
+    for i in range(max(1, count // 100)):
+        owner = User("Ada", "Lovelace", f"ada{i}@example.com")
+        users.add(owner)
+        owners.append(owner)
+    for i in range(count):
+        places.add(Place(f"Place {i}", "", round(rng.uniform(10, 500), 2),
+                         rng.uniform(-90, 90), rng.uniform(-180, 180), rng.choice(owners)))
+    store.sync()
+    return store, count + len(owners), time.perf_counter() - start
+
+
+def timed_recovery(directory):
+    start = time.perf_counter()
+    store, users, places = open_store(directory)
+    seconds = time.perf_counter() - start
+    entities = len(users.get_all()) + len(places.get_all())
+    store.close()
+    return {"seconds": round(seconds, 2), "entities": entities}
+
+
+def directory_size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1_000_000, help="Places to write")
+    parser.add_argument("--groups", default="1,64,1024", help="Comma-separated group sizes")
+    parser.add_argument("--sync-count", type=int, default=5_000,
+                        help="Places written with group sizes below 8")
+    parser.add_argument("--tail", type=int, default=100_000, help="Log records after the snapshot")
+    parser.add_argument("--dir", default=None, help="Parent of the temporary data directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    root = tempfile.mkdtemp(prefix="hbnb-durability-", dir=args.dir)
+    results = {"count": args.count, "python": sys.version.split()[0], "writes": {}}
+    try:
+        for group in map(int, args.groups.split(",")):
+            count = args.count if group >= 8 else min(args.count, args.sync_count)
+            directory = os.path.join(root, f"group-{group}")
+            # No snapshot during the run: this measures the log alone
+            store, records, seconds = fill(directory, count, rng, group_size=group,
+                                           snapshot_every=float("inf"))
+            store.close()
+            results["writes"][f"group_{group}"] = {"records": records,
+                                                   "records_per_second": round(records / seconds)}
+            print(f"group {group}: {results['writes'][f'group_{group}']}", file=sys.stderr)
+
+        directory = os.path.join(root, "recovery")
+        store, _, _ = fill(directory, args.count, rng, snapshot_every=float("inf"))
+        log_bytes = directory_size(directory)
+        store.close()
+        log_only = timed_recovery(directory)
+
+        store, users, places = open_store(directory, snapshot_every=float("inf"))
+        start = time.perf_counter()
+        store.snapshot()
+        results["snapshot"] = {"seconds": round(time.perf_counter() - start, 2),
+                               "mib": round(directory_size(directory) / 2 ** 20)}
+        store.close()
+        snapshot_only = timed_recovery(directory)
+
+        store, users, places = open_store(directory, snapshot_every=float("inf"))
+        ids = [place.id for place in places.get_all()]
+        for i in range(args.tail):
+            places.update(rng.choice(ids), {"price": float(i % 500 + 1)})
+        store.close()
+        results["recovery"] = {
+            "log_only": dict(log_only, log_mib=round(log_bytes / 2 ** 20)),
+            "snapshot_only": snapshot_only,
+            "snapshot_and_tail": dict(timed_recovery(directory), tail_records=args.tail),
+        }
+    finally:
+        shutil.rmtree(root)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Cost of the list operations of the in-memory repositories.
+
+Stores --count places, and --count reviews spread over them, in an
+InMemoryRepository (get_all() copies every object into a list) and in a
+ConcurrentRepository (get_all() returns a SnapshotView), then times:
+
+- get_all: taking the list / the view
+- first_page: the first --page places (find(limit=...))
+- last_page: the --page places at the end (find(limit=..., offset=...))
+- reviews_of_place: the reviews of one place (find(place=...)), a scan
+  for InMemoryRepository, the review index for ConcurrentRepository
+- all: iterating every place
+
+Each result is the median of --repeat runs, in microseconds.
+
+Run this from the `part2` folder:
+  python3 benchmarks/listing.py --count 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import ConcurrentRepository, InMemoryRepository
+
+REPOSITORIES = {
+    "list_copy": lambda indexes: InMemoryRepository(),
+    "snapshot_view": ConcurrentRepository,
+}
+
+
+def micros(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1e6, 1)
+
+
+def run(make_repository, args, rng):
+    owner = User("Ada", "Lovelace", "ada@example.com")
+    places, reviews = make_repository(()), make_repository(("place",))
+    stored = []
+    for i in range(args.count):
+        place = Place(f"Place {i}", "", 80.0, 1.0, 2.0, owner)
+        places.add(place)
+        stored.append(place)
+    for i in range(args.count):
+        reviews.add(Review("Nice", 5, rng.choice(stored), owner))
+    target = stored[len(stored) // 2]
+    page, offset = args.page, args.count - args.page
+
+    return {
+        "get_all": micros(places.get_all, args.repeat),
+        "first_page": micros(lambda: list(places.find(page)), args.repeat),
+        "last_page": micros(lambda: list(places.find(page, offset)), args.repeat),
+        "reviews_of_place": micros(lambda: list(reviews.find(place=target)), args.repeat),
+        "all": micros(lambda: sum(1 for _ in places.get_all()), args.repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Places, and reviews")
+    parser.add_argument("--page", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=21)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {"count": args.count, "python": sys.version.split()[0], "micros": {}}
+    for name, make_repository in REPOSITORIES.items():
+        results["micros"][name] = run(make_repository, args, random.Random(args.seed))
+        print(f"{name}: {results['micros'][name]}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
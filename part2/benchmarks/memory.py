@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Memory used per stored place and review, for each in-memory store.
+
+For each store (objects: InMemoryRepository, columnar: ColumnarRepository)
+--count places, then --count reviews of them, are created like the facade
+does and added to a repository. The memory allocated meanwhile, traced
+with tracemalloc, is reported per entity and per million entities. Strings
+are shaped like real ones: a uuid4 id, a title of a dozen characters, a
+review text of a few words.
+
+Run this from the `part2` folder:
+  python3 benchmarks/memory.py --count 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.columnar import ColumnarRepository
+from app.persistence.repository import InMemoryRepository
+
+STORES = {
+    "objects": lambda model: InMemoryRepository(),
+    "columnar": ColumnarRepository,
+}
+
+
+def measure(fill):
+    """Bytes allocated (and still held) by fill()."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    held = fill()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    return used, held
+
+
+def run_store(make_repository, count, rng):
+    owner = User("Ada", "Lovelace", "ada@example.com")
+    places = make_repository(Place)
+    reviews = make_repository(Review)
+
+    def fill_places():
+        for i in range(count):
+            places.add(Place(f"Place {i}", "", round(rng.uniform(10, 500), 2),
+                             rng.uniform(-90, 90), rng.uniform(-180, 180), owner))
+        return places
+
+    def fill_reviews():
+        place = places.get_all()[0]
+        for i in range(count):
+            reviews.add(Review(f"Stay {i} was great", rng.randint(1, 5), place, owner))
+        return reviews
+
+    place_bytes, _ = measure(fill_places)
+    review_bytes, _ = measure(fill_reviews)
+    return {
+        name: {"bytes_per_entity": round(used / count), "mib_per_million": round(used / count * 1e6 / 2 ** 20)}
+        for name, used in (("place", place_bytes), ("review", review_bytes))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1_000_000, help="Places, and reviews, per store")
+    parser.add_argument("--stores", default=",".join(STORES),
+                        help=f"Comma-separated subset of {', '.join(STORES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {"count": args.count, "python": sys.version.split()[0], "stores": {}}
+    tracemalloc.start()
+    for name in args.stores.split(","):
+        results["stores"][name] = run_store(STORES[name], args.count, random.Random(args.seed))
+        print(f"{name}: {results['stores'][name]}", file=sys.stderr)
+    tracemalloc.stop()
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
+import os
+
 from app import create_app
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # The reloader runs the app in a child process while the parent, which
+    # imported this module too, keeps the data directory locked
+    app.run(debug=True, use_reloader=not os.getenv("HBNB_DATA_DIR"))
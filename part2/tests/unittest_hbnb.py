@@ -67,21 +67,35 @@ class TestBaseModel(unittest.TestCase):
         self.obj.save()
         self.assertEqual(self.obj.created_at, original)
 
+    def _with_dummy(self, value):
+        # Models have no instance dict: an attribute needs a slot
+        class Dummy(self.BaseModel):
+            __slots__ = ("dummy",)
+
+        obj = Dummy()
+        obj.dummy = value
+        return obj
+
     def test_update_modifies_existing_attribute(self):
-        self.obj.dummy = "old"
-        self.obj.update({"dummy": "new"})
-        self.assertEqual(self.obj.dummy, "new")
+        obj = self._with_dummy("old")
+        obj.update({"dummy": "new"})
+        self.assertEqual(obj.dummy, "new")
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.obj, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.obj.dummy = "x"
 
     def test_update_ignores_unknown_keys(self):
         self.obj.update({"__unknown__": "x"})
         self.assertFalse(hasattr(self.obj, "__unknown__"))
 
     def test_update_refreshes_updated_at(self):
-        before = self.obj.updated_at
+        obj = self._with_dummy("x")
+        before = obj.updated_at
         time.sleep(0.02)
-        self.obj.dummy = "x"
-        self.obj.update({"dummy": "y"})
-        self.assertGreaterEqual(self.obj.updated_at, before)
+        obj.update({"dummy": "y"})
+        self.assertGreaterEqual(obj.updated_at, before)
 
     def test_update_with_empty_dict_does_not_raise(self):
         try:
@@ -893,6 +907,582 @@ class TestHBnBFacade(unittest.TestCase):
             self._create_review(uid, "ghost-place")
 
 
+# ============================================================
+# 8. SLOTTED MODELS AND COLUMNAR REPOSITORY
+# ============================================================
+class TestColumnarRepository(unittest.TestCase):
+    """
+    Tests for the slotted models and ColumnarRepository
+    Files: app/models/*.py, app/persistence/columnar.py
+    """
+
+    def setUp(self):
+        from app.models.user import User
+        from app.models.place import Place
+        from app.models.review import Review
+        from app.persistence.columnar import ColumnarRepository
+        self.User, self.Place, self.Review = User, Place, Review
+        self.users = ColumnarRepository(User)
+        self.places = ColumnarRepository(Place)
+        self.owner = User("Ada", "Lovelace", new_email())
+        self.users.add(self.owner)
+
+    def _place(self, title="Loft", price=80):
+        place = self.Place(title, "", price, 48.8, 2.3, self.users.get(self.owner.id))
+        self.places.add(place)
+        return place
+
+    def test_models_have_no_instance_dict(self):
+        place = self.Place("Loft", "", 80, 48.8, 2.3, self.owner)
+        self.assertIn("price", self.Place.__slots__)
+        self.assertFalse(hasattr(place, "__dict__"))
+
+    def test_get_returns_view_with_stored_values(self):
+        place = self._place()
+        view = self.places.get(place.id)
+        self.assertIsInstance(view, self.Place)
+        self.assertEqual((view.id, view.title, view.price, view.created_at),
+                         (place.id, "Loft", 80.0, place.created_at))
+        self.assertEqual(view.owner.email, self.owner.email)
+
+    def test_numeric_fields_are_typed_arrays(self):
+        self._place(price=99.5)
+        self.assertEqual(self.places._columns["price"].typecode, "d")
+        self.assertEqual(list(self.places._columns["price"]), [99.5])
+        reviews = type(self.places)(self.Review)
+        review = self.Review("Great", 4, self.places.get_all()[0], self.owner)
+        reviews.add(review)
+        self.assertEqual(reviews._columns["rating"].typecode, "b")
+        self.assertEqual(reviews.get(review.id).rating, 4)
+
+    def test_timestamps_kept_to_the_microsecond(self):
+        place = self._place()
+        view = self.places.get(place.id)
+        self.assertEqual((view.created_at, view.updated_at), (place.created_at, place.updated_at))
+        before = view.updated_at
+        time.sleep(0.002)
+        view.save()
+        self.assertGreater(self.places.get(place.id).updated_at, before)
+        self.assertEqual(self.places.get(place.id).created_at, place.created_at)
+        self.assertEqual(self.places.get_by_attribute("created_at", place.created_at).id, place.id)
+
+    def test_update_through_view_is_stored(self):
+        place = self._place()
+        self.places.get(place.id).update({"price": 120, "title": "  New  "})
+        view = self.places.get(place.id)
+        self.assertEqual((view.price, view.title), (120.0, "New"))
+        with self.assertRaises(ValueError):
+            view.update({"price": -1})
+        self.assertEqual(self.places.get(place.id).price, 120.0)
+
+    def test_views_kept_elsewhere_follow_updates(self):
+        place = self.places.get(self._place().id)
+        self.users.get(self.owner.id).update({"first_name": "Grace"})
+        self.assertEqual(place.owner.first_name, "Grace")
+
+    def test_empty_lists_created_on_first_read(self):
+        place = self._place()
+        self.assertIsNone(self.places._columns["amenities"][0])
+        self.places.get(place.id).amenities.append("wifi")
+        self.assertEqual(self.places.get(place.id).amenities, ["wifi"])
+
+    def test_get_all_and_get_by_attribute(self):
+        ids = [self._place(title=f"Place {i}").id for i in range(3)]
+        self.assertEqual([p.id for p in self.places.get_all()], ids)
+        self.assertEqual(self.places.get_by_attribute("title", "Place 1").id, ids[1])
+        self.assertIsNone(self.places.get_by_attribute("title", "ghost"))
+
+    def test_delete_does_not_reuse_rows(self):
+        first, second = self._place(title="A"), self._place(title="B")
+        kept = self.places.get(first.id)
+        self.places.delete(first.id)
+        self.assertIsNone(self.places.get(first.id))
+        self.assertIsNone(self.places.get_by_attribute("title", "A"))
+        third = self._place(title="C")
+        self.assertEqual([p.id for p in self.places.get_all()], [second.id, third.id])
+        self.assertIsNone(kept.title)
+
+    def test_add_requires_model_instance(self):
+        with self.assertRaises(ValueError):
+            self.places.add(self.owner)
+
+    def test_facade_with_columnar_store(self):
+        from app.services.facade import HBnBFacade
+        facade = HBnBFacade(store="columnar")
+        user = facade.create_user({"first_name": "A", "last_name": "B", "email": new_email()})
+        amenity = facade.create_amenity({"name": "Wifi"})
+        place = facade.create_place({"title": "Loft", "price": 80, "latitude": 1, "longitude": 2,
+                                     "owner_id": user["id"], "amenities": [amenity["id"]]})
+        facade.create_review({"text": "Nice", "rating": 5, "user_id": user["id"],
+                              "place_id": place["id"]})
+        facade.update_place(place["id"], {"price": 95})
+        details = facade.get_place(place["id"])
+        self.assertEqual(details["price"], 95.0)
+        self.assertEqual(details["amenities"], [amenity])
+        self.assertEqual(len(facade.get_reviews_by_place(place["id"])), 1)
+
+    def test_unknown_store_raises(self):
+        from app.services.facade import HBnBFacade
+        with self.assertRaises(ValueError):
+            HBnBFacade(store="disk")
+
+
+# ============================================================
+# 9. DURABLE REPOSITORY (write-ahead log and snapshots)
+# ============================================================
+class TestDurableStore(unittest.TestCase):
+    """
+    Tests for DurableStore and DurableRepository
+    File: app/persistence/durable.py
+    """
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp(prefix="hbnb-durable-")
+        self.stores = []
+
+    def tearDown(self):
+        import shutil
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    def _facade(self):
+        from app.services.facade import HBnBFacade
+        facade = HBnBFacade(store="objects", data_dir=self.directory)
+        self.stores.append(facade.durable)
+        return facade
+
+    def _restart(self):
+        self.stores[-1].close()
+        return self._facade()
+
+    def _fill(self, facade):
+        user = facade.create_user({"first_name": "Ada", "last_name": "L", "email": new_email()})
+        amenity = facade.create_amenity({"name": "Wifi"})
+        place = facade.create_place({"title": "Loft", "price": 80, "latitude": 1, "longitude": 2,
+                                     "owner_id": user["id"], "amenities": [amenity["id"]]})
+        review = facade.create_review({"text": "Nice", "rating": 5, "user_id": user["id"],
+                                       "place_id": place["id"]})
+        return user, amenity, place, review
+
+    def test_recover_restores_entities_and_references(self):
+        facade = self._facade()
+        user, amenity, place, review = self._fill(facade)
+        created_at = facade.place_repo.get(place["id"]).created_at
+        facade = self._restart()
+        self.assertEqual(facade.get_user(user["id"]), user)
+        details = facade.get_place(place["id"])
+        self.assertEqual(details["amenities"], [amenity])
+        self.assertEqual(details["owner"]["id"], user["id"])
+        restored = facade.place_repo.get(place["id"])
+        self.assertIs(restored.owner, facade.user_repo.get(user["id"]))
+        self.assertEqual(restored.created_at, created_at)
+        self.assertEqual(facade.get_review_by_id(review["id"]), review)
+
+    def test_updates_and_deletes_are_replayed(self):
+        facade = self._facade()
+        user, amenity, place, review = self._fill(facade)
+        facade.update_place(place["id"], {"price": 120, "amenities": []})
+        facade.update_user(user["id"], {"first_name": "Grace"})
+        facade.update_amenity(amenity["id"], {"name": "Fibre"})
+        facade.delete_review(review["id"])
+        facade = self._restart()
+        details = facade.get_place(place["id"])
+        self.assertEqual((details["price"], details["amenities"]), (120.0, []))
+        self.assertEqual(details["owner"]["first_name"], "Grace")
+        self.assertEqual(facade.get_amenity(amenity["id"])["name"], "Fibre")
+        self.assertEqual(facade.get_all_reviews(), [])
+
+    def test_failed_update_is_not_logged(self):
+        facade = self._facade()
+        place = self._fill(facade)[2]
+        with self.assertRaises(ValueError):
+            facade.update_place(place["id"], {"price": -1})
+        facade = self._restart()
+        self.assertEqual(facade.get_place(place["id"])["price"], 80.0)
+
+    def test_snapshot_then_log_tail(self):
+        facade = self._facade()
+        user, amenity, place, review = self._fill(facade)
+        facade.durable.snapshot()
+        facade.update_place(place["id"], {"title": "After snapshot"})
+        names = sorted(os.listdir(self.directory))
+        self.assertEqual([n for n in names if n.startswith("snapshot-")], ["snapshot-0000000000000004.ndjson"])
+        self.assertEqual([n for n in names if n.startswith("wal-")], ["wal-0000000000000005.log"])
+        facade = self._restart()
+        self.assertEqual(facade.get_place(place["id"])["title"], "After snapshot")
+        self.assertEqual(facade.get_reviews_by_place(place["id"])[0]["id"], review["id"])
+
+    def test_snapshots_follow_store_size(self):
+        from app.models.amenity import Amenity
+        from app.persistence.durable import DurableStore
+        store = DurableStore(self.directory, snapshot_every=10)
+        amenities = store.repository(Amenity)
+        store.recover()
+        self.stores.append(store)
+        for i in range(20):
+            amenities.add(Amenity(f"A{i}"))
+        # The 10th record started a snapshot; with 20 entities the next one
+        # waits for 20 records
+        self.assertEqual(store._since_snapshot, 10)
+        snapshotter = store._snapshotter
+        if snapshotter is not None:
+            snapshotter.join()
+        for i in range(10):
+            amenities.update(amenities.get_all()[i].id, {"name": f"B{i}"})
+        self.assertEqual(store._since_snapshot, 0)
+        store.snapshot()
+        self.assertIn("snapshot-0000000000000030.ndjson", os.listdir(self.directory))
+
+    def test_torn_last_record_is_ignored(self):
+        facade = self._facade()
+        user = self._fill(facade)[0]
+        self.stores[-1].close()
+        segment = max(n for n in os.listdir(self.directory) if n.startswith("wal-"))
+        with open(os.path.join(self.directory, segment), "ab") as f:
+            f.write(b'0badc0de {"seq":5,"op":"put","mod')
+        facade = self._facade()
+        self.assertEqual(facade.get_user(user["id"])["id"], user["id"])
+        facade.create_amenity({"name": "Pool"})
+        facade = self._restart()
+        self.assertEqual(len(facade.get_all_amenities()), 2)
+
+    def test_group_fsync(self):
+        from app.models.amenity import Amenity
+        from app.persistence.durable import DurableStore
+        store = DurableStore(self.directory, group_size=3, group_interval=0.05)
+        amenities = store.repository(Amenity)
+        store.recover()
+        self.stores.append(store)
+        amenities.add(Amenity("A"))
+        amenities.add(Amenity("B"))
+        self.assertEqual(store._pending, 2)
+        amenities.add(Amenity("C"))
+        self.assertEqual(store._pending, 0)
+        amenities.add(Amenity("D"))
+        time.sleep(0.2)
+        self.assertEqual(store._pending, 0)
+
+    def test_one_store_per_directory(self):
+        self._facade()
+        with self.assertRaises(RuntimeError):
+            self._facade()
+
+    def test_data_dir_requires_objects_store(self):
+        from app.services.facade import HBnBFacade
+        with self.assertRaises(ValueError):
+            HBnBFacade(store="columnar", data_dir=self.directory)
+
+    def _call(self, path, data=None):
+        import json
+        import urllib.request
+        request = urllib.request.Request(f"http://127.0.0.1:5000/api/v1/{path}",
+                                         data=None if data is None else json.dumps(data).encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.load(response)
+
+    def _serve(self):
+        """Start run.py on the data directory; return a function stopping it once it answers."""
+        import signal
+        import subprocess
+        root = os.path.join(os.path.dirname(__file__), "..")
+        server = subprocess.Popen([sys.executable, "run.py"], cwd=root,
+                                  env=dict(os.environ, HBNB_STORE="objects", HBNB_DATA_DIR=self.directory),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        def stop():
+            server.send_signal(signal.SIGINT)
+            server.wait(timeout=10)
+
+        for _ in range(100):
+            if server.poll() is not None:
+                self.fail(f"run.py exited with {server.returncode}")
+            try:
+                self._call("amenities/")
+                return stop
+            except OSError:
+                time.sleep(0.1)
+        stop()
+        self.fail("run.py did not answer")
+
+    def test_run_py_twice_on_one_directory(self):
+        import socket
+        with socket.socket() as probe:
+            if probe.connect_ex(("127.0.0.1", 5000)) == 0:
+                self.skipTest("port 5000 is in use")
+        # Started twice in a row: the second run reopens the directory and sees the first's data
+        stop = self._serve()
+        try:
+            amenity = self._call("amenities/", {"name": "Sauna"})
+        finally:
+            stop()
+        stop = self._serve()
+        try:
+            self.assertEqual(self._call(f"amenities/{amenity['id']}")["name"], "Sauna")
+        finally:
+            stop()
+
+
+# ============================================================
+# 10. THREAD-SAFE REPOSITORY (reader/writer lock, indexes)
+# ============================================================
+class TestConcurrentRepository(unittest.TestCase):
+    """
+    Tests for ReadWriteLock and ConcurrentRepository
+    File: app/persistence/repository.py
+    """
+
+    def setUp(self):
+        from app.models.user import User
+        from app.persistence.repository import ConcurrentRepository
+        self.User = User
+        self.repo = ConcurrentRepository(indexes=("email",))
+
+    def _user(self, email=None):
+        user = self.User("Ada", "Lovelace", email or new_email())
+        self.repo.add(user)
+        return user
+
+    def _in_thread(self, target):
+        import threading
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+
+    def test_readers_share_the_lock(self):
+        import threading
+        from app.persistence.repository import ReadWriteLock
+        lock, inside = ReadWriteLock(), threading.Event()
+
+        def reader():
+            with lock.read():
+                inside.set()
+
+        with lock.read():
+            self._in_thread(reader)
+            self.assertTrue(inside.wait(1))
+
+    def test_writer_excludes_readers(self):
+        import threading
+        from app.persistence.repository import ReadWriteLock
+        lock, inside = ReadWriteLock(), threading.Event()
+
+        def reader():
+            with lock.read():
+                inside.set()
+
+        with lock.write():
+            self._in_thread(reader)
+            self.assertFalse(inside.wait(0.05))
+        self.assertTrue(inside.wait(1))
+
+    def test_writer_may_read_and_write_again(self):
+        from app.persistence.repository import ReadWriteLock
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.read():
+                with lock.write():
+                    pass
+        with lock.write():
+            pass
+
+    def test_index_follows_updates_and_deletes(self):
+        user = self._user("old@example.com")
+        self.assertIs(self.repo.get_by_attribute("email", "old@example.com"), user)
+        self.repo.update(user.id, {"email": "new@example.com"})
+        self.assertIsNone(self.repo.get_by_attribute("email", "old@example.com"))
+        self.assertIs(self.repo.get_by_attribute("email", "new@example.com"), user)
+        self.repo.delete(user.id)
+        self.assertIsNone(self.repo.get_by_attribute("email", "new@example.com"))
+        self.assertEqual(self.repo._indexes["email"], {})
+
+    def test_failed_update_keeps_index_consistent(self):
+        user = self._user("kept@example.com")
+        with self.assertRaises(ValueError):
+            self.repo.update(user.id, {"email": "not-an-email"})
+        self.assertIs(self.repo.get_by_attribute("email", "kept@example.com"), user)
+
+    def test_unindexed_attribute_and_unhashable_value(self):
+        user = self._user()
+        self.assertIs(self.repo.get_by_attribute("first_name", "Ada"), user)
+        self.assertIsNone(self.repo.get_by_attribute("email", ["a", "list"]))
+
+    def test_concurrent_updates_keep_index_consistent(self):
+        import threading
+        users = [self._user() for _ in range(20)]
+        barrier = threading.Barrier(8)
+
+        def writer(n):
+            barrier.wait()
+            for i in range(200):
+                user = users[(n + i) % len(users)]
+                self.repo.update(user.id, {"email": f"u{users.index(user)}-{n}-{i}@example.com"})
+                self.repo.get_by_attribute("email", user.email)
+                self.repo.get_all()
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for user in users:
+            self.assertIs(self.repo.get_by_attribute("email", user.email), user)
+        self.assertEqual(sum(map(len, self.repo._indexes["email"].values())), len(users))
+
+    def test_facade_creates_one_user_per_email_across_threads(self):
+        import threading
+        from app.services.facade import HBnBFacade
+        facade = HBnBFacade(store="objects")
+        email, barrier, created = new_email(), threading.Barrier(8), []
+
+        def create():
+            barrier.wait()
+            try:
+                created.append(facade.create_user({"first_name": "A", "last_name": "B", "email": email}))
+            except ValueError:
+                pass
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertEqual(facade.get_user_by_email(email)["id"], created[0]["id"])
+
+
+# ============================================================
+# 11. SNAPSHOT VIEWS (get_all, find, paging)
+# ============================================================
+class TestSnapshotView(unittest.TestCase):
+    """
+    Tests for SnapshotView and Repository.find
+    File: app/persistence/repository.py
+    """
+
+    def setUp(self):
+        from app.models.user import User
+        from app.persistence.repository import ConcurrentRepository
+        self.User = User
+        self.repo = ConcurrentRepository(indexes=("last_name",))
+
+    def _user(self, last_name="Lovelace"):
+        user = self.User("Ada", last_name, new_email())
+        self.repo.add(user)
+        return user
+
+    def test_view_ignores_later_writes(self):
+        first, second = self._user(), self._user()
+        view = self.repo.get_all()
+        self.repo.delete(first.id)
+        third = self._user()
+        self.assertEqual(list(view), [first, second])
+        self.assertEqual(len(view), 2)
+        self.assertEqual(list(self.repo.get_all()), [second, third])
+
+    def test_readding_an_id_moves_it_to_the_end(self):
+        first, second = self._user(), self._user()
+        view = self.repo.get_all()
+        self.repo.add(first)
+        self.assertEqual(list(view), [first, second])
+        self.assertEqual(list(self.repo.get_all()), [second, first])
+
+    def test_where_and_limit_are_lazy(self):
+        users = [self._user() for _ in range(10)]
+        calls = []
+
+        def predicate(user):
+            calls.append(user)
+            return True
+
+        view = self.repo.get_all().where(predicate).limit(3, offset=2)
+        self.assertEqual(calls, [])
+        self.assertEqual(list(view), users[2:5])
+        self.assertEqual(len(calls), 5)
+
+    def test_limit_composes_and_where_must_come_first(self):
+        users = [self._user() for _ in range(10)]
+        view = self.repo.get_all().limit(5, offset=1).limit(10, offset=2)
+        self.assertEqual(list(view), users[3:6])
+        self.assertEqual(list(self.repo.get_all().limit(0)), [])
+        with self.assertRaises(ValueError):
+            self.repo.get_all().limit(2).where(first_name="Ada")
+
+    def test_indexed_where_matches_a_scan(self):
+        turings = [self._user("Turing") for _ in range(3)]
+        self._user("Hopper")
+        current = self.repo.get_all().where(last_name="Turing")
+        self.assertEqual(list(current), turings)
+        self.repo.delete(turings[0].id)
+        self.repo.update(turings[1].id, {"last_name": "Hopper"})
+        # Stale: read by scanning, still as of its version for adds and deletes
+        self.assertEqual(list(current)[0], turings[0])
+        self.assertEqual(list(self.repo.find(last_name="Turing")), [turings[2]])
+        self.assertEqual(list(self.repo.find(last_name=["unhashable"])), [])
+
+    def test_compaction_keeps_old_views(self):
+        users = [self._user() for _ in range(200)]
+        view = self.repo.get_all()
+        for user in users[:150]:
+            self.repo.delete(user.id)
+        self.assertLess(len(self.repo._entries), 200)
+        self.assertEqual(list(view), users)
+        self.assertEqual(list(self.repo.get_all()), users[150:])
+
+    def test_len_bool_and_indexing(self):
+        self.assertFalse(self.repo.get_all())
+        users = [self._user() for _ in range(5)]
+        view = self.repo.get_all()
+        self.assertTrue(view)
+        self.assertIs(view[1], users[1])
+        self.assertIs(view[-1], users[-1])
+        self.assertEqual(view[1:3], users[1:3])
+        self.assertIs(view.first(), users[0])
+        with self.assertRaises(IndexError):
+            view[5]
+        narrowed = view.where(lambda user: user is not users[0])
+        self.assertEqual(sum(1 for _ in narrowed), 4)
+        with self.assertRaises(TypeError):
+            len(narrowed)
+
+    def test_find_on_other_repositories(self):
+        from app.models.place import Place
+        from app.models.review import Review
+        from app.persistence.columnar import ColumnarRepository
+        from app.persistence.repository import InMemoryRepository
+        owner = self.User("Ada", "Lovelace", new_email())
+        place = Place("Loft", "", 80.0, 1.0, 2.0, owner)
+        for repo in (InMemoryRepository(), ColumnarRepository(Review)):
+            reviews = [Review(f"R{i}", 5, place, owner) for i in range(4)]
+            for review in reviews:
+                repo.add(review)
+            self.assertEqual([r.id for r in repo.find(2, 1)], [r.id for r in reviews[1:3]])
+            self.assertEqual(len(list(repo.find(place=place))), 4)
+
+    def test_facade_lists_pages(self):
+        from app.services.facade import HBnBFacade
+        facade = HBnBFacade(store="objects")
+        ids = [facade.create_amenity({"name": f"A{i}"})["id"] for i in range(5)]
+        self.assertEqual([a["id"] for a in facade.get_all_amenities(2, 3)], ids[3:5])
+        self.assertEqual(len(facade.get_all_amenities()), 5)
+
+    def test_list_endpoints_take_limit_and_offset(self):
+        from app import create_app
+        app = create_app()
+        app.config["TESTING"] = True
+        client = app.test_client()
+        ids = [client.post("/api/v1/amenities/", json={"name": f"Paged {uuid.uuid4().hex[:6]}"})
+               .get_json()["id"] for _ in range(3)]
+        everything = client.get("/api/v1/amenities/").get_json()
+        page = client.get("/api/v1/amenities/?limit=2&offset=1").get_json()
+        self.assertEqual(page, everything[1:3])
+        self.assertIn(ids[-1], [a["id"] for a in everything])
+        self.assertEqual(client.get("/api/v1/users/?limit=-1").status_code, 400)
+        self.assertEqual(client.get("/api/v1/places/?offset=x").status_code, 400)
+
+
 # ============================================================
 # API - USER ENDPOINTS
 # ============================================================
@@ -1,15 +1,46 @@
 from flask import Flask
 from flask_restx import Api
 from flask_cors import CORS
-from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.identity import CurrentUserLoader
+from app.passwords import PasswordHasher
+from app.ratelimit import LoginRateLimiter
+from app.read_replica import ReadReplica
+from app.revocation import TokenRevocationStore
+from app.sqlite_pragmas import SQLitePragmas
  
-bcrypt = Bcrypt()
+password_hasher = PasswordHasher()
+login_limiter = LoginRateLimiter()
+token_revocation = TokenRevocationStore()
+user_loader = CurrentUserLoader()
 jwt = JWTManager()
 db = SQLAlchemy()
+sqlite_pragmas = SQLitePragmas()
+read_replica = ReadReplica()
  
  
+@jwt.token_in_blocklist_loader
+def token_is_revoked(jwt_header, jwt_payload):
+    return token_revocation.is_revoked(jwt_payload)
+ 
+ 
+def _add_missing_indexes(app):
+    """
+    Create the indexes missing from an existing database, and log the
+    duplicate rows that prevent a unique one from being created.
+    """
+    from app.persistence.indexes import ensure_indexes
+
+    with app.app_context():
+        report = ensure_indexes(db.engine, db.metadata)
+    for name in report["created"]:
+        app.logger.info("Created index %s", name)
+    for name, rows in report["duplicates"].items():
+        app.logger.warning("Unique index %s not created, existing rows hold duplicate values: %s",
+                           name, rows)
+
+
 def create_app(config_class):
     """
     Application factory that creates and configures the Flask app.
@@ -17,9 +48,16 @@ def create_app(config_class):
     app = Flask(__name__)
     app.config.from_object(config_class)
  
-    bcrypt.init_app(app)
+    password_hasher.init_app(app)
+    login_limiter.init_app(app)
+    token_revocation.init_app(app)
+    user_loader.init_app(app)
     jwt.init_app(app)
+    read_replica.configure(app)
     db.init_app(app)
+    sqlite_pragmas.init_app(app)
+    read_replica.init_app(app)
+    token_revocation.create_table(app)
     # Enable global CORS for the app. supports_credentials=True allows cookies/JWTs
     # to be sent from the browser when using credentials.
     CORS(app, supports_credentials=True)
@@ -46,5 +84,8 @@ def create_app(config_class):
  
     for ns in v1_namespaces:
         api.add_namespace(ns, path=f'/api/v1/{ns.name}')
+
+    # The namespaces imported the models, so the metadata is complete
+    _add_missing_indexes(app)
  
     return app
\ No newline at end of file
@@ -9,11 +9,13 @@ from .users import api as users_ns
 from .places import api as places_ns
 from .reviews import api as reviews_ns
 from .amenities import api as amenities_ns
+from .batch import api as batch_ns
 
 namespaces = [
     auth_ns,
     users_ns,
     places_ns,
     reviews_ns,
-    amenities_ns
+    amenities_ns,
+    batch_ns
     ]
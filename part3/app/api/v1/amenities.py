@@ -71,3 +71,17 @@ class AmenityResource(Resource):
             return {"message": "Amenity updated successfully"}, 200
         except ValueError as e:
             api.abort(400, str(e))
+
+    @jwt_required()
+    @api.response(200, 'Amenity deleted, with the rows deleted per table')
+    @api.response(403, 'Admin privileges required')
+    @api.response(404, 'Amenity not found')
+    def delete(self, amenity_id):
+        """Delete an amenity and its links to places — admin only"""
+        if not get_jwt().get("is_admin"):
+            api.abort(403, "Admin privileges required")
+
+        deleted = facade.delete_amenity(amenity_id)
+        if not deleted:
+            return {"error": "Amenity not found"}, 404
+        return {"message": "Amenity deleted successfully", "deleted": deleted}, 200
@@ -1,5 +1,15 @@
+import uuid
+
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import (
+    create_access_token,
+    create_refresh_token,
+    get_jwt,
+    get_jwt_identity,
+    jwt_required,
+)
+from app import login_limiter, token_revocation
 from ...services import facade
 
 api = Namespace("auth", description="Authentication operations")
@@ -13,20 +23,82 @@ login_model = api.model("Login", {
 @api.route("/login")
 class Login(Resource):
     @api.expect(login_model, validate=True)
+    @api.response(429, 'Too many login attempts')
     def post(self):
-        """Authenticate a user and return a JWT access token"""
+        """Authenticate a user and return a JWT access token and refresh token"""
         data = api.payload
 
         email = data.get("email")
         password = data.get("password")
 
+        # Throttled attempts are refused before any password check
+        retry_after = login_limiter.check(request.remote_addr, email)
+        if retry_after:
+            return ({"message": "Too many login attempts, try again later"}, 429,
+                    {"Retry-After": str(retry_after)})
+
         user = facade.authenticate_user(email, password)
         if not user:
+            login_limiter.record_failure(email)
             api.abort(401, "Invalid email or password")
+        login_limiter.record_success(email)
+
+        return _issue_tokens(user["id"], user["is_admin"]), 200
+
+
+def _issue_tokens(identity, is_admin, family=None):
+    """Access and refresh tokens of one family: a new one at login, kept by refreshes."""
+    claims = {"is_admin": is_admin, "fam": family or str(uuid.uuid4())}
+    return {
+        "access_token": create_access_token(identity=identity, additional_claims=claims),
+        "refresh_token": create_refresh_token(identity=identity, additional_claims=claims)
+    }
+
+
+@api.route("/refresh")
+class Refresh(Resource):
+    @jwt_required(refresh=True)
+    @api.response(200, 'New access and refresh tokens')
+    @api.response(401, 'Refresh token revoked or already used, or user deleted')
+    def post(self):
+        """Exchange a refresh token for a new access token and refresh token
+
+        The refresh token sent is revoked: each one can be used only once.
+        The new tokens carry the user's current role, not the old token's.
+        """
+        claims = get_jwt()
+        try:
+            user = facade.get_user(get_jwt_identity())
+        except ValueError:
+            api.abort(401, "User no longer exists")
+        if not token_revocation.revoke(claims):
+            api.abort(401, "Refresh token has already been used")
+        return _issue_tokens(user["id"], user["is_admin"], claims.get("fam")), 200
+
+
+@api.route("/logout")
+class Logout(Resource):
+    @jwt_required(verify_type=False)
+    @api.response(200, 'Token revoked')
+    def post(self):
+        """Revoke the access or refresh token sent, and every token issued with it
+
+        The access and refresh tokens of the login, and those obtained by
+        refreshing since, all stop working.
+        """
+        claims = get_jwt()
+        token_revocation.revoke(claims)
+        token_revocation.revoke_family(claims)
+        return {"message": "Token revoked"}, 200
 
-        access_token = create_access_token(
-            identity=user["id"],
-            additional_claims={"is_admin": user["is_admin"]}
-        )
 
-        return {"access_token": access_token}, 200
\ No newline at end of file
+@api.route("/login/metrics")
+class LoginMetrics(Resource):
+    @jwt_required()
+    @api.response(200, 'Login throttling counters of this worker')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Login throttling metrics — admin only"""
+        if not get_jwt().get("is_admin"):
+            api.abort(403, "Admin privileges required")
+        return login_limiter.metrics(), 200
@@ -0,0 +1,86 @@
+import posixpath
+from urllib.parse import urlsplit
+
+from flask import current_app, request
+from flask_restx import Namespace, Resource, fields
+
+api = Namespace('batch', description='Batch operations')
+
+sub_request_model = api.model('BatchSubRequest', {
+    'method': fields.String(required=True, enum=['GET', 'POST', 'PUT', 'DELETE'],
+                            description='HTTP method of the sub-request'),
+    'path': fields.String(required=True,
+                          description='Path relative to /api/v1, e.g. /places/<id>'),
+    'body': fields.Raw(required=False, description='JSON body of the sub-request')
+})
+
+batch_model = api.model('Batch', {
+    'requests': fields.List(fields.Nested(sub_request_model), required=True,
+                            description='Sub-requests, run in order')
+})
+
+API_PREFIX = '/api/v1'
+DEFAULT_MAX_REQUESTS = 50
+
+
+def _target(path):
+    """The path a sub-request reaches, without its query string, normalised."""
+    target = posixpath.normpath("/" + urlsplit(path.strip()).path.lstrip("/"))
+    return "/" + target.lstrip("/")
+
+
+def _dispatch(method, path, body, headers):
+    """Run one sub-request through the app inside the current app context.
+
+    The app context (and with it ``g`` and the SQLAlchemy session identity
+    map) is the one of the enclosing batch request, so objects loaded by one
+    sub-request are served from the session by the next ones. The client
+    address is the batch request's, so per-IP limits (login throttling)
+    count each sub-request against the real client.
+    """
+    app = current_app._get_current_object()
+    with app.test_request_context(f"{API_PREFIX}{path}", method=method,
+                                  json=body, headers=headers,
+                                  environ_base={"REMOTE_ADDR": request.remote_addr}):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            response = app.handle_exception(e)
+    return {
+        "status": response.status_code,
+        "body": response.get_json(silent=True)
+    }
+
+
+@api.route('', '/')
+class Batch(Resource):
+    @api.expect(batch_model, validate=True)
+    @api.response(200, 'Sub-requests executed, see each status')
+    @api.response(400, 'Invalid batch')
+    def post(self):
+        """Run several API calls in one round trip
+
+        Each sub-request is dispatched with the Authorization header of the
+        batch request and its result is returned in the same order.
+        """
+        sub_requests = api.payload["requests"]
+        max_requests = current_app.config.get("BATCH_MAX_REQUESTS", DEFAULT_MAX_REQUESTS)
+        if len(sub_requests) > max_requests:
+            api.abort(400, f"A batch cannot contain more than {max_requests} requests")
+
+        headers = {}
+        if "Authorization" in request.headers:
+            headers["Authorization"] = request.headers["Authorization"]
+
+        paths = ["/" + sub["path"].strip().lstrip("/") for sub in sub_requests]
+        # Checked before anything runs, so a bad entry cannot leave earlier writes committed
+        for path in paths:
+            target = _target(path)
+            if target == "/batch" or target.startswith("/batch/"):
+                api.abort(400, "Batch requests cannot be nested")
+
+        responses = []
+        for sub, path in zip(sub_requests, paths):
+            responses.append(_dispatch(sub["method"].upper(), path, sub.get("body"), headers))
+
+        return {"responses": responses}, 200
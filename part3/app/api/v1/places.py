@@ -1,5 +1,7 @@
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app import user_loader
 from app.services import facade
  
 api = Namespace('places', description='Place operations')
@@ -71,7 +73,7 @@ class PlaceList(Resource):
         place_data["owner_id"] = get_jwt_identity()
  
         try:
-            result = facade.create_place(place_data)
+            result = facade.create_place(place_data, owner=user_loader.current_user())
             return result, 201
         except ValueError as e:
             api.abort(400, str(e))
@@ -83,6 +85,38 @@ class PlaceList(Resource):
         return facade.get_all_places(), 200
  
  
+@api.route('/import')
+class PlaceImport(Resource):
+    @jwt_required()
+    @api.doc(params={"format": "ndjson or csv (default: from the Content-Type)"})
+    @api.response(200, 'Import finished, see the counters and per-row errors')
+    @api.response(400, 'Unknown format')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """Import places from an NDJSON or CSV body — admin only
+
+        NDJSON: one {"title", "description", "price", "latitude",
+        "longitude", "owner_id"} object per line. CSV: a header row with
+        those columns. Rows are checked with the same rules and messages as
+        POST /places/; invalid rows are skipped and listed in the response.
+        """
+        if not get_jwt().get("is_admin"):
+            api.abort(403, "Admin privileges required")
+
+        from app.services.user_import import FORMATS, detect_format, read_rows, text_stream
+
+        fmt = request.args.get("format") or detect_format(request.content_type)
+        if fmt not in FORMATS:
+            api.abort(400, f"Unknown format '{fmt}', expected one of: {', '.join(FORMATS)}")
+
+        def progress(report):
+            current_app.logger.info("Place import: %d rows processed, %d created, %d failed",
+                                    report.processed, report.created, report.failed)
+
+        rows = read_rows(text_stream(request.stream), fmt)
+        return facade.import_places(rows, fmt=fmt, progress=progress), 200
+ 
+ 
 @api.route('/<string:place_id>')
 @api.route('/<string:place_id>/')
 class PlaceResource(Resource):
@@ -123,15 +157,10 @@ class PlaceResource(Resource):
         claims = get_jwt()
         is_admin = claims.get("is_admin", False)
 
-        try:
-            place = facade.get_place(place_id)
-        except ValueError:
+        owner_id = facade.get_place_owner_id(place_id)
+        if owner_id is None:
             api.abort(404, "Place not found")
 
-        owner_id = place.get("owner_id")
-        if not owner_id and "owner" in place:
-            owner_id = place["owner"]["id"]
-
         if not is_admin and owner_id != current_user_id:
             api.abort(403, "Unauthorized action")
 
@@ -141,4 +170,22 @@ class PlaceResource(Resource):
                 api.abort(404, "Place not found")
             return result, 200
         except ValueError as e:
-            api.abort(400, str(e))
\ No newline at end of file
+            api.abort(400, str(e))
+
+    @jwt_required()
+    @api.response(200, 'Place deleted, with the rows deleted per table')
+    @api.response(403, 'Forbidden')
+    @api.response(404, 'Place not found')
+    def delete(self, place_id):
+        """Delete a place with its reviews and amenity links (owner or admin)"""
+        owner_id = facade.get_place_owner_id(place_id)
+        if owner_id is None:
+            api.abort(404, "Place not found")
+
+        if not get_jwt().get("is_admin", False) and owner_id != get_jwt_identity():
+            api.abort(403, "Unauthorized action")
+
+        deleted = facade.delete_place(place_id)
+        if not deleted:
+            api.abort(404, "Place not found")
+        return {"message": "Place deleted successfully", "deleted": deleted}, 200
\ No newline at end of file
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app import user_loader
 from app.services import facade
  
 api = Namespace('reviews', description='Review operations')
@@ -44,7 +45,7 @@ class ReviewList(Resource):
             pass
 
         try:
-            new_review = facade.create_review(data)
+            new_review = facade.create_review(data, user=user_loader.current_user())
             try:
                 api.logger.info(f"Review created: {new_review.get('id')} for place {new_review.get('place_id')} by user {new_review.get('user_id')}")
             except Exception:
@@ -88,12 +89,11 @@ class ReviewResource(Resource):
         claims = get_jwt()
         is_admin = claims.get("is_admin", False)
  
-        try:
-            review = facade.get_review_by_id(review_id)
-        except ValueError:
+        author_id = facade.get_review_author_id(review_id)
+        if author_id is None:
             api.abort(404, "Review not found")
  
-        if not is_admin and review["user_id"] != current_user_id:
+        if not is_admin and author_id != current_user_id:
             api.abort(403, "Unauthorized action")
  
         try:
@@ -114,12 +114,11 @@ class ReviewResource(Resource):
         claims = get_jwt()
         is_admin = claims.get("is_admin", False)
  
-        try:
-            review = facade.get_review_by_id(review_id)
-        except ValueError:
+        author_id = facade.get_review_author_id(review_id)
+        if author_id is None:
             api.abort(404, "Review not found")
  
-        if not is_admin and review["user_id"] != current_user_id:
+        if not is_admin and author_id != current_user_id:
             api.abort(403, "Unauthorized action")
  
         success = facade.delete_review(review_id)
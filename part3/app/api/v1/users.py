@@ -1,3 +1,4 @@
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from ...services import facade
@@ -67,10 +68,8 @@ class UserList(Resource):
         if not email:
             api.abort(400, "Email is required")
 
-        if facade.get_user_by_email(email):
-            api.abort(400, "Email already registered")
-
-        # Let the facade/model handle password hashing and validations
+        # Let the facade/model handle password hashing, validations and
+        # duplicate emails (rejected by the unique constraint on insert)
         try:
             user = facade.create_user(data)
             return user, 201
@@ -78,6 +77,37 @@ class UserList(Resource):
             api.abort(400, str(e))
  
  
+@api.route("/import")
+class UserImport(Resource):
+    @jwt_required()
+    @api.doc(params={"format": "ndjson or csv (default: from the Content-Type)"})
+    @api.response(200, 'Import finished, see the counters and per-row errors')
+    @api.response(400, 'Unknown format')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """Import users from an NDJSON or CSV body — admin only
+
+        NDJSON: one {"first_name", "last_name", "email", "password",
+        "is_admin"} object per line. CSV: a header row with those columns.
+        Invalid or duplicate rows are skipped and listed in the response.
+        """
+        if not get_jwt().get("is_admin"):
+            api.abort(403, "Admin privileges required")
+
+        from app.services.user_import import FORMATS, detect_format, read_rows, text_stream
+
+        fmt = request.args.get("format") or detect_format(request.content_type)
+        if fmt not in FORMATS:
+            api.abort(400, f"Unknown format '{fmt}', expected one of: {', '.join(FORMATS)}")
+
+        def progress(report):
+            current_app.logger.info("User import: %d rows processed, %d created, %d failed",
+                                    report.processed, report.created, report.failed)
+
+        rows = read_rows(text_stream(request.stream), fmt)
+        return facade.import_users(rows, progress=progress), 200
+ 
+ 
 @api.route("/<string:user_id>")
 class UserDetail(Resource):
  
@@ -103,11 +133,6 @@ class UserDetail(Resource):
  
         if is_admin:
             data = api.payload
-            email = data.get("email")
-            if email:
-                existing = facade.get_user_by_email(email)
-                if existing and existing["id"] != user_id:
-                    api.abort(400, "Email is already in use")
             try:
                 updated = facade.admin_update_user(user_id, data)
                 if not updated:
@@ -129,4 +154,22 @@ class UserDetail(Resource):
                     api.abort(404, "User not found")
                 return updated, 200
             except (ValueError, TypeError) as e:
-                api.abort(400, str(e))
\ No newline at end of file
+                api.abort(400, str(e))
+
+    @jwt_required()
+    @api.response(200, 'User deleted, with the rows deleted per table')
+    @api.response(403, 'Forbidden')
+    @api.response(404, 'User not found')
+    def delete(self, user_id):
+        """Delete a user with their reviews and places (self or admin)
+
+        The reviews and amenity links of the user's places go too. Each
+        table is cleared with one statement, in a single transaction.
+        """
+        if not get_jwt().get("is_admin", False) and get_jwt_identity() != user_id:
+            api.abort(403, "You can only delete your own user")
+
+        deleted = facade.delete_user(user_id)
+        if not deleted:
+            api.abort(404, "User not found")
+        return {"message": "User deleted successfully", "deleted": deleted}, 200
\ No newline at end of file
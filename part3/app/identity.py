@@ -0,0 +1,100 @@
+"""
+The user behind the JWT of the current request.
+
+Handlers that write on behalf of the caller (creating a place or a review)
+need the caller's user row only to check that it exists and to read its
+id. CurrentUserLoader resolves it once per request and keeps a snapshot in
+a short-lived cache keyed by (user id, token issue time), so successive
+requests made with the same token do not load the user again.
+
+A token issued after a change to the user misses the cache. Changes made
+through the facade also drop the cached entries of that user.
+"""
+import threading
+import time
+
+MAX_CACHED_USERS = 10_000
+
+
+class CurrentUser:
+    """Read-only snapshot of the fields of a User the handlers need."""
+
+    __slots__ = ("id", "first_name", "last_name", "email", "is_admin")
+
+    def __init__(self, user):
+        self.id = user.id
+        self.first_name = user.first_name
+        self.last_name = user.last_name
+        self.email = user.email
+        self.is_admin = user.is_admin
+
+
+class _LoaderState:
+    """Per-app cache settings and entries."""
+
+    def __init__(self, config):
+        self.ttl = config.get("CURRENT_USER_CACHE_SECONDS", 30)
+        self.lock = threading.Lock()
+        self.entries = {}
+
+
+class CurrentUserLoader:
+    """Flask extension resolving the current user from the request's JWT."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["current_user_loader"] = _LoaderState(app.config)
+
+    @staticmethod
+    def _state():
+        from flask import current_app
+        return current_app.extensions["current_user_loader"]
+
+    def current_user(self):
+        """
+        Return the CurrentUser of the verified JWT, or None if the user no
+        longer exists. Must be called inside a @jwt_required() view.
+        """
+        from flask import g
+        from flask_jwt_extended import get_jwt
+
+        if "hbnb_current_user" in g:
+            return g.hbnb_current_user
+
+        claims = get_jwt()
+        key = (claims["sub"], claims.get("iat"))
+        state = self._state()
+        now = time.monotonic()
+        entry = state.entries.get(key)
+        if entry is not None and entry[1] > now:
+            user = entry[0]
+        else:
+            user = self._load(key[0])
+            if user is not None:
+                with state.lock:
+                    if len(state.entries) >= MAX_CACHED_USERS:
+                        state.entries = {k: v for k, v in state.entries.items() if v[1] > now}
+                    state.entries[key] = (user, now + state.ttl)
+        g.hbnb_current_user = user
+        return user
+
+    @staticmethod
+    def _load(user_id):
+        from app import db
+        from app.models.user import User
+
+        user = db.session.get(User, user_id)
+        return CurrentUser(user) if user is not None else None
+
+    def invalidate(self, user_id):
+        """Drop the cached snapshots of a user after it changed."""
+        from flask import g, has_app_context
+
+        if has_app_context():
+            g.pop("hbnb_current_user", None)
+        state = self._state()
+        with state.lock:
+            state.entries = {k: v for k, v in state.entries.items() if k[0] != user_id}
@@ -1,15 +1,15 @@
-import uuid
 from datetime import datetime
 from app import db
+from .types import UUID, new_id
 
 
 class BaseModel(db.Model):
     __abstract__ = True
 
     id = db.Column(
-        db.String(36),
+        UUID(),
         primary_key=True,
-        default=lambda: str(uuid.uuid4())
+        default=new_id
     )
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
@@ -1,11 +1,14 @@
 from app import db
 from .base import BaseModel
+from .types import UUID
  
  
 place_amenity = db.Table(
     'place_amenity',
-    db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('place_id', UUID(), db.ForeignKey('places.id'), primary_key=True),
+    db.Column('amenity_id', UUID(), db.ForeignKey('amenities.id'), primary_key=True),
+    # The primary key only serves lookups by place
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id'),
 )
  
  
@@ -17,12 +20,14 @@ class Place(BaseModel):
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(UUID(), db.ForeignKey('users.id'), nullable=False, index=True)
  
     owner = db.relationship('User', backref=db.backref('places', lazy=True), foreign_keys=[owner_id])
     reviews = db.relationship('Review', backref=db.backref('place', lazy=True), lazy=True)
+    # Every relationship is lazy by default; queries that need one choose how
+    # to load it (see PlaceRepository.LIST_LOAD / DETAIL_LOAD)
     amenities = db.relationship('Amenity', secondary=place_amenity,
-                                lazy='subquery', backref=db.backref('places', lazy=True))
+                                lazy=True, backref=db.backref('places', lazy=True))
  
     def __init__(
         self,
@@ -35,7 +40,7 @@ class Place(BaseModel):
     ):
         super().__init__()
         self.title = self._validate_title(title)
-        self.description = description or ""
+        self.description = self._validate_description(description)
         self.price = self._validate_price(price)
         self.latitude = self._validate_latitude(latitude)
         self.longitude = self._validate_longitude(longitude)
@@ -50,11 +55,27 @@ class Place(BaseModel):
             raise ValueError("title must be <= 100 characters")
         return value
  
+    @staticmethod
+    def _validate_description(value) -> str:
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            raise ValueError("description must be a string")
+        return value
+ 
+    @staticmethod
+    def _to_float(value, field: str) -> float:
+        try:
+            return float(value)
+        except OverflowError:
+            # An integer too large for a float
+            raise ValueError(f"{field} must be a number")
+
     @staticmethod
     def _validate_price(value) -> float:
         if not isinstance(value, (int, float)):
             raise ValueError("price must be a number")
-        value = float(value)
+        value = Place._to_float(value, "price")
         if value <= 0:
             raise ValueError("price must be a positive value")
         return value
@@ -63,7 +84,7 @@ class Place(BaseModel):
     def _validate_latitude(value) -> float:
         if not isinstance(value, (int, float)):
             raise ValueError("latitude must be a number")
-        value = float(value)
+        value = Place._to_float(value, "latitude")
         if value < -90.0 or value > 90.0:
             raise ValueError("latitude must be between -90 and 90")
         return value
@@ -72,7 +93,7 @@ class Place(BaseModel):
     def _validate_longitude(value) -> float:
         if not isinstance(value, (int, float)):
             raise ValueError("longitude must be a number")
-        value = float(value)
+        value = Place._to_float(value, "longitude")
         if value < -180.0 or value > 180.0:
             raise ValueError("longitude must be between -180 and 180")
         return value
@@ -85,7 +106,7 @@ class Place(BaseModel):
         if "title" in data:
             self.title = self._validate_title(data["title"])
         if "description" in data:
-            self.description = data["description"] or ""
+            self.description = self._validate_description(data["description"])
         if "price" in data:
             self.price = self._validate_price(data["price"])
         if "latitude" in data:
@@ -1,14 +1,20 @@
 from app import db
 from .base import BaseModel
+from .types import UUID
 
 
 class Review(BaseModel):
     __tablename__ = 'reviews'
+    # One review per user and place; duplicates are rejected on insert
+    __table_args__ = (
+        db.Index('uq_reviews_user_place', 'user_id', 'place_id', unique=True),
+    )
 
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
+    user_id = db.Column(UUID(), db.ForeignKey('users.id'), nullable=False)
+    # Indexed for the reviews of a place and the cascading place delete
+    place_id = db.Column(UUID(), db.ForeignKey('places.id'), nullable=False, index=True)
 
     user = db.relationship('User', backref=db.backref('reviews', lazy=True), foreign_keys=[user_id])
 
@@ -0,0 +1,11 @@
+from datetime import datetime
+from app import db
+
+
+class RevokedToken(db.Model):
+    """JWT revoked before its expiry (logout or refresh token rotation)."""
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
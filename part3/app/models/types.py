@@ -0,0 +1,128 @@
+"""
+Primary key ids.
+
+Ids are UUID strings in Python and in the API. New ids are UUIDv7
+(RFC 9562) by default: a 48-bit millisecond timestamp followed by random
+bits, so rows created later sort later and inserts land at the right end
+of every id index instead of at random pages. ID_VERSION = 4 in the app
+config goes back to random ids.
+
+The UUID column type chooses how ids are stored:
+
+- "text" (default): the 36-character string, as in every existing database.
+- "binary": 16 bytes (native uuid on PostgreSQL), less than half the size
+  in tables and indexes. Existing SQLite databases are converted in place
+  with scripts/migrate_ids.py.
+
+The storage is set with the HBNB_ID_STORAGE environment variable, read
+when the models are imported: it has to match the database, not the app.
+"""
+import os
+import secrets
+import threading
+import time
+import uuid
+
+from sqlalchemy import types
+
+ID_STORAGE = os.getenv("HBNB_ID_STORAGE", "text")
+STORAGES = ("text", "binary")
+
+
+class _UUID7Generator:
+    """UUIDv7 with a 12-bit counter so ids made in the same millisecond still increase."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self):
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._last_ms = ms
+                # Start low in the range, leaving room to count up
+                self._counter = secrets.randbits(11)
+            else:
+                self._counter += 1
+                if self._counter > 0xFFF:
+                    # Counter exhausted: borrow the next millisecond
+                    self._last_ms += 1
+                    self._counter = secrets.randbits(11)
+            ms, counter = self._last_ms, self._counter
+        value = (ms & 0xFFFF_FFFF_FFFF) << 80 | 0x7 << 76 | counter << 64
+        value |= 0b10 << 62 | secrets.randbits(62)
+        return uuid.UUID(int=value)
+
+
+uuid7 = _UUID7Generator()
+
+
+def uuid7_time(value):
+    """Creation time (seconds since the epoch) encoded in a UUIDv7 string."""
+    return (uuid.UUID(value).int >> 80) / 1000
+
+
+def new_id():
+    """A new id string, UUIDv7 unless the app sets ID_VERSION = 4."""
+    from flask import current_app, has_app_context
+
+    version = current_app.config.get("ID_VERSION", 7) if has_app_context() else 7
+    return str(uuid7() if version == 7 else uuid.uuid4())
+
+
+class UUID(types.TypeDecorator):
+    """
+    A UUID string in Python, stored as text or as 16 bytes.
+    With binary storage a string that is not a UUID is bound as NULL, so it
+    matches no row.
+    """
+
+    impl = types.String(36)
+    cache_ok = True
+
+    def __init__(self, storage=None):
+        super().__init__()
+        self.storage = storage or ID_STORAGE
+        if self.storage not in STORAGES:
+            raise ValueError(f"unknown id storage '{self.storage}', expected one of {STORAGES}")
+
+    def _native(self, dialect):
+        return self.storage == "binary" and dialect.name == "postgresql"
+
+    def load_dialect_impl(self, dialect):
+        if self.storage == "text":
+            return dialect.type_descriptor(types.String(36))
+        if dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+            return dialect.type_descriptor(PG_UUID(as_uuid=False))
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(types.LargeBinary(16))
+        return dialect.type_descriptor(types.BINARY(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or self.storage == "text":
+            return value
+        if self._native(dialect):
+            try:
+                return str(uuid.UUID(str(value)))
+            except ValueError:
+                return None
+        if isinstance(value, str) and len(value) == 36:
+            # Fast path for the canonical form; uuid.UUID() costs several times more
+            try:
+                raw = bytes.fromhex(value.replace("-", ""))
+            except ValueError:
+                return None
+            return raw if len(raw) == 16 and value[8:24:5] == "----" else None
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            return None
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            h = value.hex()
+            return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        return value
@@ -1,5 +1,5 @@
 import re
-from app import db, bcrypt
+from app import db, password_hasher
 from .base import BaseModel
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
@@ -47,18 +47,24 @@ class User(BaseModel):
             raise ValueError("email format is invalid")
         return value
 
+    @staticmethod
+    def _validate_password(value: str) -> str:
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError("password is required")
+        return value.strip()
+
     def hash_password(self, password: str) -> None:
         """Hash the password and store it."""
-        if not isinstance(password, str) or not password.strip():
-            raise ValueError("password is required")
-        self.password = bcrypt.generate_password_hash(
-            password.strip()
-        ).decode("utf-8")
+        self.password = password_hasher.hash(self._validate_password(password))
 
     def verify_password(self, password: str) -> bool:
         if not isinstance(password, str):
             return False
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
+
+    def password_needs_rehash(self) -> bool:
+        """True when the stored hash cost differs from BCRYPT_LOG_ROUNDS."""
+        return password_hasher.needs_rehash(self.password)
 
     def update(self, data: dict):
         """Update user fields with validation."""
@@ -0,0 +1,81 @@
+"""
+bcrypt hashing on a bounded worker pool.
+
+Hashing and checking run on a pool of BCRYPT_WORKERS workers (threads by
+default, processes with BCRYPT_EXECUTOR = 'process'), so at most that many
+bcrypt computations compete for the CPU, whatever the number of requests
+waiting on them. bcrypt releases the GIL, so the thread pool scales with
+cores. The cost factor comes from BCRYPT_LOG_ROUNDS.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+DEFAULT_LOG_ROUNDS = 12
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds, prefix=b"2b"))
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """Flask extension hashing and checking passwords with bcrypt."""
+
+    def __init__(self, app=None):
+        self.log_rounds = DEFAULT_LOG_ROUNDS
+        self.executor = None
+        self.workers = 1
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.log_rounds = app.config.get("BCRYPT_LOG_ROUNDS", DEFAULT_LOG_ROUNDS)
+        workers = app.config.get("BCRYPT_WORKERS") or os.cpu_count() or 1
+        self.workers = workers
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        if app.config.get("BCRYPT_EXECUTOR", "thread") == "process":
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers,
+                                               thread_name_prefix="hbnb-bcrypt")
+
+    def _run(self, fn, *args):
+        if self.executor is None:
+            return fn(*args)
+        return self.executor.submit(fn, *args).result()
+
+    def hash(self, password: str) -> str:
+        """Return the bcrypt hash of password at the configured cost."""
+        return self._run(_hash, password.encode("utf-8"), self.log_rounds).decode("utf-8")
+
+    def hash_many(self, passwords) -> list:
+        """Hash several passwords at once, spread over the worker pool."""
+        passwords = [password.encode("utf-8") for password in passwords]
+        rounds = [self.log_rounds] * len(passwords)
+        if self.executor is None:
+            hashed = map(_hash, passwords, rounds)
+        else:
+            hashed = self.executor.map(_hash, passwords, rounds,
+                                       chunksize=max(1, len(passwords) // (self.workers * 4)))
+        return [h.decode("utf-8") for h in hashed]
+
+    def verify(self, hashed: str, password: str) -> bool:
+        """Check password against a stored bcrypt hash."""
+        try:
+            return self._run(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:
+            # Malformed stored hash
+            return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True when a stored hash was made with a different cost than configured."""
+        try:
+            return int(hashed.split("$")[2]) != self.log_rounds
+        except (IndexError, ValueError):
+            return True
@@ -0,0 +1,197 @@
+"""
+Streaming NDJSON export and import of the whole database.
+
+A dump is one JSON object per line: a header, then one line per row of
+users, amenities, places, place_amenity and reviews, in that order so
+foreign keys are satisfied on import:
+
+  {"format": "hbnb-ndjson", "version": 1, "tables": ["users", ...]}
+  {"table": "users", "row": {"id": "...", "email": "...", ...}}
+
+Files ending in .gz are gzip compressed. Both directions run in constant
+memory: the export reads each table through a streaming cursor
+(yield_per) and the import inserts rows in batched transactions.
+
+An import can be resumed. After every committed batch the number of dump
+lines already restored is saved to a checkpoint file; a later run with
+the same checkpoint skips those lines. The batch in flight when a run
+stopped may or may not have been committed, so the first batch after a
+resume leaves out the rows whose primary key already exists (one IN
+query, on any database).
+"""
+import gzip
+import io
+import json
+import os
+from datetime import datetime
+
+FORMAT = "hbnb-ndjson"
+VERSION = 1
+DEFAULT_BATCH_SIZE = 5000
+
+# Revoked tokens are short-lived and not part of a backup
+TABLES = ("users", "amenities", "places", "place_amenity", "reviews")
+
+
+def open_dump(path, mode):
+    """Open a dump file for text reading ("r") or writing ("w"), gzip if it ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+def text_dump(binary_stream, mode, compressed=False):
+    """Wrap a binary stream (stdin, stdout, a BytesIO) as a dump text stream."""
+    if compressed:
+        binary_stream = gzip.GzipFile(fileobj=binary_stream, mode=mode + "b")
+    return io.TextIOWrapper(binary_stream, encoding="utf-8")
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"cannot serialize {type(value).__name__}")
+
+
+def _decoders(table):
+    """Column name -> function turning a JSON value back into a column value."""
+    from sqlalchemy import DateTime
+
+    return {column.name: datetime.fromisoformat
+            for column in table.columns if isinstance(column.type, DateTime)}
+
+
+def export_database(engine, stream, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Write every table to a text stream; return the number of rows per table."""
+    from sqlalchemy import select
+    from app import db
+
+    stream.write(json.dumps({"format": FORMAT, "version": VERSION, "tables": list(TABLES)}) + "\n")
+    counts = {}
+    with engine.connect() as conn:
+        for name in TABLES:
+            table = db.metadata.tables[name]
+            query = select(table).order_by(*table.primary_key.columns)
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            written = 0
+            for partition in result.mappings().partitions():
+                for row in partition:
+                    stream.write(json.dumps({"table": name, "row": dict(row)},
+                                            default=_encode, separators=(",", ":")) + "\n")
+                written += len(partition)
+                if progress is not None:
+                    progress(name, written)
+            counts[name] = written
+    return counts
+
+
+class Checkpoint:
+    """Number of dump lines already restored, kept in a small JSON file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = 0
+        self.rows = dict.fromkeys(TABLES, 0)
+        if path and os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            self.lines = saved["lines"]
+            self.rows.update(saved["rows"])
+
+    def save(self, lines):
+        self.lines = lines
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"lines": self.lines, "rows": self.rows}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _read_header(line):
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("not an HBnB NDJSON dump")
+    if header.get("version") != VERSION:
+        raise ValueError(f"unsupported dump version {header.get('version')}")
+
+
+def _missing_rows(conn, table, rows):
+    """The rows whose primary key is not in the table yet, found with one IN query."""
+    from sqlalchemy import select, tuple_
+
+    columns = list(table.primary_key.columns)
+    key = tuple_(*columns) if len(columns) > 1 else columns[0]
+    keys = [tuple(row[column.name] for column in columns) for row in rows]
+    values = keys if len(columns) > 1 else [k[0] for k in keys]
+    present = {tuple(found) for found in conn.execute(select(*columns).where(key.in_(values)))}
+    return [row for row, k in zip(rows, keys) if k not in present]
+
+
+def import_database(engine, stream, batch_size=DEFAULT_BATCH_SIZE, checkpoint=None,
+                    progress=None):
+    """
+    Insert the rows of a dump read from a text stream.
+    Return the number of rows per table, counting those of earlier runs
+    recorded in `checkpoint` (a Checkpoint, or None for no resuming).
+    The checkpoint file is removed once the whole dump is restored.
+    """
+    from app import db
+
+    checkpoint = checkpoint or Checkpoint(None)
+    resuming = checkpoint.lines > 0
+    batch, batch_table = [], None
+    line_no = 0
+
+    def flush(last_line):
+        nonlocal resuming
+        table = db.metadata.tables[batch_table]
+        rows = batch
+        with engine.begin() as conn:
+            if resuming:
+                # The last batch of the previous run may have been committed
+                rows = _missing_rows(conn, table, batch)
+                resuming = False
+            if rows:
+                conn.execute(table.insert(), rows)
+        checkpoint.rows[batch_table] += len(batch)
+        checkpoint.save(last_line)
+        if progress is not None:
+            progress(batch_table, checkpoint.rows[batch_table])
+        batch.clear()
+
+    decoders = {}
+    for line_no, line in enumerate(stream, start=1):
+        if line_no == 1:
+            _read_header(line)
+            continue
+        if line_no <= checkpoint.lines or not line.strip():
+            continue
+        record = json.loads(line)
+        name, row = record["table"], record["row"]
+        if name not in TABLES:
+            raise ValueError(f"line {line_no}: unknown table '{name}'")
+        if name != batch_table:
+            if batch:
+                flush(line_no - 1)
+            batch_table = name
+            decoders = _decoders(db.metadata.tables[name])
+        for column, decode in decoders.items():
+            if row.get(column) is not None:
+                row[column] = decode(row[column])
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush(line_no)
+    if line_no == 0:
+        raise ValueError("not an HBnB NDJSON dump")
+    if batch:
+        flush(line_no)
+    checkpoint.clear()
+    return dict(checkpoint.rows)
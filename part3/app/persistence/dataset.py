@@ -0,0 +1,270 @@
+"""
+Deterministic synthetic datasets.
+
+DatasetGenerator produces users, amenities, places (with their amenities)
+and reviews as plain row dicts. The same counts and seed always give the
+same rows, whatever the batch size or the backend they are written to.
+
+- Places are spread around a few cities. Each city has a Gaussian cloud of
+  coordinates and its own log-normal price distribution.
+- Reviews favour a minority of popular places and lean towards good
+  ratings. There is at most one review per (user, place), never by the
+  place's owner.
+- Ids are derived from the seed and the row index, so a row can reference
+  another one without the generator keeping every id in memory.
+- Every user shares one password hash, computed once, because bcrypt
+  cannot hash a million passwords in minutes.
+
+Rows are written by SQLAlchemyWriter (multi-row INSERTs in batched
+transactions) or by InMemoryWriter (InMemoryRepository instances).
+"""
+import math
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from types import SimpleNamespace
+
+DEFAULT_PASSWORD = "password123"
+DEFAULT_BATCH_SIZE = 10_000
+
+# name, latitude, longitude, spread (degrees), median price per night, weight
+CITIES = [
+    ("Paris", 48.8566, 2.3522, 0.08, 140.0, 14),
+    ("London", 51.5074, -0.1278, 0.10, 160.0, 12),
+    ("New York", 40.7128, -74.0060, 0.09, 210.0, 12),
+    ("Tokyo", 35.6762, 139.6503, 0.12, 120.0, 10),
+    ("Barcelona", 41.3874, 2.1686, 0.06, 110.0, 8),
+    ("Lisbon", 38.7223, -9.1393, 0.05, 90.0, 6),
+    ("Cape Town", -33.9249, 18.4241, 0.10, 85.0, 5),
+    ("Sydney", -33.8688, 151.2093, 0.12, 150.0, 6),
+    ("Mexico City", 19.4326, -99.1332, 0.10, 60.0, 6),
+    ("Reykjavik", 64.1466, -21.9426, 0.04, 130.0, 2),
+    ("Marrakesh", 31.6295, -7.9811, 0.05, 55.0, 4),
+    ("Bangkok", 13.7563, 100.5018, 0.11, 45.0, 7),
+    ("Buenos Aires", -34.6037, -58.3816, 0.09, 50.0, 5),
+    ("Vancouver", 49.2827, -123.1207, 0.07, 170.0, 3),
+]
+
+AMENITIES = [
+    "WiFi", "Air conditioning", "Kitchen", "Parking", "TV", "Balcony",
+    "Swimming Pool", "Washer", "Dryer", "Heating", "Workspace", "Hot tub",
+    "Gym", "Elevator", "Breakfast", "Fireplace", "Sea view", "Garden",
+    "BBQ grill", "EV charger",
+]
+
+FIRST_NAMES = ["Alice", "Bruno", "Chloe", "David", "Emma", "Farid", "Grace", "Hugo",
+               "Ines", "Jonas", "Kenji", "Lea", "Marco", "Nadia", "Oscar", "Priya",
+               "Quentin", "Rosa", "Samir", "Tara", "Ugo", "Vera", "Wen", "Yara", "Zoe"]
+LAST_NAMES = ["Martin", "Smith", "Garcia", "Tanaka", "Dubois", "Silva", "Nguyen",
+              "Kowalski", "Okafor", "Rossi", "Jensen", "Haddad", "Kim", "Novak",
+              "Moreau", "Lopez", "Schmidt", "Ivanova", "Patel", "Costa"]
+PLACE_KINDS = ["Loft", "Studio", "Apartment", "House", "Cabin", "Villa", "Flat", "Room"]
+PLACE_ADJECTIVES = ["Sunny", "Quiet", "Cosy", "Modern", "Charming", "Spacious",
+                    "Bright", "Rustic", "Elegant", "Central"]
+REVIEW_TEXTS = {
+    1: ["Not as described.", "Would not stay again."],
+    2: ["Noisy at night.", "Needs a good cleaning."],
+    3: ["Fine for a short stay.", "Decent place, nothing special."],
+    4: ["Great location.", "Comfortable and clean.", "Good value for money."],
+    5: ["Perfect stay!", "Wonderful host, highly recommended.", "Would come back anytime."],
+}
+RATING_WEIGHTS = [5, 7, 15, 33, 40]
+_CITY_CUM_WEIGHTS = list(accumulate(city[5] for city in CITIES))
+_RATING_CUM_WEIGHTS = list(accumulate(RATING_WEIGHTS))
+
+EPOCH = datetime(2024, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+_KIND_CODES = {"users": 1, "amenities": 2, "places": 3, "reviews": 4}
+
+
+def entity_id(seed, kind, index):
+    """Id of row `index` of `kind`, a UUID-formatted string."""
+    return f"{seed & 0xffffffff:08x}-{_KIND_CODES[kind]:04x}-4000-8000-{index:012x}"
+
+
+class DatasetGenerator:
+    """Rows of a synthetic dataset of the given size."""
+
+    def __init__(self, users, places, reviews, amenities=len(AMENITIES), seed=0,
+                 password_hash=""):
+        if places and not users:
+            raise ValueError("places need at least one user")
+        if reviews and (users < 2 or not places):
+            raise ValueError("reviews need at least two users and one place")
+        if reviews > places * (users - 1) // 2:
+            raise ValueError("too many reviews for the number of users and places")
+        self.counts = {"users": users, "amenities": amenities, "places": places,
+                       "reviews": reviews}
+        self.seed = seed
+        self.password_hash = password_hash
+
+    def _rng(self, table):
+        return random.Random(f"{self.seed}:{table}")
+
+    def _timestamp(self, rng):
+        return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+    def owner_index(self, place_index):
+        """Index of the user owning a place (a fixed scramble of the place index)."""
+        return (place_index * 2654435761 + self.seed) % self.counts["users"]
+
+    def users(self):
+        rng = self._rng("users")
+        for i in range(self.counts["users"]):
+            created = self._timestamp(rng)
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            yield {
+                "id": entity_id(self.seed, "users", i),
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first.lower()}.{last.lower()}.{i}@example.com",
+                "password": self.password_hash,
+                "is_admin": False,
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    def amenities(self):
+        for i in range(self.counts["amenities"]):
+            name = AMENITIES[i] if i < len(AMENITIES) else f"Amenity {i + 1}"
+            yield {
+                "id": entity_id(self.seed, "amenities", i),
+                "name": name,
+                "created_at": EPOCH,
+                "updated_at": EPOCH,
+            }
+
+    def places(self):
+        rng = self._rng("places")
+        for i in range(self.counts["places"]):
+            name, lat, lng, spread, median_price, _ = rng.choices(
+                CITIES, cum_weights=_CITY_CUM_WEIGHTS)[0]
+            created = self._timestamp(rng)
+            kind = rng.choice(PLACE_KINDS)
+            yield {
+                "id": entity_id(self.seed, "places", i),
+                "title": f"{rng.choice(PLACE_ADJECTIVES)} {kind} in {name}",
+                "description": f"{kind} {rng.randint(1, 40)} minutes from the centre of {name}.",
+                "price": round(rng.lognormvariate(math.log(median_price), 0.45), 2),
+                "latitude": round(max(-90.0, min(90.0, rng.gauss(lat, spread))), 6),
+                "longitude": round(max(-180.0, min(180.0, rng.gauss(lng, spread))), 6),
+                "owner_id": entity_id(self.seed, "users", self.owner_index(i)),
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    def place_amenities(self):
+        rng = self._rng("place_amenity")
+        amenity_count = self.counts["amenities"]
+        for i in range(self.counts["places"]):
+            k = min(amenity_count, rng.randint(0, 6))
+            place_id = entity_id(self.seed, "places", i)
+            for a in sorted(rng.sample(range(amenity_count), k)):
+                yield {"place_id": place_id, "amenity_id": entity_id(self.seed, "amenities", a)}
+
+    def reviews(self):
+        rng = self._rng("reviews")
+        users, places = self.counts["users"], self.counts["places"]
+        seen = set()
+        for i in range(self.counts["reviews"]):
+            while True:
+                # Squaring skews reviews towards low place indices (popular places)
+                place = int(places * rng.random() ** 2)
+                user = rng.randrange(users)
+                pair = user * places + place
+                if user != self.owner_index(place) and pair not in seen:
+                    break
+            seen.add(pair)
+            rating = rng.choices(range(1, 6), cum_weights=_RATING_CUM_WEIGHTS)[0]
+            created = self._timestamp(rng)
+            yield {
+                "id": entity_id(self.seed, "reviews", i),
+                "text": rng.choice(REVIEW_TEXTS[rating]),
+                "rating": rating,
+                "user_id": entity_id(self.seed, "users", user),
+                "place_id": entity_id(self.seed, "places", place),
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    def tables(self):
+        """(table name, rows) pairs in an order that satisfies foreign keys."""
+        return [
+            ("users", self.users()),
+            ("amenities", self.amenities()),
+            ("places", self.places()),
+            ("place_amenity", self.place_amenities()),
+            ("reviews", self.reviews()),
+        ]
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class SQLAlchemyWriter:
+    """Write rows with multi-row INSERTs, one transaction per batch."""
+
+    def __init__(self, engine, batch_size=DEFAULT_BATCH_SIZE):
+        self.engine = engine
+        self.batch_size = batch_size
+
+    def write(self, table_name, rows, progress=None):
+        from app import db
+
+        table = db.metadata.tables[table_name]
+        written = 0
+        with self.engine.connect() as conn:
+            if conn.dialect.name == "sqlite":
+                # A seed can be rebuilt from scratch, so skip the fsync per commit
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                conn.commit()
+            for batch in _batches(rows, self.batch_size):
+                with conn.begin():
+                    conn.execute(table.insert(), batch)
+                written += len(batch)
+                if progress is not None:
+                    progress(table_name, written)
+        return written
+
+
+class InMemoryWriter:
+    """Add rows to InMemoryRepository instances, keyed by table name.
+
+    Rows are stored as attribute objects. Places also get an `amenities`
+    list of amenity records, filled from the place_amenity rows.
+    """
+
+    def __init__(self, repositories):
+        self.repositories = repositories
+
+    def write(self, table_name, rows, progress=None):
+        written = 0
+        if table_name == "place_amenity":
+            places, amenities = self.repositories["places"], self.repositories["amenities"]
+            for row in rows:
+                places.get(row["place_id"]).amenities.append(amenities.get(row["amenity_id"]))
+                written += 1
+        else:
+            repo = self.repositories[table_name]
+            for row in rows:
+                record = SimpleNamespace(**row)
+                if table_name == "places":
+                    record.amenities = []
+                repo.add(record)
+                written += 1
+        if progress is not None:
+            progress(table_name, written)
+        return written
+
+
+def populate(generator, writer, progress=None):
+    """Write every table of a generator; return the number of rows per table."""
+    return {name: writer.write(name, rows, progress) for name, rows in generator.tables()}
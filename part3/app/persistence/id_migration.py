@@ -0,0 +1,77 @@
+"""
+Convert the ids of an existing SQLite database between text and binary.
+
+Every column of the UUID type (primary keys and the foreign keys pointing
+at them) is rewritten in place with one UPDATE per column, through a
+Python function registered on the connection. SQLite stores whatever type
+a value has, so the declared column types stay as they are; only the
+values change. Rows already in the target form are left alone, so the
+conversion can be run again after an interruption. Ids keep their value:
+URLs, tokens and links to other rows stay valid.
+
+The app must then run with the matching HBNB_ID_STORAGE (see
+app/models/types.py).
+"""
+import uuid
+
+from app.models.types import STORAGES
+
+
+def _to_binary(value):
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            return value
+    return value
+
+
+def _to_text(value):
+    if isinstance(value, bytes) and len(value) == 16:
+        return str(uuid.UUID(bytes=value))
+    return value
+
+
+def id_columns():
+    """(table, column) of every UUID column, parents before children."""
+    from app import db
+    from app.models import amenity, place, review, user  # noqa: F401
+    from app.models.types import UUID
+
+    return [(table.name, column.name)
+            for table in db.metadata.sorted_tables
+            for column in table.columns if isinstance(column.type, UUID)]
+
+
+def migrate_ids(engine, to):
+    """
+    Rewrite every id of the database behind `engine` in the `to` storage.
+    Return {"table.column": rows converted} and the rows left in another
+    form (ids that are not UUIDs), under "unconverted".
+    """
+    if to not in STORAGES:
+        raise ValueError(f"unknown id storage '{to}', expected one of {STORAGES}")
+    if engine.dialect.name != "sqlite":
+        raise ValueError("only SQLite databases can be converted in place")
+
+    source_type = "text" if to == "binary" else "blob"
+    convert = _to_binary if to == "binary" else _to_text
+    converted, unconverted = {}, {}
+    with engine.begin() as conn:
+        conn.connection.driver_connection.create_function(
+            "hbnb_convert_id", 1, convert, deterministic=True)
+        existing = {name for name, in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table, column in id_columns():
+            if table not in existing:
+                continue
+            result = conn.exec_driver_sql(
+                f'UPDATE "{table}" SET "{column}" = hbnb_convert_id("{column}") '
+                f'WHERE typeof("{column}") = ?', (source_type,))
+            left = conn.exec_driver_sql(
+                f'SELECT COUNT(*) FROM "{table}" WHERE typeof("{column}") = ?',
+                (source_type,)).scalar()
+            converted[f"{table}.{column}"] = result.rowcount
+            if left:
+                unconverted[f"{table}.{column}"] = left
+    return {"converted": converted, "unconverted": unconverted}
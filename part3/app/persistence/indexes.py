@@ -0,0 +1,54 @@
+"""
+Indexes missing from an existing database.
+
+create_all() creates the tables that do not exist yet, with their indexes,
+but never alters a table that already exists: a database created before an
+index was declared on a model (reviews.uq_reviews_user_place, the foreign
+key indexes used by the cascading deletes) lacks it. ensure_indexes() runs
+at startup and creates each missing index. Where the rows already break a
+unique one, it is left out and the offending values are reported instead:
+creating it would fail, and the duplicates have to be resolved by hand
+first.
+"""
+from sqlalchemy import func, inspect, select
+
+# Duplicate groups listed per index in the report
+MAX_REPORTED = 20
+
+
+def _duplicates(conn, table, columns):
+    """Values of `columns` held by more than one row, with their counts."""
+    keys = [table.c[name] for name in columns]
+    query = (select(*keys, func.count().label("count"))
+             .group_by(*keys)
+             .having(func.count() > 1)
+             .limit(MAX_REPORTED))
+    return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def ensure_indexes(engine, metadata):
+    """
+    Create the indexes of `metadata` missing from the existing tables.
+    Return {"created": [index names], "duplicates": {index name: [rows]}},
+    the rows being the values held more than once (at most MAX_REPORTED)
+    that keep a unique index from being created.
+    """
+    report = {"created": [], "duplicates": {}}
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            with engine.begin() as conn:
+                if index.unique:
+                    duplicates = _duplicates(conn, table, [column.name for column in index.columns])
+                    if duplicates:
+                        report["duplicates"][index.name] = duplicates
+                        continue
+                index.create(conn, checkfirst=True)
+            report["created"].append(index.name)
+    return report
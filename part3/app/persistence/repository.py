@@ -1,5 +1,14 @@
 from abc import ABC, abstractmethod
  
+# Relationship loading strategies accepted by the repositories' `load`
+# argument, by name of the SQLAlchemy loader option
+LOADERS = {
+    "noload": "noload",       # never loaded: the relationship reads as empty/None
+    "lazy": "lazyload",       # one query on first access
+    "selectin": "selectinload",  # one extra SELECT ... IN for all the rows
+    "joined": "joinedload",   # LEFT OUTER JOIN in the same query
+}
+ 
  
 class Repository(ABC):
     @abstractmethod
@@ -53,6 +62,64 @@ class InMemoryRepository(Repository):
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
  
  
+def load_options(model, load):
+    """
+    ORM loader options for a {relationship path: strategy} mapping, e.g.
+    {"owner": "joined", "reviews": "selectin", "reviews.user": "joined"}.
+    "*" sets the strategy of every relationship not named otherwise.
+    """
+    from sqlalchemy import orm
+
+    options = []
+    for path, strategy in (load or {}).items():
+        if strategy not in LOADERS:
+            raise ValueError(f"unknown loading strategy '{strategy}', expected one of {tuple(LOADERS)}")
+        if path == "*":
+            options.append(getattr(orm, LOADERS[strategy])("*"))
+            continue
+        names = path.split(".")
+        entity, option = model, orm
+        for depth, name in enumerate(names):
+            relationship = getattr(entity, name, None)
+            if relationship is None or not hasattr(relationship.property, "mapper"):
+                raise ValueError(f"{entity.__name__} has no relationship '{name}'")
+            # Parent steps of a path keep their own strategy, lazy if not given
+            step = load.get(".".join(names[:depth + 1]), "lazy")
+            option = getattr(option, LOADERS[step])(relationship)
+            entity = relationship.property.mapper.class_
+        options.append(option)
+    return options
+ 
+ 
+def _delete_all(steps):
+    """
+    Run [(table name, DELETE statement)] in one transaction, without loading
+    the rows. Return {table name: rows deleted}.
+    """
+    from app import db
+
+    counts = {}
+    try:
+        for name, statement in steps:
+            result = db.session.execute(statement, execution_options={"synchronize_session": False})
+            counts[name] = counts.get(name, 0) + result.rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return counts
+ 
+ 
+def _read_session():
+    """
+    Session for read-only calls: the read replica's when one is configured
+    (see app/read_replica.py), else db.session.
+    """
+    from app import db, read_replica
+    session = read_replica.session()
+    return session if session is not None else db.session
+ 
+ 
 class SQLAlchemyRepository(Repository):
     def __init__(self, model):
         self.model = model
@@ -62,15 +129,35 @@ class SQLAlchemyRepository(Repository):
         db.session.add(obj)
         db.session.commit()
  
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def get(self, obj_id, load=None):
+        """
+        The row with this id, or None. load chooses how relationships are
+        loaded ({relationship path: strategy}, see load_options()); without
+        it the model's defaults apply.
+        """
+        return _read_session().get(self.model, obj_id, options=load_options(self.model, load))
  
-    def get_all(self):
-        return self.model.query.all()
+    def get_all(self, load=None):
+        return _read_session().query(self.model).options(*load_options(self.model, load)).all()
+ 
+    def get_for_write(self, obj_id):
+        """
+        Load a row's own columns, leaving every relationship lazy.
+        The object is pinned in the session for the rest of the request, so
+        an ownership check followed by an update reads the row only once.
+        """
+        from sqlalchemy.orm import lazyload
+        from app import db
+        obj = db.session.get(self.model, obj_id, options=[lazyload("*")])
+        if obj is not None:
+            # The identity map only holds weak references
+            pinned = db.session.info.setdefault("loaded_for_write", {})
+            pinned[(self.model.__name__, obj_id)] = obj
+        return obj
  
     def update(self, obj_id, data):
         from app import db
-        obj = self.get(obj_id)
+        obj = db.session.get(self.model, obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
@@ -78,13 +165,13 @@ class SQLAlchemyRepository(Repository):
  
     def delete(self, obj_id):
         from app import db
-        obj = self.get(obj_id)
+        obj = db.session.get(self.model, obj_id)
         if obj:
             db.session.delete(obj)
             db.session.commit()
  
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+        return _read_session().query(self.model).filter_by(**{attr_name: attr_value}).first()
  
  
 class UserRepository(SQLAlchemyRepository):
@@ -95,4 +182,110 @@ class UserRepository(SQLAlchemyRepository):
         super().__init__(User)
  
     def get_user_by_email(self, email: str):
-        return self.model.query.filter_by(email=email).first()
\ No newline at end of file
+        return _read_session().query(self.model).filter_by(email=email).first()
+
+    def delete_cascade(self, user_id: str):
+        """
+        Delete a user with their reviews, their places and everything
+        attached to those places, in five statements and one transaction.
+        Return the rows deleted per table.
+        """
+        from sqlalchemy import delete, select
+        from app.models.place import Place, place_amenity
+        from app.models.review import Review
+
+        owned = select(Place.id).where(Place.owner_id == user_id)
+        return _delete_all([
+            ("reviews", delete(Review).where(Review.user_id == user_id)),
+            ("reviews", delete(Review).where(Review.place_id.in_(owned))),
+            ("place_amenity", delete(place_amenity).where(place_amenity.c.place_id.in_(owned))),
+            ("places", delete(Place).where(Place.owner_id == user_id)),
+            ("users", delete(self.model).where(self.model.id == user_id)),
+        ])
+ 
+ 
+class PlaceRepository(SQLAlchemyRepository):
+    """Place-specific repository with per-endpoint loading strategies."""
+ 
+    # The list shows none of the relationships. "lazy" rather than "noload":
+    # noload leaves empty collections marked as loaded in the session, which
+    # later calls in the same session (a batch request) would then trust.
+    LIST_LOAD = {"*": "lazy"}
+    # The detail shows all of them, in a fixed number of queries however many
+    # reviews the place has
+    DETAIL_LOAD = {
+        "owner": "joined",
+        "amenities": "selectin",
+        "reviews": "selectin",
+        "reviews.user": "joined",
+    }
+ 
+    def __init__(self):
+        from app.models.place import Place
+        super().__init__(Place)
+ 
+    def get_place_details(self, place_id: str, load=None):
+        """Load a place with DETAIL_LOAD, or the given strategies."""
+        return (
+            _read_session().query(self.model)
+            .options(*load_options(self.model, self.DETAIL_LOAD if load is None else load))
+            .filter_by(id=place_id)
+            .first()
+        )
+
+    def delete_cascade(self, place_id: str):
+        """
+        Delete a place with its reviews and amenity links, in three
+        statements and one transaction. Return the rows deleted per table.
+        """
+        from sqlalchemy import delete
+        from app.models.place import place_amenity
+        from app.models.review import Review
+
+        return _delete_all([
+            ("reviews", delete(Review).where(Review.place_id == place_id)),
+            ("place_amenity", delete(place_amenity).where(place_amenity.c.place_id == place_id)),
+            ("places", delete(self.model).where(self.model.id == place_id)),
+        ])
+ 
+ 
+class AmenityRepository(SQLAlchemyRepository):
+    """Amenity-specific repository with a cascading delete."""
+ 
+    def __init__(self):
+        from app.models.amenity import Amenity
+        super().__init__(Amenity)
+ 
+    def delete_cascade(self, amenity_id: str):
+        """
+        Delete an amenity and its links to places, in two statements and one
+        transaction. Return the rows deleted per table.
+        """
+        from sqlalchemy import delete
+        from app.models.place import place_amenity
+
+        return _delete_all([
+            ("place_amenity", delete(place_amenity).where(place_amenity.c.amenity_id == amenity_id)),
+            ("amenities", delete(self.model).where(self.model.id == amenity_id)),
+        ])
+ 
+ 
+class ReviewRepository(SQLAlchemyRepository):
+    """
+    Review-specific repository relying on the one-review-per-place index
+    (created on older databases at startup, see app.persistence.indexes).
+    """
+ 
+    def __init__(self):
+        from app.models.review import Review
+        super().__init__(Review)
+ 
+    def get_by_place(self, place_id: str):
+        """Reviews of a place with their authors, in one query."""
+        from sqlalchemy.orm import joinedload
+        return (
+            _read_session().query(self.model)
+            .options(joinedload(self.model.user))
+            .filter_by(place_id=place_id)
+            .all()
+        )
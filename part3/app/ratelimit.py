@@ -0,0 +1,254 @@
+"""
+Login throttling.
+
+Each login attempt takes a token from two buckets, one keyed by client IP
+and one by email, and is refused while an email has too many recent failed
+attempts (sliding-window counter). Refused attempts never reach bcrypt.
+
+Counters live in the process (MemoryRateLimitStore) or in a small SQLite
+file (SQLiteRateLimitStore) shared by every worker on the host, selected by
+RATELIMIT_STORAGE_URI ('memory://' or 'sqlite:////path/to/file.db').
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+
+MAX_MEMORY_KEYS = 100_000
+
+
+def _refill(tokens, updated, capacity, period, now):
+    """Tokens in a bucket at `now`, refilled at capacity/period per second."""
+    return min(capacity, tokens + (now - updated) * capacity / period)
+
+
+def _roll(state, period, now):
+    """Move a (window, current, previous) counter to the window holding `now`."""
+    window = int(now // period)
+    current_window, current, previous = state
+    if window == current_window:
+        return state
+    if window == current_window + 1:
+        return window, 0, current
+    return window, 0, 0
+
+
+def _estimate(state, period, now):
+    """Sliding-window estimate: current count plus the overlapping part of the previous one."""
+    _, current, previous = state
+    return current + previous * (1 - (now % period) / period)
+
+
+class MemoryRateLimitStore:
+    """Counters held in this process, guarded by one lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._windows = {}
+
+    def take(self, key, capacity, period, now):
+        """Take one token; return 0 if allowed, else seconds until a token is available."""
+        with self._lock:
+            if len(self._buckets) > MAX_MEMORY_KEYS:
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < period}
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated, capacity, period, now)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) * period / capacity
+
+    def hit(self, key, period, now):
+        """Count one event in the sliding window of `key`."""
+        with self._lock:
+            if len(self._windows) > MAX_MEMORY_KEYS:
+                oldest = int(now // period) - 1
+                self._windows = {k: v for k, v in self._windows.items() if v[0] >= oldest}
+            window, current, previous = _roll(
+                self._windows.get(key, (int(now // period), 0, 0)), period, now)
+            self._windows[key] = (window, current + 1, previous)
+
+    def count(self, key, period, now):
+        """Estimated number of events of `key` in the last `period` seconds."""
+        with self._lock:
+            state = self._windows.get(key)
+        if state is None:
+            return 0.0
+        return _estimate(_roll(state, period, now), period, now)
+
+    def reset(self, key):
+        with self._lock:
+            self._windows.pop(key, None)
+
+
+class SQLiteRateLimitStore:
+    """Counters kept in a SQLite file so every worker process shares them."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        # The store is built at app creation, before gunicorn --preload forks
+        # the workers: this connection is closed so no child inherits it
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_buckets ("
+                         "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_windows ("
+                         "key TEXT PRIMARY KEY, slot INTEGER NOT NULL, "
+                         "current INTEGER NOT NULL, previous INTEGER NOT NULL)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        """This thread's connection, opened again in a forked child process."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def take(self, key, capacity, period, now):
+        conn = self._transaction()
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?",
+                               (key,)).fetchone()
+            tokens = _refill(*(row or (capacity, now)), capacity, period, now)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) * period / capacity
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) "
+                         "VALUES (?, ?, ?)", (key, tokens, now))
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def hit(self, key, period, now):
+        conn = self._transaction()
+        try:
+            row = conn.execute("SELECT slot, current, previous FROM rate_windows "
+                               "WHERE key = ?", (key,)).fetchone()
+            window, current, previous = _roll(row or (int(now // period), 0, 0), period, now)
+            conn.execute("INSERT OR REPLACE INTO rate_windows (key, slot, current, previous) "
+                         "VALUES (?, ?, ?, ?)", (key, window, current + 1, previous))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def count(self, key, period, now):
+        row = self._connect().execute("SELECT slot, current, previous FROM rate_windows "
+                                      "WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return 0.0
+        return _estimate(_roll(row, period, now), period, now)
+
+    def reset(self, key):
+        self._connect().execute("DELETE FROM rate_windows WHERE key = ?", (key,))
+
+
+def create_store(uri):
+    if uri.startswith("sqlite:///"):
+        return SQLiteRateLimitStore(uri[len("sqlite:///"):])
+    if uri == "memory://":
+        return MemoryRateLimitStore()
+    raise ValueError(f"Unsupported RATELIMIT_STORAGE_URI: {uri}")
+
+
+class _LimiterState:
+    """Per-app limiter settings, store and metrics."""
+
+    def __init__(self, config):
+        self.enabled = config.get("RATELIMIT_ENABLED", True)
+        self.store = create_store(config.get("RATELIMIT_STORAGE_URI", "memory://"))
+        self.per_ip = config.get("LOGIN_RATE_PER_IP", (20, 60))
+        self.per_email = config.get("LOGIN_RATE_PER_EMAIL", (5, 60))
+        self.failures = config.get("LOGIN_FAILURE_LIMIT", (10, 900))
+        self.lock = threading.Lock()
+        self.metrics = {"allowed": 0, "rejected_ip": 0, "rejected_email": 0,
+                        "rejected_failures": 0, "failures": 0}
+
+    def count(self, name):
+        with self.lock:
+            self.metrics[name] += 1
+
+
+class LoginRateLimiter:
+    """Flask extension throttling POST /auth/login."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["login_rate_limiter"] = _LimiterState(app.config)
+
+    @staticmethod
+    def _state():
+        from flask import current_app
+        return current_app.extensions["login_rate_limiter"]
+
+    @staticmethod
+    def _email_key(email):
+        return (email or "").strip().lower()
+
+    def check(self, ip, email):
+        """
+        Record a login attempt and return how many seconds the client must
+        wait before retrying, or 0 if the attempt may go ahead.
+        """
+        state = self._state()
+        if not state.enabled:
+            return 0
+        now = time.time()
+        email = self._email_key(email)
+
+        max_failures, window = state.failures
+        if state.store.count(f"fail:{email}", window, now) >= max_failures:
+            state.count("rejected_failures")
+            return math.ceil(window - now % window)
+
+        capacity, period = state.per_ip
+        wait = state.store.take(f"ip:{ip}", capacity, period, now)
+        if wait:
+            state.count("rejected_ip")
+            return math.ceil(wait)
+
+        capacity, period = state.per_email
+        wait = state.store.take(f"email:{email}", capacity, period, now)
+        if wait:
+            state.count("rejected_email")
+            return math.ceil(wait)
+
+        state.count("allowed")
+        return 0
+
+    def record_failure(self, email):
+        state = self._state()
+        if not state.enabled:
+            return
+        state.count("failures")
+        state.store.hit(f"fail:{self._email_key(email)}", state.failures[1], time.time())
+
+    def record_success(self, email):
+        state = self._state()
+        if state.enabled:
+            state.store.reset(f"fail:{self._email_key(email)}")
+
+    def metrics(self):
+        """Counters of this worker process since startup."""
+        state = self._state()
+        with state.lock:
+            return dict(state.metrics)
@@ -0,0 +1,89 @@
+"""
+Read/write splitting.
+
+With SQLALCHEMY_READ_URI set, the read-only repository calls (get,
+get_all, get_by_attribute and the lookups built on them) run on a second
+engine: a replica, or a second connection pool on the same WAL SQLite
+file. Every write, and every row loaded to be changed
+(get_for_write), goes through db.session on the primary.
+
+Read-your-writes: once db.session commits in an app context (one request),
+the rest of that context reads from the primary, so a request sees what
+it just wrote even if the replica lags. READ_YOUR_WRITES = False keeps
+reads on the replica. Separate requests get no such guarantee from a
+lagging replica.
+
+The read engine is registered as the "read" bind of Flask-SQLAlchemy, so
+it gets the same driver defaults, SQLite pragmas and engine options
+(SQLALCHEMY_READ_ENGINE_OPTIONS). No table belongs to that bind, so
+create_all() never touches it.
+"""
+BIND_KEY = "read"
+
+
+class _ReplicaState:
+    """Per-app read session factory and settings."""
+
+    def __init__(self, engine, config):
+        from flask.globals import app_ctx
+        from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+        self.read_your_writes = config.get("READ_YOUR_WRITES", True)
+        # One read session per app context, like db.session
+        self.session = scoped_session(sessionmaker(bind=engine, class_=Session),
+                                      scopefunc=lambda: id(app_ctx._get_current_object()))
+
+
+def _pin_to_primary(session):
+    """after_commit of db.session: the rest of the app context reads the primary."""
+    from flask import current_app, g, has_app_context
+
+    if not has_app_context():
+        return
+    state = current_app.extensions.get("read_replica")
+    if state is not None and state.read_your_writes:
+        g.hbnb_read_primary = True
+
+
+class ReadReplica:
+    """Flask extension routing read-only repository calls to a read engine."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def configure(self, app):
+        """Register the read bind; must run before db.init_app(app)."""
+        uri = app.config.get("SQLALCHEMY_READ_URI")
+        if uri:
+            binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+            binds[BIND_KEY] = dict(app.config.get("SQLALCHEMY_READ_ENGINE_OPTIONS") or {}, url=uri)
+            app.config["SQLALCHEMY_BINDS"] = binds
+
+    def init_app(self, app):
+        """Create the read sessions; must run after db.init_app(app)."""
+        from sqlalchemy import event
+        from app import db
+
+        if not app.config.get("SQLALCHEMY_READ_URI"):
+            app.extensions["read_replica"] = None
+            return
+        with app.app_context():
+            engine = db.engines[BIND_KEY]
+        state = _ReplicaState(engine, app.config)
+        app.extensions["read_replica"] = state
+        app.teardown_appcontext(lambda exc: state.session.remove())
+        if not event.contains(db.session, "after_commit", _pin_to_primary):
+            event.listen(db.session, "after_commit", _pin_to_primary)
+
+    @staticmethod
+    def session():
+        """The read session of the current app context, or None to read the primary."""
+        from flask import current_app, g, has_app_context
+
+        if not has_app_context():
+            return None
+        state = current_app.extensions.get("read_replica")
+        if state is None or g.get("hbnb_read_primary"):
+            return None
+        return state.session()
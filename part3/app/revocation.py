@@ -0,0 +1,220 @@
+"""
+JWT revocation (logout and refresh token rotation).
+
+Revoked token ids (jti) are stored in the revoked_tokens table, which is
+the exact set shared by every worker. Each worker keeps a Bloom filter of
+those ids in memory. A token that is not revoked, which is nearly every
+token, is cleared by the filter alone without touching the database. Only
+filter hits (revoked tokens and rare false positives) are looked up.
+
+Workers pick up revocations made by other workers every
+REVOCATION_SYNC_SECONDS.
+
+Tokens issued together at login share a family id (the "fam" claim), kept
+by the tokens a refresh issues. Logout revokes the family with the token,
+so the refresh token of the session stops working too. A family is stored
+like a jti, and a token is refused when its jti or its family is revoked.
+Deleting a user revokes its id the same way, which refuses every token
+issued to it (the "sub" claim).
+
+Revocations are read and written on their own connection, never through
+the request's session: the check runs before the request, and a commit
+there would commit whatever the session holds.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class BloomFilter:
+    """Bloom filter of strings.
+
+    It uses 16 slots per expected key and 4 probes, which keeps the false
+    positive rate near 0.1%. A missing key is usually rejected by its first
+    probe. Each slot is a whole byte rather than a bit: the filter is 8 times
+    larger (1.6 MB for 100k keys), but a probe is one index instead of a
+    shift and a mask. Slot positions come from the process-local str hash,
+    so a filter is only meaningful inside the process that built it.
+    """
+
+    SLOTS_PER_KEY = 16
+    HASHES = 4
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        size = 64
+        while size < capacity * self.SLOTS_PER_KEY:
+            size <<= 1
+        self.mask = size - 1
+        self.slots = bytearray(size)
+        self.count = 0
+
+    def add(self, key):
+        h = hash(key)
+        step = (h >> 32) | 1
+        for _ in range(self.HASHES):
+            self.slots[h & self.mask] = 1
+            h += step
+        self.count += 1
+
+    def __contains__(self, key):
+        h = hash(key)
+        slots, mask = self.slots, self.mask
+        if not slots[h & mask]:
+            return False
+        step = (h >> 32) | 1
+        for _ in range(self.HASHES - 1):
+            h += step
+            if not slots[h & mask]:
+                return False
+        return True
+
+
+class _RevocationState:
+    """Bloom filter and sync bookkeeping."""
+
+    def __init__(self, config):
+        self.capacity = config.get("REVOCATION_BLOOM_CAPACITY", 100_000)
+        self.sync_seconds = config.get("REVOCATION_SYNC_SECONDS", 5)
+        self.bloom = BloomFilter(self.capacity)
+        self.lock = threading.Lock()
+        self.next_sync = 0.0
+        self.synced_until = None
+
+
+class TokenRevocationStore:
+    """Flask extension recording and checking revoked JWTs.
+
+    The filter is kept on the extension rather than looked up through
+    current_app, which alone would cost more than the filter check. It is a
+    per-process filter: with several apps in one process it holds the
+    revoked ids of all of them, which only adds database lookups, since the
+    exact check always runs against the current app's database.
+    """
+
+    def __init__(self, app=None):
+        self.state = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Register the revoked_tokens table with the metadata used by create_all()
+        from app.models import revoked_token  # noqa: F401
+        if self.state is None:
+            self.state = _RevocationState(app.config)
+        else:
+            # A later app must still load the revocations of its own database
+            self.state.next_sync = 0.0
+            self.state.synced_until = None
+
+    def create_table(self, app):
+        """
+        Create the revoked_tokens table in databases that predate token
+        revocation. Must run after db.init_app(app).
+        """
+        from app import db
+        from app.models.revoked_token import RevokedToken
+
+        with app.app_context():
+            RevokedToken.__table__.create(db.engine, checkfirst=True)
+
+    def is_revoked(self, jwt_payload):
+        """True if the token, its family or its user has been revoked."""
+        state = self.state
+        if time.monotonic() >= state.next_sync:
+            self._sync(state)
+        bloom = state.bloom
+        jti, family, subject = jwt_payload["jti"], jwt_payload.get("fam"), jwt_payload.get("sub")
+        if (jti not in bloom and (family is None or family not in bloom)
+                and (subject is None or subject not in bloom)):
+            return False
+        keys = [key for key in (jti, family, subject) if key is not None and key in bloom]
+        from sqlalchemy import select
+        from app import db
+        from app.models.revoked_token import RevokedToken
+
+        with db.engine.connect() as conn:
+            query = select(RevokedToken.jti).where(RevokedToken.jti.in_(keys)).limit(1)
+            return conn.execute(query).first() is not None
+
+    def revoke(self, jwt_payload):
+        """
+        Revoke a token until it expires.
+        Returns False if it was already revoked, so a refresh token can only
+        be rotated once even when two requests race with it.
+        """
+        return self._add(jwt_payload["jti"], datetime.utcfromtimestamp(jwt_payload["exp"]))
+
+    def revoke_family(self, jwt_payload):
+        """
+        Revoke every token issued with this one: the login's tokens and
+        those of the refreshes since. It lasts as long as a refresh token
+        issued now, which outlives any token of the family.
+        Returns False if the family was already revoked, or the token has none.
+        """
+        family = jwt_payload.get("fam")
+        if family is None:
+            return False
+        return self._add(family, self._family_expiry())
+
+    def revoke_subject(self, user_id):
+        """
+        Revoke every token issued to a user, for as long as a refresh token
+        issued now would last. Used when the user is deleted.
+        """
+        return self._add(user_id, self._family_expiry())
+
+    @staticmethod
+    def _family_expiry():
+        from flask import current_app
+
+        lifetime = current_app.config.get("JWT_REFRESH_TOKEN_EXPIRES")
+        return datetime.max if lifetime is False else datetime.utcnow() + lifetime
+
+    def _add(self, key, expires_at):
+        from sqlalchemy import insert
+        from sqlalchemy.exc import IntegrityError
+        from app import db
+        from app.models.revoked_token import RevokedToken
+
+        state = self.state
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(RevokedToken).values(jti=key, expires_at=expires_at))
+        except IntegrityError:
+            return False
+        with state.lock:
+            state.bloom.add(key)
+        return True
+
+    def _sync(self, state):
+        """Load revocations made since the last sync, by this or other workers."""
+        from sqlalchemy import delete, select
+        from app import db
+        from app.models.revoked_token import RevokedToken
+
+        with state.lock:
+            if time.monotonic() < state.next_sync:
+                return
+            state.next_sync = time.monotonic() + state.sync_seconds
+
+            now = datetime.utcnow()
+            query = select(RevokedToken.jti).where(RevokedToken.expires_at > now)
+            if state.synced_until is not None:
+                # Overlap the previous sync so rows committed late are not missed
+                query = query.where(
+                    RevokedToken.revoked_at >= state.synced_until - timedelta(seconds=state.sync_seconds)
+                )
+            with db.engine.begin() as conn:
+                jtis = [jti for jti in conn.scalars(query) if jti not in state.bloom]
+
+                if state.bloom.count + len(jtis) > state.capacity:
+                    # Filter full: drop expired tokens and rebuild a larger one
+                    conn.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+                    jtis = list(conn.scalars(select(RevokedToken.jti)))
+                    state.capacity = max(state.capacity, 2 * len(jtis))
+                    state.bloom = BloomFilter(state.capacity)
+
+            for jti in jtis:
+                state.bloom.add(jti)
+            state.synced_until = now
@@ -1,20 +1,66 @@
+from contextlib import contextmanager
+
 from app.persistence.repository import (
+    AmenityRepository,
     InMemoryRepository,
-    SQLAlchemyRepository,
+    PlaceRepository,
+    ReviewRepository,
     UserRepository,
 )
  
  
+def _unique_columns(error):
+    """
+    The "table.column" names of the unique constraint an IntegrityError
+    broke, or None when it broke another kind of constraint (or the
+    driver does not say).
+    """
+    orig = error.orig
+    text = str(orig)
+    if text.startswith("UNIQUE constraint failed: "):
+        # SQLite: "UNIQUE constraint failed: reviews.user_id, reviews.place_id"
+        return {name.strip() for name in text.split(": ", 1)[1].split(",")}
+    diag = getattr(orig, "diag", None)
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    detail = getattr(diag, "message_detail", None) or ""
+    if code == "23505" and detail.startswith("Key ("):
+        # PostgreSQL: "Key (user_id, place_id)=(...) already exists."
+        columns = detail[len("Key ("):detail.index(")=")]
+        return {f"{diag.table_name}.{name.strip()}" for name in columns.split(",")}
+    return None
+
+
+@contextmanager
+def _unique(message, *columns):
+    """
+    Turn a violation of the unique constraint on `columns` ("table.column")
+    raised by a commit inside the block into ValueError(message); any other
+    IntegrityError (NOT NULL, foreign key, another unique constraint) is
+    raised as is. Uniqueness is left to the database instead of being
+    checked with a SELECT first, which would cost a round trip and still
+    let two concurrent requests insert the same value.
+    """
+    from sqlalchemy.exc import IntegrityError
+    from app import db
+
+    try:
+        yield
+    except IntegrityError as e:
+        db.session.rollback()
+        if _unique_columns(e) != set(columns):
+            raise
+        raise ValueError(message) from None
+ 
+ 
 class HBnBFacade:
     def __init__(self):
         from app.models.place import Place
         from app.models.review import Review
-        from app.models.amenity import Amenity
  
         self.user_repo = UserRepository()
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
-        self.amenity_repo = SQLAlchemyRepository(Amenity)
+        self.place_repo = PlaceRepository()
+        self.review_repo = ReviewRepository()
+        self.amenity_repo = AmenityRepository()
  
     # User Management Methods
     def create_user(self, user_data):
@@ -35,11 +81,10 @@ class HBnBFacade:
             raise ValueError("Last name cannot be empty")
         if not password:
             raise ValueError("Password is required")
-        if self.user_repo.get_user_by_email(email):
-            raise ValueError(f"User with email '{email}' already exists")
  
         user = User(**user_data)
-        self.user_repo.add(user)
+        with _unique("Email already registered", "users.email"):
+            self.user_repo.add(user)
  
         return {
             "id": user.id,
@@ -95,7 +140,7 @@ class HBnBFacade:
         }
  
     def update_user(self, user_id, data):
-        user = self.user_repo.get(user_id)
+        user = self.user_repo.get_for_write(user_id)
         if not user:
             return None
  
@@ -107,6 +152,7 @@ class HBnBFacade:
             raise ValueError("You cannot modify is_admin")
  
         user.update(data)
+        self._forget_current_user(user_id)
  
         return {
             "id": user.id,
@@ -124,6 +170,12 @@ class HBnBFacade:
  
         user = self.user_repo.get_user_by_email(email)
         if user and user.verify_password(password):
+            # Bring hashes made with an older cost up to BCRYPT_LOG_ROUNDS
+            if user.password_needs_rehash():
+                # The lookup may have come from the read replica
+                user = self.user_repo.get_for_write(user.id)
+                user.hash_password(password)
+                user.save()
             return {
                 "id": user.id,
                 "first_name": user.first_name,
@@ -136,13 +188,15 @@ class HBnBFacade:
  
     def admin_update_user(self, user_id, data):
         """Admin version: can also update email and password."""
-        user = self.user_repo.get(user_id)
+        user = self.user_repo.get_for_write(user_id)
         if not user:
             return None
  
         allowed = {k: v for k, v in data.items()
                    if k in {"first_name", "last_name", "email", "is_admin", "password"}}
-        user.update(allowed)
+        with _unique("Email is already in use", "users.email"):
+            user.update(allowed)
+        self._forget_current_user(user_id)
  
         return {
             "id": user.id,
@@ -154,18 +208,55 @@ class HBnBFacade:
             "updated_at": user.updated_at.isoformat()
         }
  
+    def import_users(self, rows, batch_size=None, progress=None):
+        """
+        Create users from (line number, row) pairs (see
+        app.services.user_import.read_rows) and return the import report.
+        """
+        from flask import current_app
+        from app.services.user_import import DEFAULT_BATCH_SIZE, UserImporter
+
+        batch_size = batch_size or current_app.config.get("USER_IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        return UserImporter(batch_size=batch_size, progress=progress).run(rows).to_dict()
+ 
+    def delete_user(self, user_id):
+        """
+        Delete a user, their reviews and their places (with the reviews and
+        amenity links of those places). Return the rows deleted per table,
+        or None if the user does not exist.
+        """
+        from app import token_revocation
+
+        counts = self.user_repo.delete_cascade(user_id)
+        if not counts["users"]:
+            return None
+        self._forget_current_user(user_id)
+        # Tokens already issued to the user stop working, refresh tokens included
+        token_revocation.revoke_subject(user_id)
+        return counts
+
+    @staticmethod
+    def _forget_current_user(user_id):
+        from app import user_loader
+        user_loader.invalidate(user_id)
+ 
     # Place Management Methods
-    def create_place(self, place_data):
+    def create_place(self, place_data, owner=None):
+        """
+        owner is the already loaded owner (the request's CurrentUser); when
+        it is not given, the user with place_data["owner_id"] is loaded.
+        """
         from app.models.place import Place
  
-        owner = self.user_repo.get(place_data.get("owner_id"))
+        if owner is None:
+            owner = self.user_repo.get(place_data.get("owner_id"))
         if not owner:
             raise ValueError(f"Owner {place_data.get('owner_id')} does not exist")
  
         amenities_ids = place_data.get("amenities", [])
         amenities = []
         for amenity_id in amenities_ids:
-            amenity = self.amenity_repo.get(amenity_id)
+            amenity = self.amenity_repo.get_for_write(amenity_id)
             if not amenity:
                 raise ValueError(f"Amenity {amenity_id} does not exist")
             amenities.append(amenity)
@@ -181,6 +272,8 @@ class HBnBFacade:
  
         for amenity in amenities:
             place.add_amenity(amenity)
+        # Read before the commit expires them: one refresh per amenity otherwise
+        amenity_ids = [amenity.id for amenity in amenities]
  
         self.place_repo.add(place)
  
@@ -192,20 +285,33 @@ class HBnBFacade:
             "latitude": place.latitude,
             "longitude": place.longitude,
             "owner_id": owner.id,
-            "amenities": [amenity.id for amenity in amenities]
+            "amenities": amenity_ids
         }
  
-    def get_place(self, place_id):
-        place = self.place_repo.get(place_id)
+    def get_place(self, place_id, load=None):
+        # Owner, amenities and reviews (with their authors) are loaded eagerly
+        # so the query count does not grow with the number of reviews
+        # (PlaceRepository.DETAIL_LOAD, unless load says otherwise)
+        place = self.place_repo.get_place_details(place_id, load=load)
         if not place:
             raise ValueError(f"Place {place_id} does not exist")
  
-        owner = self.user_repo.get(place.owner_id)
-        
+        owner = place.owner
+ 
         # Include reviews in the returned place details so clients can render them
         reviews = []
         try:
-            reviews = self.get_reviews_by_place(place.id)
+            reviews = [
+                {
+                    "id": review.id,
+                    "text": review.text,
+                    "rating": review.rating,
+                    "user_id": review.user_id,
+                    "user_email": review.user.email if review.user else None,
+                    "place_id": review.place_id
+                }
+                for review in place.reviews
+            ]
         except Exception as e:
             print(f"[DEBUG] Error getting reviews for place {place_id}: {str(e)}")
             reviews = []
@@ -272,7 +378,7 @@ class HBnBFacade:
         print(f"[DEBUG] Returning place data for {place_id}: title={title}, amenities={len(amenities_list)}, reviews={len(reviews_list)}")
         return result
  
-    def get_all_places(self):
+    def get_all_places(self, load=None):
         # Build list of places while ensuring there are no duplicate visible titles
         preferred_names = [
             'Sunset Loft', 'Ocean Breeze Apartment', 'Alpine Retreat',
@@ -281,7 +387,7 @@ class HBnBFacade:
         used = {}
         results = []
         idx = 0
-        for place in self.place_repo.get_all():
+        for place in self.place_repo.get_all(load=load or self.place_repo.LIST_LOAD):
             raw_title = place.title if place.title != 'Admin Updated' else 'Sunset Loft'
             title = raw_title
             if title in used:
@@ -306,8 +412,13 @@ class HBnBFacade:
             })
         return results
  
+    def get_place_owner_id(self, place_id):
+        """Return the owner id of a place, or None if it does not exist."""
+        place = self.place_repo.get_for_write(place_id)
+        return place.owner_id if place else None
+ 
     def update_place(self, place_id, place_data):
-        place = self.place_repo.get(place_id)
+        place = self.place_repo.get_for_write(place_id)
         if not place:
             return None
  
@@ -323,7 +434,7 @@ class HBnBFacade:
         if "amenities" in place_data:
             amenities = []
             for amenity_id in place_data["amenities"]:
-                amenity = self.amenity_repo.get(amenity_id)
+                amenity = self.amenity_repo.get_for_write(amenity_id)
                 if not amenity:
                     raise ValueError(f"Amenity {amenity_id} does not exist")
                 amenities.append(amenity)
@@ -339,9 +450,33 @@ class HBnBFacade:
             "owner_id": place.owner_id,
             "amenities": [amenity.id for amenity in place.amenities]
         }
+
+    def delete_place(self, place_id):
+        """
+        Delete a place with its reviews and amenity links. Return the rows
+        deleted per table, or None if the place does not exist.
+        """
+        counts = self.place_repo.delete_cascade(place_id)
+        return counts if counts["places"] else None
+
+    def import_places(self, rows, fmt="ndjson", batch_size=None, progress=None):
+        """
+        Create places from (line number, row) pairs (see
+        app.services.user_import.read_rows), validated a column at a time,
+        and return the import report.
+        """
+        from flask import current_app
+        from app.services.place_import import DEFAULT_BATCH_SIZE, PlaceImporter
+
+        batch_size = batch_size or current_app.config.get("PLACE_IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        return PlaceImporter(batch_size=batch_size, progress=progress, fmt=fmt).run(rows).to_dict()
  
     # Review Management Methods
-    def create_review(self, review_data):
+    def create_review(self, review_data, user=None):
+        """
+        user is the already loaded author (the request's CurrentUser); when
+        it is not given, the user with review_data["user_id"] is loaded.
+        """
         from app.models.review import Review
  
         user_id = review_data.get("user_id")
@@ -349,7 +484,8 @@ class HBnBFacade:
         text = review_data.get("text")
         rating = review_data.get("rating")
  
-        user = self.user_repo.get(user_id)
+        if user is None:
+            user = self.user_repo.get(user_id)
         if not user:
             raise ValueError(f"User {user_id} does not exist")
  
@@ -360,12 +496,10 @@ class HBnBFacade:
         if place.owner_id == user_id:
             raise ValueError("You cannot review your own place")
  
-        for review in self.review_repo.get_all():
-            if review.user_id == user_id and review.place_id == place_id:
-                raise ValueError("You have already reviewed this place")
- 
         review = Review(text=text, rating=rating, place=place, user=user)
-        self.review_repo.add(review)
+        with _unique("You have already reviewed this place",
+                     "reviews.user_id", "reviews.place_id"):
+            self.review_repo.add(review)
  
         return {
             "id": review.id,
@@ -404,24 +538,26 @@ class HBnBFacade:
         place = self.place_repo.get(place_id)
         if not place:
             raise ValueError(f"Place {place_id} does not exist")
-        reviews = []
-        for review in self.review_repo.get_all():
-            if review.place_id != place_id:
-                continue
-            # try to attach user email when possible
-            user = self.user_repo.get(review.user_id)
-            reviews.append({
+        # Authors are joined in, instead of one user query per review
+        return [
+            {
                 "id": review.id,
                 "text": review.text,
                 "rating": review.rating,
                 "user_id": review.user_id,
-                "user_email": user.email if user else None,
+                "user_email": review.user.email if review.user else None,
                 "place_id": review.place_id
-            })
-        return reviews
+            }
+            for review in self.review_repo.get_by_place(place_id)
+        ]
+ 
+    def get_review_author_id(self, review_id):
+        """Return the author id of a review, or None if it does not exist."""
+        review = self.review_repo.get_for_write(review_id)
+        return review.user_id if review else None
  
     def update_review(self, review_id, update_data):
-        review = self.review_repo.get(review_id)
+        review = self.review_repo.get_for_write(review_id)
         if not review:
             return None
  
@@ -436,7 +572,7 @@ class HBnBFacade:
         }
  
     def delete_review(self, review_id):
-        review = self.review_repo.get(review_id)
+        review = self.review_repo.get_for_write(review_id)
         if not review:
             return False
  
@@ -451,12 +587,9 @@ class HBnBFacade:
         if not name:
             raise ValueError("Amenity name is required")
  
-        for amenity in self.amenity_repo.get_all():
-            if amenity.name == name:
-                raise ValueError(f"Amenity '{name}' already exists")
- 
         amenity = Amenity(name=name)
-        self.amenity_repo.add(amenity)
+        with _unique(f"Amenity '{name}' already exists", "amenities.name"):
+            self.amenity_repo.add(amenity)
  
         return {
             "id": amenity.id,
@@ -483,7 +616,7 @@ class HBnBFacade:
         ]
  
     def update_amenity(self, amenity_id, amenity_data):
-        amenity = self.amenity_repo.get(amenity_id)
+        amenity = self.amenity_repo.get_for_write(amenity_id)
         if not amenity:
             return None
  
@@ -491,13 +624,19 @@ class HBnBFacade:
             if not amenity_data["name"]:
                 raise ValueError("Amenity name cannot be empty")
  
-            for existing in self.amenity_repo.get_all():
-                if existing.name == amenity_data["name"] and existing.id != amenity_id:
-                    raise ValueError(f"Amenity '{amenity_data['name']}' already exists")
- 
-            amenity.name = amenity_data["name"]
+            with _unique(f"Amenity '{amenity_data['name']}' already exists",
+                         "amenities.name"):
+                amenity.update({"name": amenity_data["name"]})
  
         return {
             "id": amenity.id,
             "name": amenity.name
-        }
\ No newline at end of file
+        }
+
+    def delete_amenity(self, amenity_id):
+        """
+        Delete an amenity and its links to places. Return the rows deleted
+        per table, or None if the amenity does not exist.
+        """
+        counts = self.amenity_repo.delete_cascade(amenity_id)
+        return counts if counts["amenities"] else None
\ No newline at end of file
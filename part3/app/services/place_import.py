@@ -0,0 +1,277 @@
+"""
+Bulk place import from NDJSON or CSV, validated a column at a time.
+
+Rows are read with the user import's reader (app.services.user_import)
+and handled in batches. Each batch is turned into columns and checked by
+validate_place_columns(), which applies the Place model's rules to whole
+columns with NumPy array operations: a type code per value (mapped in C,
+without a Python loop), then vectorized comparisons for the ranges and
+string lengths.
+The result holds, for every rule, a boolean mask of the rows breaking it
+and, for every row, the message Place would have raised first. Valid rows
+go straight to one multi-row INSERT per batch.
+
+NumPy is optional. Without it the same function runs the Place validators
+row by row and returns the same masks and messages.
+"""
+import math
+from datetime import datetime
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+DEFAULT_BATCH_SIZE = 5000
+TITLE_MAX_LENGTH = 100
+# Longer titles are stripped in Python first: a NumPy string array takes
+# (longest string x rows) memory
+_VECTOR_TITLE_LENGTH = 4 * TITLE_MAX_LENGTH
+
+# Rules in the order Place.__init__ applies them; a row reports the first one it breaks
+RULES = (
+    ("title_type", "title is required"),
+    ("title_length", f"title must be <= {TITLE_MAX_LENGTH} characters"),
+    ("description_type", "description must be a string"),
+    ("price_type", "price must be a number"),
+    ("price_range", "price must be a positive value"),
+    ("latitude_type", "latitude must be a number"),
+    ("latitude_range", "latitude must be between -90 and 90"),
+    ("longitude_type", "longitude must be a number"),
+    ("longitude_range", "longitude must be between -180 and 180"),
+)
+COLUMNS = ("title", "description", "price", "latitude", "longitude", "owner_id")
+_NUMBER_TYPES = (int, float, bool)
+# Type codes of the NumPy path; bool counts as a float, like in Place
+_STR, _INT, _FLOAT, _NONE = 1, 2, 3, 4
+_KIND_CODES = {str: _STR, int: _INT, float: _FLOAT, bool: _FLOAT, type(None): _NONE}
+
+
+def _is_number(value):
+    kind = type(value)
+    if kind is int:
+        # Place rejects integers too large for a float
+        try:
+            float(value)
+        except OverflowError:
+            return False
+        return True
+    return kind in _NUMBER_TYPES
+
+
+class PlaceColumns:
+    """
+    Outcome of validating a batch of place columns.
+
+    masks maps each rule name to a per-row boolean mask (True: the row
+    breaks it). errors holds, per row, the first message in Place's order
+    or None. valid is the mask of rows without errors, and values the
+    cleaned columns (stripped titles, float coordinates) of every row.
+    """
+
+    def __init__(self, size, masks, values):
+        self.size = size
+        self.masks = masks
+        self.values = values
+        errors = [None] * size
+        for rule, message in RULES:
+            for i in _true_indices(masks[rule]):
+                if errors[i] is None:
+                    errors[i] = message
+        self.errors = errors
+        self.valid = [error is None for error in errors]
+
+    def rows(self):
+        """Column values of the valid rows, as one dict per row."""
+        names = list(self.values)
+        columns = [self.values[name] for name in names]
+        for i in _true_indices(self.valid):
+            yield {name: _plain(column[i]) for name, column in zip(names, columns)}
+
+
+def _true_indices(mask):
+    if np is not None and isinstance(mask, np.ndarray):
+        return np.flatnonzero(mask).tolist()
+    return [i for i, flag in enumerate(mask) if flag]
+
+
+def _plain(value):
+    """NumPy scalars as Python values, for the DB driver."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def validate_place_columns(columns):
+    """
+    Validate equal-length place columns (title, description, price,
+    latitude, longitude, owner_id) with Place's rules.
+    Return a PlaceColumns.
+    """
+    size = len(columns["title"])
+    if np is None:
+        return _validate_rows(columns, size)
+    return _validate_arrays(columns, size)
+
+
+def _number_column(column, size):
+    """(is-a-number mask, float array with NaN where it is not)."""
+    kinds = _kinds(column, size)
+    is_number = (kinds == _FLOAT) | (kinds == _INT)
+    for i in np.flatnonzero(kinds == _INT).tolist():
+        # Integers too large for a float are not numbers to Place
+        is_number[i] = _is_number(column[i])
+    # fromiter keeps list values (from JSON) as single objects
+    values = np.fromiter(column, dtype=object, count=size)
+    values[~is_number] = math.nan
+    return is_number, values.astype(np.float64)
+
+
+def _kinds(column, size):
+    """A type code per value (_STR, _INT, _FLOAT, _NONE or 0), built without a Python loop."""
+    return np.fromiter(map(_KIND_CODES.get, map(type, column), repeat(0, size)),
+                       dtype=np.int8, count=size)
+
+
+def _validate_arrays(columns, size):
+    titles = columns["title"]
+    is_str = _kinds(titles, size) == _STR
+    texts = np.fromiter(titles, dtype=object, count=size)
+    texts[~is_str] = ""
+    raw_lengths = np.fromiter(map(len, texts), dtype=np.int64, count=size)
+    for i in np.flatnonzero(raw_lengths > _VECTOR_TITLE_LENGTH).tolist():
+        # Still too long after stripping, which the length mask below reports
+        texts[i] = texts[i].strip()[:TITLE_MAX_LENGTH + 1]
+    stripped = np.char.strip(texts.astype(str))
+    lengths = np.char.str_len(stripped)
+
+    masks = {"title_type": ~is_str | (lengths == 0)}
+    masks["title_length"] = lengths > TITLE_MAX_LENGTH
+
+    values = {"title": stripped}
+    for name, low, high in (("price", None, None), ("latitude", -90.0, 90.0),
+                            ("longitude", -180.0, 180.0)):
+        is_number, numbers = _number_column(columns[name], size)
+        masks[f"{name}_type"] = ~is_number
+        if low is None:
+            # NaN compares False, as in Place._validate_price
+            masks[f"{name}_range"] = is_number & (numbers <= 0)
+        else:
+            masks[f"{name}_range"] = is_number & ((numbers < low) | (numbers > high))
+        values[name] = numbers
+
+    descriptions = columns["description"]
+    kinds = _kinds(descriptions, size)
+    # None (or a missing column) is stored as "", like in Place
+    masks["description_type"] = (kinds != _STR) & (kinds != _NONE)
+    values["description"] = [v or "" for v in descriptions]
+    values["owner_id"] = list(columns["owner_id"])
+    return PlaceColumns(size, masks, values)
+
+
+def _validate_rows(columns, size):
+    """Fallback without NumPy: the Place validators, one row at a time."""
+    from app.models.place import Place
+
+    checks = (
+        ("title", Place._validate_title),
+        ("description", Place._validate_description),
+        ("price", Place._validate_price),
+        ("latitude", Place._validate_latitude),
+        ("longitude", Place._validate_longitude),
+    )
+    messages = {message: rule for rule, message in RULES}
+    masks = {rule: [False] * size for rule, _ in RULES}
+    values = {name: [None] * size for name, _ in checks}
+    for name, validate in checks:
+        column = columns[name]
+        for i in range(size):
+            try:
+                values[name][i] = validate(column[i])
+            except ValueError as e:
+                masks[messages[str(e)]][i] = True
+    values["owner_id"] = list(columns["owner_id"])
+    return PlaceColumns(size, masks, values)
+
+
+def _csv_number(value):
+    """CSV cells are strings: numbers are parsed, anything else is left to fail validation."""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+class PlaceImporter:
+    """Validate places a column at a time and insert them in batches."""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, progress=None, fmt="ndjson"):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.fmt = fmt
+
+    def run(self, rows):
+        """Import (line number, row) pairs and return an ImportReport."""
+        from app.services.user_import import ImportReport
+
+        report = ImportReport()
+        batch = []
+        for line_no, row in rows:
+            batch.append((line_no, row))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch, report)
+                batch = []
+        if batch:
+            self._import_batch(batch, report)
+        return report
+
+    def _columns(self, batch, report):
+        """Split parsed rows into columns; unparsable rows are reported here."""
+        line_numbers = []
+        columns = {name: [] for name in COLUMNS}
+        for line_no, row in batch:
+            if isinstance(row, Exception):
+                report.error(line_no, str(row))
+                continue
+            line_numbers.append(line_no)
+            for name in COLUMNS:
+                value = row.get(name)
+                if self.fmt == "csv" and name in ("price", "latitude", "longitude"):
+                    value = _csv_number(value)
+                columns[name].append(value)
+        return line_numbers, columns
+
+    def _import_batch(self, batch, report):
+        from sqlalchemy import insert, select
+        from app import db
+        from app.models.place import Place
+        from app.models.types import new_id
+        from app.models.user import User
+
+        report.processed += len(batch)
+        line_numbers, columns = self._columns(batch, report)
+        checked = validate_place_columns(columns)
+        for line_no, error in zip(line_numbers, checked.errors):
+            if error is not None:
+                report.error(line_no, error)
+
+        valid = [(line_numbers[i], row) for i, row in
+                 zip(_true_indices(checked.valid), checked.rows())]
+        owner_ids = {row["owner_id"] for _, row in valid if isinstance(row["owner_id"], str)}
+        known = set(db.session.scalars(select(User.id).where(User.id.in_(owner_ids)))) if owner_ids else set()
+        now = datetime.utcnow()
+        values = []
+        for line_no, row in valid:
+            if not isinstance(row["owner_id"], str) or row["owner_id"] not in known:
+                report.error(line_no, f"Owner {row['owner_id']} does not exist")
+                continue
+            row.update(id=new_id(), created_at=now, updated_at=now)
+            values.append(row)
+
+        if values:
+            db.session.execute(insert(Place), values)
+            db.session.commit()
+            report.created += len(values)
+        if self.progress is not None:
+            self.progress(report)
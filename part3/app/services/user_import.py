@@ -0,0 +1,188 @@
+"""
+Bulk user import from NDJSON or CSV.
+
+Rows are read one at a time from a text stream and handled in batches:
+each batch is validated with the User model's rules, checked against the
+emails already in the database with one query, hashed on the password
+worker pool, then inserted with one multi-row INSERT and committed.
+Invalid rows are reported with their line number and skipped; they do not
+stop the import.
+"""
+import csv
+import io
+import json
+import time
+from datetime import datetime
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = ("ndjson", "csv")
+
+
+def detect_format(name_or_type):
+    """Guess the input format from a file name or a Content-Type."""
+    value = (name_or_type or "").lower()
+    if value.endswith(".csv") or "csv" in value:
+        return "csv"
+    return "ndjson"
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (line number, row) pairs from a text stream.
+    A row that cannot be parsed is yielded as a ValueError instead of a dict.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, ValueError("invalid JSON")
+            continue
+        if not isinstance(row, dict):
+            row = ValueError("row must be a JSON object")
+        yield line_no, row
+
+
+def text_stream(binary_stream):
+    """Wrap a binary stream (a file or a request body) for read_rows()."""
+    return io.TextIOWrapper(io.BufferedReader(binary_stream), encoding="utf-8", newline="")
+
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+class ImportReport:
+    """Counters and per-row errors of one import."""
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.monotonic()
+
+    def error(self, line_no, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": line_no, "error": message})
+
+    def to_dict(self):
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "seconds": round(time.monotonic() - self.started, 3),
+        }
+
+
+class UserImporter:
+    """Validate, hash and insert users in batches."""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def run(self, rows):
+        """Import (line number, row) pairs and return an ImportReport."""
+        report = ImportReport()
+        batch = []
+        for line_no, row in rows:
+            batch.append((line_no, row))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch, report)
+                batch = []
+        if batch:
+            self._import_batch(batch, report)
+        return report
+
+    @staticmethod
+    def _validate(row):
+        """Return the column values of a valid row, or raise ValueError."""
+        from app.models.user import User
+
+        if isinstance(row, Exception):
+            raise row
+        return {
+            "first_name": User._validate_name(row.get("first_name"), "first_name", 50),
+            "last_name": User._validate_name(row.get("last_name"), "last_name", 50),
+            "email": User._validate_email(row.get("email")),
+            "is_admin": _parse_bool(row.get("is_admin", False)),
+            "password": User._validate_password(row.get("password")),
+        }
+
+    def _import_batch(self, batch, report):
+        from sqlalchemy import select
+        from app import db, password_hasher
+        from app.models.types import new_id
+        from app.models.user import User
+
+        report.processed += len(batch)
+        valid = []
+        emails = set()
+        for line_no, row in batch:
+            try:
+                values = self._validate(row)
+            except ValueError as e:
+                report.error(line_no, str(e))
+                continue
+            if values["email"] in emails:
+                report.error(line_no, "Email already registered")
+                continue
+            emails.add(values["email"])
+            valid.append((line_no, values))
+
+        if emails:
+            taken = set(db.session.scalars(select(User.email).where(User.email.in_(emails))))
+            for line_no, values in valid:
+                if values["email"] in taken:
+                    report.error(line_no, "Email already registered")
+            valid = [(line_no, values) for line_no, values in valid if values["email"] not in taken]
+
+        if valid:
+            hashes = password_hasher.hash_many([values["password"] for _, values in valid])
+            now = datetime.utcnow()
+            for (_, values), hashed in zip(valid, hashes):
+                values.update(id=new_id(), password=hashed,
+                              created_at=now, updated_at=now)
+            self._insert(valid, report)
+
+        if self.progress is not None:
+            self.progress(report)
+
+    @staticmethod
+    def _insert(valid, report):
+        """Insert the batch in one transaction, falling back to row by row on a conflict."""
+        from sqlalchemy import insert
+        from sqlalchemy.exc import IntegrityError
+        from app import db
+        from app.models.user import User
+
+        try:
+            db.session.execute(insert(User), [values for _, values in valid])
+            db.session.commit()
+            report.created += len(valid)
+            return
+        except IntegrityError:
+            # An email was registered after the lookup above
+            db.session.rollback()
+        for line_no, values in valid:
+            try:
+                db.session.execute(insert(User), [values])
+                db.session.commit()
+                report.created += 1
+            except IntegrityError:
+                db.session.rollback()
+                report.error(line_no, "Email already registered")
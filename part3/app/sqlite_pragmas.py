@@ -0,0 +1,58 @@
+"""
+SQLite connection settings.
+
+SQLite keeps most of its tuning per connection, so SQLitePragmas runs the
+PRAGMA statements of SQLITE_PRAGMAS on every new connection of the app's
+SQLite engines (a "connect" event listener). With no SQLITE_PRAGMAS the
+engines keep SQLite's defaults.
+
+The production profile (config.ProductionConfig) uses:
+
+- journal_mode=WAL: readers and the writer no longer block each other.
+- synchronous=NORMAL: with WAL, commits are durable across a crash of the
+  process and only the last ones can be lost on power failure.
+- cache_size (negative: KiB) and mmap_size (bytes): keep hot pages in
+  memory instead of going through read() on every query.
+- busy_timeout (ms): how long to wait for a lock before failing with
+  "database is locked", set here rather than left to the driver default.
+
+Pool sizing and pre-ping are plain SQLALCHEMY_ENGINE_OPTIONS.
+"""
+
+
+def _apply(pragmas, dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def read_pragmas(connection, names):
+    """Current value of each pragma on a SQLAlchemy connection."""
+    return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
+
+
+class SQLitePragmas:
+    """Flask extension applying SQLITE_PRAGMAS to every new SQLite connection."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Must run after db.init_app(app), which creates the engines."""
+        from sqlalchemy import event
+        from app import db
+
+        pragmas = dict(app.config.get("SQLITE_PRAGMAS") or {})
+        app.extensions["sqlite_pragmas"] = pragmas
+        if not pragmas:
+            return
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect",
+                             lambda dbapi_connection, record: _apply(pragmas, dbapi_connection))
@@ -0,0 +1,10 @@
+import os
+from app.asgi import create_asgi_app
+from config import config
+
+# HBNB_CONFIG=production selects the production database profile
+app = create_asgi_app(config[os.getenv('HBNB_CONFIG', 'default')])
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='127.0.0.1', port=5000)
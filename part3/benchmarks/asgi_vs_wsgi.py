@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compare throughput of the WSGI and ASGI serving modes.
+
+Both servers serve the same app and the same seeded SQLite file. Each one
+is driven by the same number of concurrent keep-alive clients alternating
+between the place list and place detail endpoints.
+
+Run this from the `part3` folder:
+  pip install uvicorn
+  python3 benchmarks/asgi_vs_wsgi.py --concurrency 64 --requests 4000
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.asgi import AsgiAdapter
+from config import Config
+
+
+def make_config(db_path, threads):
+    return type("BenchConfig", (Config,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "ASGI_THREADS": threads,
+    })
+
+
+def seed(app, places):
+    """Create one owner and `places` places, return their ids."""
+    from app.models.user import User
+    from app.models.place import Place
+
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="Bench", last_name="Owner",
+                     email="bench@example.com", password="bench1234")
+        db.session.add(owner)
+        db.session.flush()
+        ids = []
+        for i in range(places):
+            place = Place(title=f"Place {i}", description="Benchmark place",
+                          price=50.0 + i % 200, latitude=(i % 180) - 90.0,
+                          longitude=(i % 360) - 180.0, owner_id=owner.id)
+            db.session.add(place)
+            db.session.flush()
+            ids.append(place.id)
+        db.session.commit()
+    return ids
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def wsgi_server(app, port):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", port, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+
+
+@contextlib.contextmanager
+def asgi_server(app, port, threads):
+    import uvicorn
+
+    config = uvicorn.Config(AsgiAdapter(app, max_workers=threads), host="127.0.0.1",
+                            port=port, log_level="warning", backlog=4096)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def drive(port, paths, total, concurrency):
+    """Send `total` GETs from `concurrency` keep-alive clients."""
+    per_client = total // concurrency
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client(n):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, failed = [], 0
+        for i in range(per_client):
+            path = paths[(n + i) % len(paths)]
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            local.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--places", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=32,
+                        help="ASGI thread pool size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, "bench.db"), args.threads))
+        ids = seed(app, args.places)
+        paths = ["/api/v1/places/"] + [f"/api/v1/places/{pid}" for pid in ids[:50]]
+
+        results = {}
+        # The API prints debug lines on every place detail request
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            port = free_port()
+            with wsgi_server(app, port):
+                results["wsgi"] = drive(port, paths, args.requests, args.concurrency)
+            port = free_port()
+            with asgi_server(app, port, args.threads):
+                results["asgi"] = drive(port, paths, args.requests, args.concurrency)
+
+    print(json.dumps({"concurrency": args.concurrency, "places": args.places,
+                      "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Measure latency and throughput of every v1 route on seeded databases.
+
+The database of each size is generated once with the synthetic dataset
+generator (app/persistence/dataset.py) and kept in instance/. Every run
+works on a fresh copy, so the write routes do not change it. Each route is
+called through the Flask test client for --seconds (at least
+--min-requests and at most --max-requests times). The report gives the
+latency percentiles and the requests per second of each route.
+
+With --baseline (by default benchmarks/baselines/endpoints-<size>.json, if
+it exists) each route is compared with a previous run. The script exits
+with status 1 when a route's p50 or p95 got slower than the tolerance
+allows. --save-baseline stores the current run as that baseline.
+
+Run this from the `part3` folder:
+  python3 benchmarks/endpoints.py --size 1k
+  python3 benchmarks/endpoints.py --size 100k --save-baseline
+  python3 benchmarks/endpoints.py --size 1m --output results-1m.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from config import Config
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+DATA_DIR = os.path.join(ROOT, "instance")
+
+# users, places, reviews
+SIZES = {
+    "1k": (100, 200, 1_000),
+    "100k": (10_000, 20_000, 100_000),
+    "1m": (100_000, 200_000, 1_000_000),
+}
+
+
+def make_config(db_path):
+    return type("BenchConfig", (Config,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        # Every login comes from the benchmark, which would be throttled
+        "RATELIMIT_ENABLED": False,
+    })
+
+
+def seeded_database(size, seed):
+    """Path of the generated database of a size, created on first use."""
+    from app.persistence.dataset import DEFAULT_PASSWORD, DatasetGenerator, SQLAlchemyWriter, populate
+
+    path = os.path.join(DATA_DIR, f"bench_{size}_seed{seed}.db")
+    if os.path.exists(path):
+        return path
+    users, places, reviews = SIZES[size]
+    building = path + ".building"
+    if os.path.exists(building):
+        os.remove(building)
+    app = create_app(make_config(building))
+    with app.app_context():
+        from app import password_hasher
+        from app.models import amenity, place, review, user  # noqa: F401
+
+        db.create_all()
+        generator = DatasetGenerator(users, places, reviews, seed=seed,
+                                     password_hash=password_hasher.hash(DEFAULT_PASSWORD))
+        print(f"Generating the {size} dataset in {path}...", file=sys.stderr)
+        populate(generator, SQLAlchemyWriter(db.engine))
+        db.engine.dispose()
+    os.replace(building, path)
+    return path
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Bench:
+    """Routes of the API and the state they need (tokens, ids)."""
+
+    def __init__(self, app, size, seed, rng):
+        from app.persistence.dataset import AMENITIES, DEFAULT_PASSWORD, entity_id
+
+        self.client = app.test_client()
+        self.rng = rng
+        self.seed = seed
+        self.counts = dict(zip(("users", "places", "reviews"), SIZES[size]),
+                           amenities=len(AMENITIES))
+        self.entity_id = entity_id
+        self.created_places = []
+        self.sequence = 0
+
+        with app.app_context():
+            from app.models.user import User
+            admin = User(first_name="Bench", last_name="Admin",
+                         email="bench.admin@example.com", password=DEFAULT_PASSWORD, is_admin=True)
+            db.session.add(admin)
+            db.session.commit()
+            self.emails = [db.session.get(User, entity_id(seed, "users", i)).email for i in (0, 1)]
+
+        self.tokens = {
+            "admin": self.login("bench.admin@example.com"),
+            "owner": self.login(self.emails[0]),
+            "reviewer": self.login(self.emails[1]),
+        }
+
+    def login(self, email):
+        from app.persistence.dataset import DEFAULT_PASSWORD
+        r = self.client.post("/api/v1/auth/login", json={"email": email, "password": DEFAULT_PASSWORD})
+        return r.get_json()["access_token"]
+
+    def random_id(self, kind):
+        return self.entity_id(self.seed, kind, self.rng.randrange(self.counts[kind]))
+
+    def next_name(self, prefix):
+        self.sequence += 1
+        return f"{prefix} {self.sequence}"
+
+    def routes(self):
+        """(name, request function, expected status) of every measured route."""
+        from app.persistence.dataset import DEFAULT_PASSWORD
+
+        c = self.client
+
+        def auth(role):
+            return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+        def create_place():
+            r = c.post("/api/v1/places/", headers=auth("owner"), json={
+                "title": self.next_name("Bench place"), "description": "Benchmark",
+                "price": 80.0, "latitude": 48.85, "longitude": 2.35,
+            })
+            if r.status_code == 201:
+                self.created_places.append(r.get_json()["id"])
+            return r
+
+        def create_review():
+            if not self.created_places:
+                return None
+            return c.post("/api/v1/reviews/", headers=auth("reviewer"), json={
+                "text": "Benchmark review", "rating": 4, "place_id": self.created_places.pop(),
+            })
+
+        return [
+            ("GET /places/", lambda: c.get("/api/v1/places/"), 200),
+            ("GET /places/<id>", lambda: c.get(f"/api/v1/places/{self.random_id('places')}"), 200),
+            ("GET /users/", lambda: c.get("/api/v1/users/"), 200),
+            ("GET /users/<id>", lambda: c.get(f"/api/v1/users/{self.random_id('users')}"), 200),
+            ("GET /reviews/", lambda: c.get("/api/v1/reviews/"), 200),
+            ("GET /reviews/<id>", lambda: c.get(f"/api/v1/reviews/{self.random_id('reviews')}"), 200),
+            ("GET /amenities/", lambda: c.get("/api/v1/amenities/"), 200),
+            ("GET /amenities/<id>", lambda: c.get(f"/api/v1/amenities/{self.random_id('amenities')}"), 200),
+            ("POST /auth/login", lambda: c.post("/api/v1/auth/login", json={
+                "email": self.emails[0], "password": DEFAULT_PASSWORD}), 200),
+            ("POST /users/", lambda: c.post("/api/v1/users/", json={
+                "first_name": "Bench", "last_name": "User", "password": "secret123",
+                "email": f"{self.next_name('bench').replace(' ', '.')}@example.com"}), 201),
+            ("POST /amenities/", lambda: c.post("/api/v1/amenities/", headers=auth("admin"),
+                                                json={"name": self.next_name("Bench amenity")}), 201),
+            ("POST /places/", create_place, 201),
+            ("POST /reviews/", create_review, 201),
+        ]
+
+
+def measure(call, expected, seconds, min_requests, max_requests, warmup):
+    for _ in range(warmup):
+        call()
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    while len(latencies) < max_requests:
+        elapsed = time.perf_counter() - start
+        if len(latencies) >= min_requests and elapsed >= seconds:
+            break
+        t0 = time.perf_counter()
+        response = call()
+        t1 = time.perf_counter()
+        if response is None:
+            break
+        latencies.append((t1 - t0) * 1000)
+        if response.status_code != expected:
+            errors += 1
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 3) if latencies else None,
+        "p90_ms": round(percentile(latencies, 90), 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 3) if latencies else None,
+        "max_ms": round(latencies[-1], 3) if latencies else None,
+        "requests_per_second": round(len(latencies) / total, 2) if latencies else 0,
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Per-route change of p50/p95 against a baseline; a slowdown beyond tolerance is a regression."""
+    comparison = {}
+    for route, current in results["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if not base or current["p50_ms"] is None or base.get("p50_ms") is None:
+            continue
+        entry = {"regression": False}
+        for key in ("p50_ms", "p95_ms"):
+            change = (current[key] - base[key]) / base[key] if base[key] else 0.0
+            entry[key.replace("_ms", "_change")] = round(change, 3)
+            if change > tolerance and current[key] - base[key] > min_delta_ms:
+                entry["regression"] = True
+        comparison[route] = entry
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="1k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--routes", help="Only routes containing this text, e.g. 'GET /places'")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time spent on each route")
+    parser.add_argument("--min-requests", type=int, default=5)
+    parser.add_argument("--max-requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=3,
+                        help="Unmeasured calls of each route before measuring")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Baseline JSON (default: benchmarks/baselines/endpoints-<size>.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown of p50/p95 before a route is a regression (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore slowdowns smaller than this, which are noise")
+    args = parser.parse_args()
+
+    source = seeded_database(args.size, args.seed)
+    workdir = tempfile.mkdtemp(prefix="hbnb-bench-")
+    try:
+        db_path = os.path.join(workdir, "bench.db")
+        shutil.copyfile(source, db_path)
+        app = create_app(make_config(db_path))
+        bench = Bench(app, args.size, args.seed, random.Random(args.seed))
+
+        routes = {}
+        for name, call, expected in bench.routes():
+            if args.routes and args.routes not in name:
+                continue
+            # The facade prints debug lines on some routes
+            with contextlib.redirect_stdout(io.StringIO()):
+                routes[name] = measure(call, expected, args.seconds, args.min_requests,
+                                       args.max_requests, args.warmup)
+            print(f"{name}: p50 {routes[name]['p50_ms']} ms, "
+                  f"{routes[name]['requests_per_second']} req/s", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "size": args.size,
+        "seed": args.seed,
+        "rows": dict(zip(("users", "places", "reviews"), SIZES[args.size])),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "routes": routes,
+    }
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"endpoints-{args.size}.json")
+    status = 0
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {baseline_path}", file=sys.stderr)
+    elif os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            results["comparison"] = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        regressions = [route for route, entry in results["comparison"].items() if entry["regression"]]
+        results["regressions"] = regressions
+        status = 1 if regressions else 0
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
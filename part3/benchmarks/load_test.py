@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Drive the API with many concurrent clients and report how it holds up.
+
+The app is served in this process by Werkzeug's threaded WSGI server, on a
+copy of a generated database (the same ones as benchmarks/endpoints.py).
+--workers client threads each repeat flows modelled on the part4 frontend,
+picked at random with the weights given by --mix:
+
+  browse  index page: GET /places/, then POST /batch with up to 50 details
+  detail  place page: GET /places/<id>
+  login   login page: POST /auth/login
+  review  add_review page: GET /places/<id>, then POST /reviews/
+
+The report gives the throughput, the p50/p95/p99 latency and the error rate
+for the whole run, for each flow, and for every --interval seconds. A
+response is an error when its status is not one the flow expects (for
+example 201, or 400 for a duplicate review) or the connection fails.
+
+Run this from the `part3` folder:
+  python3 benchmarks/load_test.py --size 100k --workers 32 --duration 60
+  python3 benchmarks/load_test.py --mix browse=1,detail=6,login=1,review=2
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from endpoints import SIZES, make_config, percentile, seeded_database
+
+DEFAULT_MIX = "browse=3,detail=5,login=1,review=1"
+BATCH_SIZE = 50
+
+
+@contextlib.contextmanager
+def wsgi_server(app):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_port
+    finally:
+        server.shutdown()
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in Client.FLOWS:
+            raise SystemExit(f"Unknown flow '{name}', expected one of: {', '.join(Client.FLOWS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Recorder:
+    """Request results shared by every client thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []  # (finished at, flow, latency ms, ok)
+
+    def add(self, finished, flow, latency_ms, ok):
+        with self.lock:
+            self.samples.append((finished, flow, latency_ms, ok))
+
+
+class Client:
+    """One simulated user, with its own keep-alive connection."""
+
+    FLOWS = ("browse", "detail", "login", "review")
+
+    def __init__(self, port, recorder, rng, token, email, place_ids, password):
+        self.port = port
+        self.recorder = recorder
+        self.rng = rng
+        self.token = token
+        self.email = email
+        self.place_ids = place_ids
+        self.password = password
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def request(self, flow, method, path, body=None, expected=(200,), auth=False):
+        headers = {"Content-Type": "application/json"}
+        if auth:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = json.dumps(body) if body is not None else None
+        start = time.perf_counter()
+        data, ok = None, False
+        try:
+            self.conn.request(method, f"/api/v1{path}", body=payload, headers=headers)
+            response = self.conn.getresponse()
+            raw = response.read()
+            ok = response.status in expected
+            if ok and raw:
+                data = json.loads(raw)
+        except (OSError, http.client.HTTPException, ValueError):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        end = time.perf_counter()
+        self.recorder.add(end, flow, (end - start) * 1000, ok)
+        return data
+
+    def browse(self):
+        places = self.request("browse", "GET", "/places/") or []
+        shown = places[:BATCH_SIZE]
+        if shown:
+            self.request("browse", "POST", "/batch", body={"requests": [
+                {"method": "GET", "path": f"/places/{place['id']}"} for place in shown
+            ]})
+
+    def detail(self):
+        self.request("detail", "GET", f"/places/{self.rng.choice(self.place_ids)}")
+
+    def login(self):
+        self.request("login", "POST", "/auth/login",
+                     body={"email": self.email, "password": self.password})
+
+    def review(self):
+        place_id = self.rng.choice(self.place_ids)
+        self.request("review", "GET", f"/places/{place_id}")
+        # 400: own place or already reviewed, both normal answers
+        self.request("review", "POST", "/reviews/", auth=True, expected=(201, 400), body={
+            "text": "Load test review", "rating": self.rng.randint(1, 5), "place_id": place_id,
+        })
+
+    def run(self, mix, deadline):
+        flows, weights = zip(*mix.items())
+        while time.perf_counter() < deadline:
+            getattr(self, self.rng.choices(flows, weights)[0])()
+        self.conn.close()
+
+
+def summarize(samples, seconds):
+    latencies = sorted(sample[2] for sample in samples)
+    errors = sum(1 for sample in samples if not sample[3])
+    if not latencies:
+        return {"requests": 0, "errors": 0, "error_rate": 0.0, "throughput_rps": 0.0}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4),
+        "throughput_rps": round(len(latencies) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main():
+    from app.persistence.dataset import DEFAULT_PASSWORD
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="1k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds per time-series point")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Flow weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    source = seeded_database(args.size, args.seed)
+    workdir = tempfile.mkdtemp(prefix="hbnb-load-")
+    try:
+        db_path = os.path.join(workdir, "load.db")
+        shutil.copyfile(source, db_path)
+        app = create_app(make_config(db_path))
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            from app.models.place import Place
+            from app.models.user import User
+
+            users = db.session.query(User.id, User.email).limit(args.workers).all()
+            place_ids = [pid for pid, in db.session.query(Place.id).limit(5000)]
+            # Tokens are minted here so the run does not start with a burst of logins
+            tokens = [create_access_token(identity=uid, additional_claims={"is_admin": False})
+                      for uid, _ in users]
+
+        recorder = Recorder()
+        # The facade prints debug lines on every place detail request
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+                wsgi_server(app) as port:
+            clients = [
+                Client(port, recorder, random.Random(args.seed * 1000 + i), tokens[i % len(users)],
+                       users[i % len(users)][1], place_ids, DEFAULT_PASSWORD)
+                for i in range(args.workers)
+            ]
+            start = time.perf_counter()
+            deadline = start + args.duration
+            threads = [threading.Thread(target=client.run, args=(mix, deadline), daemon=True)
+                       for client in clients]
+            for thread in threads:
+                thread.start()
+
+            reported = 0
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(0.2)
+                with recorder.lock:
+                    done = len(recorder.samples)
+                elapsed = time.perf_counter() - start
+                if elapsed >= (reported + 1) * args.interval:
+                    reported += 1
+                    print(f"{elapsed:6.1f}s  {done} requests", file=sys.stderr)
+            elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    samples = recorder.samples
+    timeline = []
+    for i in range(int(elapsed // args.interval) + 1):
+        low, high = start + i * args.interval, start + (i + 1) * args.interval
+        window = [s for s in samples if low <= s[0] < high]
+        if window:
+            span = min(high, start + elapsed) - low
+            timeline.append(dict(second=round(i * args.interval, 1), **summarize(window, span)))
+
+    report = {
+        "size": args.size,
+        "workers": args.workers,
+        "mix": mix,
+        "duration_seconds": round(elapsed, 2),
+        "cpus": os.cpu_count(),
+        "overall": summarize(samples, elapsed),
+        "flows": {flow: summarize([s for s in samples if s[1] == flow], elapsed)
+                  for flow in mix},
+        "timeline": timeline,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
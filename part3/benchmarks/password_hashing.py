@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Measure password check throughput as the bcrypt worker pool grows.
+
+Each run sends the same number of verify() calls from many concurrent
+callers (like login requests on a threaded server) through a
+PasswordHasher with 1, 2, 4... workers, up to the number of CPUs.
+
+Run this from the `part3` folder:
+  python3 benchmarks/password_hashing.py --rounds 12 --checks 64
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from app.passwords import PasswordHasher
+
+
+def run(rounds, workers, executor, checks, callers):
+    app = Flask(__name__)
+    app.config.update(BCRYPT_LOG_ROUNDS=rounds, BCRYPT_WORKERS=workers,
+                      BCRYPT_EXECUTOR=executor)
+    hasher = PasswordHasher(app)
+    hashed = hasher.hash("benchmark-password")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        results = list(pool.map(lambda _: hasher.verify(hashed, "benchmark-password"),
+                                range(checks)))
+    elapsed = time.perf_counter() - start
+    hasher.executor.shutdown()
+    assert all(results)
+    return {"workers": workers, "seconds": round(elapsed, 3),
+            "checks_per_second": round(checks / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--checks", type=int, default=64)
+    parser.add_argument("--callers", type=int, default=64,
+                        help="Concurrent callers, like request threads")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cpus:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cpus:
+        workers.append(cpus)
+
+    results = [run(args.rounds, w, args.executor, args.checks, args.callers) for w in workers]
+    print(json.dumps({"rounds": args.rounds, "cpus": cpus, "executor": args.executor,
+                      "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
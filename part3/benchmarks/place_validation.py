@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Row by row vs column validation of bulk place imports.
+
+Generates --rows place rows, --invalid of them breaking one rule each, and
+times three ways of checking them with the Place rules:
+
+- model: one Place() per row, as POST /places/ does
+- rows: validate_place_columns() without NumPy (the Place validators per value)
+- arrays: validate_place_columns() with NumPy
+
+All three must find the same errors; the report gives the rows checked
+per second for each.
+
+Run this from the `part3` folder:
+  python3 benchmarks/place_validation.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import DevelopmentConfig
+
+BREAKS = (
+    ("title", ""), ("title", "x" * 101), ("price", -5), ("price", "12"),
+    ("latitude", 91.0), ("longitude", None), ("longitude", -200),
+)
+
+
+def make_rows(count, invalid, rng):
+    rows = []
+    for _ in range(count):
+        row = {
+            "title": f"Place {rng.randrange(10 ** 6)}",
+            "description": "Generated",
+            "price": round(rng.uniform(10, 500), 2),
+            "latitude": rng.uniform(-90, 90),
+            "longitude": rng.uniform(-180, 180),
+            "owner_id": "owner",
+        }
+        if rng.random() < invalid:
+            name, value = rng.choice(BREAKS)
+            row[name] = value
+        rows.append(row)
+    return rows
+
+
+def model_errors(rows):
+    from app.models.place import Place
+
+    errors = []
+    for row in rows:
+        try:
+            Place(row["title"], row["description"], row["price"], row["latitude"],
+                  row["longitude"], row["owner_id"])
+            errors.append(None)
+        except ValueError as e:
+            errors.append(str(e))
+    return errors
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    from app.services import place_import
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--invalid", type=float, default=0.05, help="Share of invalid rows")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if place_import.np is None:
+        print("NumPy is not installed (pip install numpy)", file=sys.stderr)
+        return 1
+
+    rows = make_rows(args.rows, args.invalid, random.Random(args.seed))
+    columns = {name: [row[name] for row in rows] for name in place_import.COLUMNS}
+    # No database is needed, only an app context
+    app = create_app(type("BenchConfig", (DevelopmentConfig,), {"SQLALCHEMY_DATABASE_URI": "sqlite://"}))
+    with app.app_context():
+        expected, model_seconds = timed(model_errors, rows)
+        by_rows, rows_seconds = timed(place_import._validate_rows, columns, len(rows))
+        by_arrays, arrays_seconds = timed(place_import._validate_arrays, columns, len(rows))
+    if not (expected == by_rows.errors == by_arrays.errors):
+        print("The validators disagree", file=sys.stderr)
+        return 1
+
+    results = {
+        "rows": args.rows,
+        "invalid_rows": sum(error is not None for error in expected),
+        "rows_per_second": {
+            name: round(args.rows / seconds) for name, seconds in
+            (("model", model_seconds), ("rows", rows_seconds), ("arrays", arrays_seconds))
+        },
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Insert rate and index size of random vs time-ordered, text vs binary ids.
+
+Each variant fills a fresh SQLite file with --rows rows shaped like the
+reviews table: a UUID primary key, an indexed UUID reference to an
+earlier row, a timestamp and some text. Rows are committed --batch at a
+time, like requests creating one or a few rows each. The report gives the
+rows inserted per second (overall and over the last tenth, where random
+ids suffer once the index no longer fits in the page cache) and the size
+of the table and of each index, from SQLite's dbstat table.
+
+Run this from the `part3` folder:
+  python3 benchmarks/primary_keys.py --rows 500000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, create_engine
+
+from app.models.types import UUID, uuid7
+
+VARIANTS = {
+    "uuid4-text": (uuid.uuid4, "text"),
+    "uuid7-text": (uuid7, "text"),
+    "uuid4-binary": (uuid.uuid4, "binary"),
+    "uuid7-binary": (uuid7, "binary"),
+}
+
+
+def make_table(storage):
+    metadata = MetaData()
+    table = Table(
+        "rows", metadata,
+        Column("id", UUID(storage), primary_key=True),
+        Column("parent_id", UUID(storage), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("text", String(100), nullable=False),
+        Index("ix_rows_parent_id", "parent_id"),
+    )
+    return metadata, table
+
+
+def sizes(conn):
+    """Bytes used by each table and index."""
+    return {name: size for name, size in conn.exec_driver_sql(
+        "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY name")}
+
+
+def run_variant(path, generate, storage, rows, batch, cache_kib, rng):
+    metadata, table = make_table(storage)
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    ids = []
+    timings = []
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"PRAGMA cache_size=-{cache_kib}")
+        conn.commit()
+        start = time.perf_counter()
+        for offset in range(0, rows, batch):
+            values = []
+            for _ in range(min(batch, rows - offset)):
+                new = str(generate())
+                values.append({
+                    "id": new,
+                    "parent_id": ids[rng.randrange(len(ids))] if ids else new,
+                    "created_at": datetime.utcnow(),
+                    "text": "Comfortable and clean.",
+                })
+                ids.append(new)
+            t0 = time.perf_counter()
+            conn.execute(table.insert(), values)
+            conn.commit()
+            timings.append((len(values), time.perf_counter() - t0))
+        total = time.perf_counter() - start
+        used = sizes(conn)
+    engine.dispose()
+
+    tail = timings[len(timings) * 9 // 10:]
+    return {
+        "rows_per_second": round(rows / total),
+        "last_10pct_rows_per_second": round(sum(n for n, _ in tail) / sum(t for _, t in tail)),
+        "bytes": used,
+        "index_bytes": sum(size for name, size in used.items() if name != "rows"),
+        "file_bytes": os.path.getsize(path),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=100, help="Rows per transaction")
+    parser.add_argument("--cache-kib", type=int, default=2000,
+                        help="SQLite page cache (SQLite's default is 2000 KiB)")
+    parser.add_argument("--variants", default=",".join(VARIANTS),
+                        help=f"Comma-separated subset of {', '.join(VARIANTS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {"rows": args.rows, "batch": args.batch, "cache_kib": args.cache_kib, "variants": {}}
+    with tempfile.TemporaryDirectory(prefix="hbnb-keys-") as workdir:
+        for name in args.variants.split(","):
+            generate, storage = VARIANTS[name]
+            results["variants"][name] = run_variant(
+                os.path.join(workdir, f"{name}.db"), generate, storage, args.rows, args.batch,
+                args.cache_kib, random.Random(args.seed))
+            print(f"{name}: {results['variants'][name]['rows_per_second']} rows/s, "
+                  f"indexes {results['variants'][name]['index_bytes']} bytes", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Measure the cost of the per-request token revocation check.
+
+Revokes --revoked tokens, then times TokenRevocationStore.is_revoked() for
+tokens that are not revoked (the common path, answered by the Bloom
+filter) and for revoked ones (filter hit + database lookup).
+
+Run this from the `part3` folder:
+  python3 benchmarks/revocation_check.py --revoked 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db, token_revocation
+from config import Config
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+
+def per_call_ns(fn, payloads):
+    start = time.perf_counter_ns()
+    for payload in payloads:
+        fn(payload)
+    return round((time.perf_counter_ns() - start) / len(payloads), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--revoked", type=int, default=100_000)
+    parser.add_argument("--checks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    BenchConfig.REVOCATION_BLOOM_CAPACITY = max(args.revoked, 1)
+    app = create_app(BenchConfig)
+    with app.app_context():
+        from app.models.revoked_token import RevokedToken
+
+        db.create_all()
+        expires = datetime.utcnow() + timedelta(days=1)
+        revoked = [str(uuid.uuid4()) for _ in range(args.revoked)]
+        db.session.bulk_insert_mappings(RevokedToken, [
+            {"jti": jti, "expires_at": expires, "revoked_at": datetime.utcnow()} for jti in revoked
+        ])
+        db.session.commit()
+
+        # First call syncs the filter from the database
+        token_revocation.is_revoked({"jti": revoked[0]})
+
+        clean = [{"jti": str(uuid.uuid4())} for _ in range(args.checks)]
+        hits = [{"jti": jti} for jti in revoked[:min(len(revoked), 2000)]]
+        results = {
+            "revoked_tokens": args.revoked,
+            "not_revoked_ns_per_check": per_call_ns(token_revocation.is_revoked, clean),
+            "revoked_ns_per_check": per_call_ns(token_revocation.is_revoked, hits),
+            "false_positives": sum(token_revocation.is_revoked(p) for p in clean[:20000]),
+        }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
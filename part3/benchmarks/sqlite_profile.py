@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Compare SQLite's default settings with the production engine profile.
+
+Both profiles run the same workloads on their own copy of a generated
+database (see benchmarks/endpoints.py), with --threads client threads
+calling the app through the Flask test client for --seconds each:
+
+  read   GET /places/<id> on random places
+  write  POST /places/ (one small transaction per request)
+  mixed  --write-share of the threads write, the others read
+
+The report gives the requests per second and the failed requests of each
+workload and profile, and the production/default throughput ratios. With
+the default rollback journal a commit has to wait for every reader to
+leave the database, and requests that wait too long fail with "database
+is locked" (HTTP 500); with WAL readers and the writer do not block each
+other.
+
+Run this from the `part3` folder:
+  python3 benchmarks/sqlite_profile.py --size 100k --threads 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from config import ProductionConfig
+from endpoints import SIZES, make_config, seeded_database
+
+PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "busy_timeout")
+
+
+def profiles(workdir, threads):
+    """Config of each profile, on its own database file in workdir."""
+    production = type("BenchProductionConfig", (ProductionConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(workdir, 'production.db')}",
+        "RATELIMIT_ENABLED": False,
+        "SQLALCHEMY_ENGINE_OPTIONS": dict(ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS,
+                                          pool_size=threads),
+    })
+    return {"default": make_config(os.path.join(workdir, "default.db")), "production": production}
+
+
+def run_workload(app, kinds, seconds, place_ids, token):
+    """Run one thread per entry of `kinds` ("read"/"write"); return per-kind counts."""
+    counts = {kind: {"requests": 0, "errors": 0} for kind in set(kinds)}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    barrier = threading.Barrier(len(kinds))
+
+    def worker(kind, seed):
+        client = app.test_client()
+        rng = random.Random(seed)
+        done = errors = 0
+        barrier.wait()
+        while time.perf_counter() < deadline:
+            if kind == "read":
+                r = client.get(f"/api/v1/places/{rng.choice(place_ids)}")
+                ok = r.status_code == 200
+            else:
+                r = client.post("/api/v1/places/", headers={"Authorization": f"Bearer {token}"}, json={
+                    "title": f"Bench place {seed}-{done}", "description": "Benchmark",
+                    "price": 80.0, "latitude": 48.85, "longitude": 2.35,
+                })
+                ok = r.status_code == 201
+            done += 1
+            errors += not ok
+        with lock:
+            counts[kind]["requests"] += done
+            counts[kind]["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=(kind, i)) for i, kind in enumerate(kinds)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for entry in counts.values():
+        entry["requests_per_second"] = round(entry["requests"] / elapsed, 1)
+    return counts
+
+
+def bench_profile(config, args):
+    from flask_jwt_extended import create_access_token
+    from app.models.place import Place
+    from app.persistence.dataset import entity_id
+    from app.sqlite_pragmas import read_pragmas
+
+    app = create_app(config)
+    with app.app_context():
+        place_ids = [pid for pid, in db.session.query(Place.id).limit(5000)]
+        token = create_access_token(identity=entity_id(args.seed, "users", 0),
+                                    additional_claims={"is_admin": False})
+        with db.engine.connect() as conn:
+            pragmas = read_pragmas(conn, PRAGMAS)
+
+    writers = max(1, round(args.threads * args.write_share))
+    workloads = {
+        "read": ["read"] * args.threads,
+        "write": ["write"] * args.threads,
+        "mixed": ["write"] * writers + ["read"] * (args.threads - writers),
+    }
+    results = {"pragmas": pragmas}
+    # The facade prints debug lines on every place detail request
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, kinds in workloads.items():
+            results[name] = run_workload(app, kinds, args.seconds, place_ids, token)
+            print(f"{config.__name__} {name}: {json.dumps(results[name])}", file=sys.stderr)
+    with app.app_context():
+        db.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="1k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Time spent on each workload")
+    parser.add_argument("--write-share", type=float, default=0.25,
+                        help="Share of the threads writing in the mixed workload")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    source = seeded_database(args.size, args.seed)
+    workdir = tempfile.mkdtemp(prefix="hbnb-sqlite-")
+    results = {"size": args.size, "threads": args.threads, "cpus": os.cpu_count(), "profiles": {}}
+    try:
+        for name, config in profiles(workdir, args.threads).items():
+            shutil.copyfile(source, os.path.join(workdir, f"{name}.db"))
+            results["profiles"][name] = bench_profile(config, args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    default, production = results["profiles"]["default"], results["profiles"]["production"]
+    results["speedup"] = {
+        f"{workload}.{kind}": round(production[workload][kind]["requests_per_second"]
+                                    / default[workload][kind]["requests_per_second"], 2)
+        for workload in ("read", "write", "mixed") for kind in default[workload]
+        if default[workload][kind]["requests_per_second"]
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,73 @@
 import os
+from datetime import timedelta
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt_secret_key')
     DEBUG = False
+    # Size of the thread pool running requests in the ASGI serving mode (asgi.py)
+    ASGI_THREADS = int(os.getenv('ASGI_THREADS', 32))
+    # bcrypt cost factor; stored hashes with another cost are rehashed at login
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Workers hashing passwords (defaults to the number of CPUs), 'thread' or 'process'
+    BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', 0)) or None
+    BCRYPT_EXECUTOR = os.getenv('BCRYPT_EXECUTOR', 'thread')
+    # Login throttling: 'memory://' (per process) or 'sqlite:////path/file.db' (shared)
+    RATELIMIT_ENABLED = True
+    RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
+    # (attempts, seconds) token buckets, and (failures, seconds) sliding window
+    LOGIN_RATE_PER_IP = (20, 60)
+    LOGIN_RATE_PER_EMAIL = (5, 60)
+    LOGIN_FAILURE_LIMIT = (10, 900)
+    # Token lifetimes; refresh tokens are rotated on every use
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Revoked tokens: in-memory Bloom filter size and sync period between workers
+    REVOCATION_BLOOM_CAPACITY = 100_000
+    REVOCATION_SYNC_SECONDS = 5
+    # How long the user behind a token is cached between requests
+    CURRENT_USER_CACHE_SECONDS = 30
+    # Rows validated, hashed and inserted together by the bulk user import
+    USER_IMPORT_BATCH_SIZE = 500
+    # Rows validated together (one array per column) and inserted with one
+    # statement by the bulk place import
+    PLACE_IMPORT_BATCH_SIZE = 5000
+    # Optional engine for read-only repository calls: a replica, or a second
+    # pool on the same WAL SQLite file (see app/read_replica.py)
+    SQLALCHEMY_READ_URI = os.getenv('DATABASE_READ_URL')
+    SQLALCHEMY_READ_ENGINE_OPTIONS = {}
+    # After a commit, the rest of the request reads from the primary
+    READ_YOUR_WRITES = True
+    # 7: time-ordered UUIDv7 ids for new rows, 4: random ids (storage: HBNB_ID_STORAGE)
+    ID_VERSION = 7
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Run on every new SQLite connection, in this order (see app/sqlite_pragmas.py)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64_000,
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': 5000,
+    }
+    # One pooled connection per request thread, checked before use
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 32)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 8)),
+        'pool_timeout': 10,
+        'pool_pre_ping': True,
+    }
+    SQLALCHEMY_READ_ENGINE_OPTIONS = SQLALCHEMY_ENGINE_OPTIONS
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
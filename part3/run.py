@@ -1,7 +1,10 @@
+import os
 from app import create_app
-from config import DevelopmentConfig
+from config import config
 
-app = create_app(DevelopmentConfig)
+# HBNB_CONFIG=production selects the production database profile
+app = create_app(config[os.getenv('HBNB_CONFIG', 'default')])
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Debugger and reloader only with a DEBUG config (development), never in production
+    app.run(debug=app.config.get("DEBUG", False))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Export the database to an NDJSON dump, or restore one.
+
+The dump holds users, amenities, places, their amenity links and reviews,
+one JSON row per line (see app/persistence/backup.py). A path ending in
+.gz is gzip compressed; - is stdout/stdin (use --gzip to compress it).
+Both commands stream, so dumps larger than memory are fine.
+
+An interrupted import is resumed by running the same command again: the
+rows already restored are recorded in <dump>.checkpoint (or --checkpoint)
+and skipped. The checkpoint is removed when the import completes.
+
+Run this from the `part3` folder:
+  python3 scripts/backup.py export backup.ndjson.gz
+  python3 scripts/backup.py import backup.ndjson.gz --database sqlite:///clone.db
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Ensure the project root (parent of scripts/) is on sys.path so `import app` works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import DevelopmentConfig
+
+
+def main():
+    from app.persistence.backup import (
+        DEFAULT_BATCH_SIZE, Checkpoint, export_database, import_database, open_dump, text_dump,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="Dump file, or - for stdout/stdin")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Compress (export) or decompress (import) stdout/stdin")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint",
+                        help="Import progress file (default: <dump>.checkpoint, none for stdin)")
+    parser.add_argument("--database", default=DevelopmentConfig.SQLALCHEMY_DATABASE_URI,
+                        help="SQLAlchemy database URI (default: the development database)")
+    args = parser.parse_args()
+
+    config = type("BackupConfig", (DevelopmentConfig,), {
+        "SQLALCHEMY_DATABASE_URI": args.database,
+    })
+    app = create_app(config)
+    mode = "w" if args.command == "export" else "r"
+    if args.path == "-":
+        std = sys.stdout if args.command == "export" else sys.stdin
+        stream = text_dump(std.buffer, mode, compressed=args.gzip)
+    else:
+        stream = open_dump(args.path, mode)
+
+    def progress(table, rows):
+        print(f"{table}: {rows} rows", file=sys.stderr)
+
+    start = time.perf_counter()
+    with app.app_context(), stream:
+        from app import db
+        from app.models import amenity, place, review, user  # noqa: F401
+
+        if args.command == "export":
+            rows = export_database(db.engine, stream, args.batch_size, progress)
+        else:
+            db.create_all()
+            checkpoint_path = args.checkpoint
+            if checkpoint_path is None and args.path != "-":
+                checkpoint_path = args.path + ".checkpoint"
+            checkpoint = Checkpoint(checkpoint_path)
+            if checkpoint.lines:
+                print(f"Resuming after line {checkpoint.lines}", file=sys.stderr)
+            rows = import_database(db.engine, stream, args.batch_size, checkpoint, progress)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "command": args.command,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+    }, indent=2), file=sys.stderr if args.path == "-" and args.command == "export" else sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
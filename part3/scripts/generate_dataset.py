@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Fill a database with a deterministic synthetic dataset.
+
+Generates users, amenities, places (clustered around cities, with
+per-city price distributions) and reviews from a seed, and writes them
+with multi-row INSERTs. The same arguments always produce the same rows.
+Every generated user can log in with the password "password123".
+
+Run this from the `part3` folder:
+  python3 scripts/generate_dataset.py --users 100000 --places 200000 --reviews 1000000
+  python3 scripts/generate_dataset.py --backend memory --reviews 100000
+
+The default target is instance/synthetic.db; use --reset to rebuild it.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Ensure the project root (parent of scripts/) is on sys.path so `import app` works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import DevelopmentConfig
+
+
+def main():
+    from app.persistence.dataset import AMENITIES, DEFAULT_BATCH_SIZE
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--places", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=10_000)
+    parser.add_argument("--amenities", type=int, default=len(AMENITIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--backend", choices=["sqlalchemy", "memory"], default="sqlalchemy")
+    parser.add_argument("--database", default="sqlite:///synthetic.db",
+                        help="SQLAlchemy database URI (default: instance/synthetic.db)")
+    parser.add_argument("--reset", action="store_true",
+                        help="Drop and recreate the tables before writing")
+    args = parser.parse_args()
+
+    config = type("DatasetConfig", (DevelopmentConfig,), {
+        "SQLALCHEMY_DATABASE_URI": args.database,
+    })
+    app = create_app(config)
+
+    def progress(table, written):
+        print(f"{table}: {written} rows", file=sys.stderr)
+
+    with app.app_context():
+        from app import db, password_hasher
+        from app.models import amenity, place, review, user  # noqa: F401
+        from app.persistence.dataset import (
+            DEFAULT_PASSWORD, DatasetGenerator, InMemoryWriter, SQLAlchemyWriter, populate,
+        )
+        from app.persistence.repository import InMemoryRepository
+
+        generator = DatasetGenerator(args.users, args.places, args.reviews,
+                                     amenities=args.amenities, seed=args.seed,
+                                     password_hash=password_hasher.hash(DEFAULT_PASSWORD))
+        if args.backend == "memory":
+            writer = InMemoryWriter({name: InMemoryRepository()
+                                     for name in ("users", "amenities", "places", "reviews")})
+        else:
+            if args.reset:
+                db.drop_all()
+            db.create_all()
+            writer = SQLAlchemyWriter(db.engine, batch_size=args.batch_size)
+
+        start = time.perf_counter()
+        rows = populate(generator, writer, progress)
+        elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "backend": args.backend,
+        "seed": args.seed,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(sum(rows.values()) / elapsed),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
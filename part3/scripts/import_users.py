@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Import users in bulk from an NDJSON or CSV file.
+
+NDJSON: one {"first_name", "last_name", "email", "password", "is_admin"}
+object per line. CSV: a header row with those columns. Passwords are hashed
+on a pool of processes (one per CPU by default) and rows are inserted in
+batched transactions. Progress goes to stderr, the final report (with the
+line number and reason of every rejected row) to stdout as JSON.
+
+Run this from the `part3` folder:
+  python3 scripts/import_users.py partner_users.csv
+  python3 scripts/import_users.py - --format ndjson < users.ndjson
+"""
+import argparse
+import json
+import os
+import sys
+
+# Ensure the project root (parent of scripts/) is on sys.path so `import app` works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import DevelopmentConfig
+
+
+def main():
+    from app.services.user_import import (
+        DEFAULT_BATCH_SIZE, FORMATS, detect_format, read_rows, text_stream,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Hashing processes (default: number of CPUs)")
+    parser.add_argument("--database", default=DevelopmentConfig.SQLALCHEMY_DATABASE_URI,
+                        help="SQLAlchemy database URI (default: the development database)")
+    args = parser.parse_args()
+
+    config = type("ImportConfig", (DevelopmentConfig,), {
+        "BCRYPT_EXECUTOR": "process",
+        "BCRYPT_WORKERS": args.workers or None,
+        "SQLALCHEMY_DATABASE_URI": args.database,
+    })
+    app = create_app(config)
+    fmt = args.format or detect_format(args.path)
+
+    def progress(report):
+        print(f"{report.processed} rows processed, {report.created} created, "
+              f"{report.failed} failed", file=sys.stderr)
+
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    with app.app_context(), source:
+        from app import db
+        from app.services import facade
+        db.create_all()
+
+        report = facade.import_users(read_rows(text_stream(source), fmt),
+                                     batch_size=args.batch_size, progress=progress)
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
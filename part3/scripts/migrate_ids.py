@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Convert the ids of a SQLite database to 16-byte binary, or back to text.
+
+Run this with the server stopped, then start the app with the matching
+HBNB_ID_STORAGE. The ids keep their value, only their storage changes;
+the conversion can be run again safely. VACUUM then gives the freed pages
+back (skip it with --no-vacuum).
+
+Run this from the `part3` folder:
+  python3 scripts/migrate_ids.py --to binary --database sqlite:///development.db
+  HBNB_ID_STORAGE=binary python run.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Ensure the project root (parent of scripts/) is on sys.path so `import app` works
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import DevelopmentConfig
+
+
+def main():
+    from app.models.types import STORAGES
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--to", choices=STORAGES, default="binary")
+    parser.add_argument("--database", default=DevelopmentConfig.SQLALCHEMY_DATABASE_URI,
+                        help="SQLAlchemy database URI (default: the development database)")
+    parser.add_argument("--no-vacuum", action="store_true", help="Do not VACUUM afterwards")
+    args = parser.parse_args()
+
+    config = type("MigrationConfig", (DevelopmentConfig,), {
+        "SQLALCHEMY_DATABASE_URI": args.database,
+    })
+    app = create_app(config)
+    with app.app_context():
+        from app import db
+        from app.persistence.id_migration import migrate_ids
+
+        start = time.perf_counter()
+        report = migrate_ids(db.engine, args.to)
+        if not args.no_vacuum:
+            with db.engine.connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("VACUUM")
+        report["seconds"] = round(time.perf_counter() - start, 2)
+
+    print(json.dumps(report, indent=2))
+    print(f"Start the app with HBNB_ID_STORAGE={args.to}", file=sys.stderr)
+    return 0 if not report["unconverted"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,8 @@ CREATE TABLE IF NOT EXISTS places (
     FOREIGN KEY (owner_id) REFERENCES users(id)
 );
  
+CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id);
+ 
 CREATE TABLE IF NOT EXISTS reviews (
     id CHAR(36) PRIMARY KEY,
     text TEXT NOT NULL,
@@ -37,6 +39,8 @@ CREATE TABLE IF NOT EXISTS reviews (
     UNIQUE (user_id, place_id)
 );
  
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id ON reviews (place_id);
+ 
 CREATE TABLE IF NOT EXISTS amenities (
     id CHAR(36) PRIMARY KEY,
     name VARCHAR(255) NOT NULL UNIQUE,
@@ -50,4 +54,14 @@ CREATE TABLE IF NOT EXISTS place_amenity (
     PRIMARY KEY (place_id, amenity_id),
     FOREIGN KEY (place_id) REFERENCES places(id),
     FOREIGN KEY (amenity_id) REFERENCES amenities(id)
-);
\ No newline at end of file
+);
+ 
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+ 
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti CHAR(36) PRIMARY KEY,
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+ 
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_revoked_at ON revoked_tokens (revoked_at);
\ No newline at end of file
@@ -1,5 +1,10 @@
+import os
+import re
 import unittest
 import time
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import event
 from app import create_app
 from app import db as _db
  
@@ -11,6 +16,8 @@ class TestConfig:
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = 4
+    RATELIMIT_ENABLED = False
  
  
 _app = create_app(TestConfig)
@@ -35,11 +42,63 @@ def _get(url):
     return _client.get(url)
  
  
+def _get_with_token(url, token):
+    return _client.get(url, headers={"Authorization": f"Bearer {token}"})
+
+
 def _delete(url, token=None):
     headers = {"Authorization": f"Bearer {token}"} if token else {}
     return _client.delete(url, headers=headers)
  
  
+# Tables queried by background work (the revocation filter sync) rather
+# than by the request itself
+_BACKGROUND_TABLES = ("revoked_tokens",)
+
+# A statement shape run this many times in one request is likely an N+1
+_N_PLUS_ONE_THRESHOLD = 3
+
+
+class _QueryLog(list):
+    """SQL statements run inside a _count_queries() block."""
+
+    def selects_from(self, table):
+        """Number of SELECTs reading `table`."""
+        return sum(1 for st in self if st.lstrip().startswith("SELECT") and f"FROM {table}" in st)
+
+    def per_request(self):
+        """The statements without those of background work."""
+        return _QueryLog(st for st in self if not any(t in st for t in _BACKGROUND_TABLES))
+
+    @staticmethod
+    def shape(statement):
+        """Statement with whitespace and expanded IN lists normalized."""
+        statement = re.sub(r"\s+", " ", statement).strip()
+        return re.sub(r"\(\?(?:, \?)*\)", "(?)", statement)
+
+    def repeated(self, threshold=_N_PLUS_ONE_THRESHOLD):
+        """Statement shapes run at least `threshold` times, with their counts."""
+        counts = Counter(self.shape(st) for st in self)
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+
+@contextmanager
+def _count_queries():
+    """Collect the SQL statements run on the test engine inside the block."""
+    with _app.app_context():
+        engine = _db.engine
+    statements = _QueryLog()
+ 
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+ 
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+ 
+ 
 def _setup():
     from app import db
     from app.models.user import User
@@ -143,6 +202,33 @@ class TestPasswordHashing(unittest.TestCase):
             user = User.query.filter_by(email="john@example.com").first()
             self.assertFalse(user.verify_password("wrongpassword"))
  
+    def test_06_hash_uses_configured_cost(self):
+        """New hashes use BCRYPT_LOG_ROUNDS as their cost."""
+        from app.models.user import User
+        with _app.app_context():
+            user = User.query.filter_by(email="john@example.com").first()
+            self.assertTrue(user.password.startswith("$2b$04$"))
+            self.assertFalse(user.password_needs_rehash())
+ 
+    def test_07_rehash_on_login_when_cost_differs(self):
+        """Login rehashes a stored hash whose cost differs from the configured one."""
+        import bcrypt
+        from app.models.user import User
+        with _app.app_context():
+            user = User(first_name="Old", last_name="Hash",
+                        email="oldhash@example.com", password="oldpass1")
+            user.password = bcrypt.hashpw(b"oldpass1", bcrypt.gensalt(5)).decode()
+            _db.session.add(user)
+            _db.session.commit()
+            self.assertTrue(user.password_needs_rehash())
+ 
+        r = _post("/api/v1/auth/login", json={"email": "oldhash@example.com", "password": "oldpass1"})
+        self.assertEqual(r.status_code, 200)
+        with _app.app_context():
+            user = User.query.filter_by(email="oldhash@example.com").first()
+            self.assertTrue(user.password.startswith("$2b$04$"))
+            self.assertTrue(user.verify_password("oldpass1"))
+ 
  
 # ---------------------------------------------------------------------------
 # Task 2 — JWT Authentication
@@ -823,7 +909,1535 @@ class TestAuthEdgeCases(unittest.TestCase):
         self.assertEqual(r.status_code, 200)
         self.assertEqual(r.json["price"], 999.0)
         self.assertEqual(r.json["title"], title_before)
- 
- 
+
+
+# ---------------------------------------------------------------------------
+# Batch endpoint
+# ---------------------------------------------------------------------------
+
+class TestBatch(unittest.TestCase):
+
+    def test_01_batch_place_details(self):
+        """Batch of GETs returns one result per sub-request, in order."""
+        r = _post("/api/v1/batch", json={"requests": [
+            {"method": "GET", "path": f"/places/{_state['place_id']}"},
+            {"method": "GET", "path": "/places/00000000-0000-0000-0000-000000000000"},
+            {"method": "GET", "path": "amenities/"}
+        ]})
+        self.assertEqual(r.status_code, 200)
+        responses = r.json["responses"]
+        self.assertEqual([s["status"] for s in responses], [200, 404, 200])
+        self.assertEqual(responses[0]["body"]["id"], _state["place_id"])
+        self.assertIsInstance(responses[2]["body"], list)
+
+    def test_02_batch_forwards_authorization(self):
+        """Sub-requests run with the batch request's token."""
+        r = _post("/api/v1/batch", json={"requests": [
+            {"method": "PUT", "path": f"/places/{_state['place_id']}", "body": {"title": "Hacked"}}
+        ]}, token=_state["user2_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["responses"][0]["status"], 403)
+
+    def test_03_batch_without_token(self):
+        """Protected sub-requests without token return 401 inside the batch."""
+        r = _post("/api/v1/batch", json={"requests": [
+            {"method": "POST", "path": "/amenities/", "body": {"name": "Sauna"}}
+        ]})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["responses"][0]["status"], 401)
+
+    def test_04_batch_nested_rejected(self):
+        """A batch cannot contain another batch — must return 400."""
+        r = _post("/api/v1/batch", json={"requests": [{"method": "POST", "path": "/batch"}]})
+        self.assertEqual(r.status_code, 400)
+
+    def test_04b_batch_nested_with_query_or_dots_rejected(self):
+        """Nested batches hidden behind a query string or dot segments are rejected too."""
+        for path in ("/batch?x=1", "/batch/", "//batch", "/places/../batch", "batch#top"):
+            r = _post("/api/v1/batch", json={"requests": [{"method": "POST", "path": path}]})
+            self.assertEqual(r.status_code, 400, path)
+
+    def test_04c_batch_rejected_before_running_anything(self):
+        """A nested batch later in the list stops the whole batch before the first write."""
+        name = "Batch guard amenity"
+        r = _post("/api/v1/batch", json={"requests": [
+            {"method": "POST", "path": "/amenities/", "body": {"name": name}},
+            {"method": "POST", "path": "/batch?x=1"}
+        ]}, token=_state["admin_token"])
+        self.assertEqual(r.status_code, 400)
+        names = [a["name"] for a in _get("/api/v1/amenities/").json]
+        self.assertNotIn(name, names)
+
+    def test_05_batch_too_many_requests(self):
+        """A batch larger than BATCH_MAX_REQUESTS must return 400."""
+        sub = {"method": "GET", "path": "/amenities/"}
+        r = _post("/api/v1/batch", json={"requests": [sub] * 51})
+        self.assertEqual(r.status_code, 400)
+
+
+# ---------------------------------------------------------------------------
+# Place detail loading
+# ---------------------------------------------------------------------------
+
+class TestPlaceDetailQueries(unittest.TestCase):
+
+    def test_01_place_detail_query_count_is_constant(self):
+        """GET /places/<id> runs the same small number of queries whatever the number of reviews."""
+        from app.models.user import User
+        from app.models.review import Review
+
+        r = _post("/api/v1/places/", json={
+            "title": "Busy Place", "price": 60.0, "latitude": 10.0, "longitude": 10.0,
+            "amenities": [_state["amenity_id"]]
+        }, token=_state["user_token"])
+        self.assertEqual(r.status_code, 201)
+        place_id = r.json["id"]
+
+        with _count_queries() as before:
+            r = _get(f"/api/v1/places/{place_id}")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["reviews"], [])
+
+        with _app.app_context():
+            from app.models.place import Place
+            place = _db.session.get(Place, place_id)
+            for i in range(3):
+                reviewer = User(first_name="Reviewer", last_name=str(i),
+                                email=f"reviewer{i}@example.com", password="pass123")
+                _db.session.add(reviewer)
+                _db.session.flush()
+                _db.session.add(Review(text=f"Review {i}", rating=4, place=place, user=reviewer))
+            _db.session.commit()
+
+        with _count_queries() as after:
+            r = _get(f"/api/v1/places/{place_id}")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.json["reviews"]), 3)
+        self.assertTrue(all(rv["user_email"] for rv in r.json["reviews"]))
+        self.assertEqual(len(r.json["amenities"]), 1)
+        self.assertEqual(r.json["owner"]["email"], "john@example.com")
+
+        self.assertEqual(len(after), len(before))
+        self.assertLessEqual(len(after), 3)
+
+
+# ---------------------------------------------------------------------------
+# Ownership checks on writes
+# ---------------------------------------------------------------------------
+
+def _selects_before_write(statements, table):
+    """Number of SELECTs on `table` issued before the first UPDATE/DELETE."""
+    count = 0
+    for statement in statements:
+        if statement.startswith(("UPDATE", "DELETE")):
+            break
+        if statement.startswith("SELECT") and f"FROM {table}" in statement:
+            count += 1
+    return count
+
+
+class TestOwnershipLookups(unittest.TestCase):
+
+    def test_01_place_update_loads_place_once(self):
+        """PUT /places/<id> reads the place row once before updating it."""
+        with _count_queries() as statements:
+            r = _put(f"/api/v1/places/{_state['place_id']}", json={"description": "Quiet"},
+                     token=_state["user_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(_selects_before_write(statements, "places"), 1)
+        self.assertFalse(any("FROM reviews" in st for st in statements))
+
+    def test_02_review_update_and_delete_load_review_once(self):
+        """PUT and DELETE /reviews/<id> read the review row once before writing."""
+        r = _post("/api/v1/places/", json={
+            "title": "Review Target", "price": 40.0, "latitude": 1.0, "longitude": 1.0
+        }, token=_state["user_token"])
+        r = _post("/api/v1/reviews/", json={
+            "text": "Fine", "rating": 4, "place_id": r.json["id"]
+        }, token=_state["user2_token"])
+        review_id = r.json["id"]
+
+        with _count_queries() as statements:
+            r = _put(f"/api/v1/reviews/{review_id}", json={"rating": 2}, token=_state["user2_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(_selects_before_write(statements, "reviews"), 1)
+
+        with _count_queries() as statements:
+            r = _delete(f"/api/v1/reviews/{review_id}", token=_state["user2_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(_selects_before_write(statements, "reviews"), 1)
+
+    def test_03_ownership_lookup_missing_entities(self):
+        """Ownership lookups return None for unknown ids."""
+        from app.services import facade
+        with _app.app_context():
+            self.assertIsNone(facade.get_place_owner_id("missing"))
+            self.assertIsNone(facade.get_review_author_id("missing"))
+
+
+# ---------------------------------------------------------------------------
+# ASGI serving mode
+# ---------------------------------------------------------------------------
+
+class TestAsgiAdapter(unittest.TestCase):
+
+    def _call(self, method, path, body=b"", headers=()):
+        import asyncio
+        from app.asgi import AsgiAdapter
+
+        adapter = AsgiAdapter(_app, max_workers=2)
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "method": method, "path": path, "query_string": b"",
+            "headers": [(k.encode(), v.encode()) for k, v in headers],
+            "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+        }
+        asyncio.run(adapter(scope, receive, send))
+        adapter.executor.shutdown()
+        return sent[0]["status"], sent[1]["body"]
+
+    def test_01_asgi_get(self):
+        """The ASGI adapter serves the same routes as the WSGI app."""
+        import json
+        status, body = self._call("GET", f"/api/v1/places/{_state['place_id']}")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["id"], _state["place_id"])
+
+    def test_02_asgi_post_with_body(self):
+        """Request bodies and headers are passed through to the app."""
+        import json
+        payload = json.dumps({"email": "admin@hbnb.io", "password": "admin1234"}).encode()
+        status, body = self._call("POST", "/api/v1/auth/login", body=payload, headers=[
+            ("content-type", "application/json"), ("content-length", str(len(payload)))
+        ])
+        self.assertEqual(status, 200)
+        self.assertIn("access_token", json.loads(body))
+
+
+# ---------------------------------------------------------------------------
+# Login throttling
+# ---------------------------------------------------------------------------
+
+class TestLoginRateLimit(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from app.models.user import User
+
+        class LimitConfig(TestConfig):
+            RATELIMIT_ENABLED = True
+            LOGIN_RATE_PER_IP = (4, 60)
+            LOGIN_RATE_PER_EMAIL = (3, 60)
+            LOGIN_FAILURE_LIMIT = (2, 900)
+
+        cls.app = create_app(LimitConfig)
+        with cls.app.app_context():
+            _db.create_all()
+            _db.session.add(User(first_name="Rate", last_name="Limited",
+                                 email="rate@example.com", password="ratepass"))
+            _db.session.commit()
+        cls.client = cls.app.test_client()
+
+    def _login(self, email, password, ip):
+        return self.client.post("/api/v1/auth/login", json={"email": email, "password": password},
+                                environ_base={"REMOTE_ADDR": ip})
+
+    def test_01_email_bucket_and_retry_after(self):
+        """Attempts beyond the per-email bucket get 429 with Retry-After."""
+        statuses = [self._login("rate@example.com", "ratepass", f"10.0.0.{i}").status_code
+                    for i in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        r = self._login("rate@example.com", "ratepass", "10.0.0.9")
+        self.assertEqual(r.status_code, 429)
+        self.assertGreaterEqual(int(r.headers["Retry-After"]), 1)
+
+    def test_02_ip_bucket(self):
+        """Attempts beyond the per-IP bucket get 429 whatever the email."""
+        statuses = [self._login(f"ip{i}@example.com", "x", "10.0.1.1").status_code
+                    for i in range(5)]
+        self.assertEqual(statuses, [401, 401, 401, 401, 429])
+
+    def test_03_failures_block_email_before_password_check(self):
+        """Too many failures lock the email, even with the right password."""
+        from unittest import mock
+        from app.services import facade
+
+        for i in range(2):
+            self.assertEqual(self._login("victim@example.com", "bad", f"10.0.2.{i}").status_code, 401)
+        with mock.patch.object(facade, "authenticate_user") as authenticate:
+            r = self._login("victim@example.com", "bad", "10.0.2.9")
+        self.assertEqual(r.status_code, 429)
+        authenticate.assert_not_called()
+
+    def test_04_metrics_admin_only(self):
+        """Throttling metrics are exposed to admins only."""
+        r = _client.get("/api/v1/auth/login/metrics",
+                        headers={"Authorization": f"Bearer {_state['user_token']}"})
+        self.assertEqual(r.status_code, 403)
+        r = _client.get("/api/v1/auth/login/metrics",
+                        headers={"Authorization": f"Bearer {_state['admin_token']}"})
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("rejected_ip", r.json)
+
+    def test_05_stores_agree(self):
+        """Memory and SQLite stores implement the same bucket and window arithmetic."""
+        import os
+        import tempfile
+        from app.ratelimit import MemoryRateLimitStore, SQLiteRateLimitStore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for store in (MemoryRateLimitStore(), SQLiteRateLimitStore(os.path.join(tmp, "rl.db"))):
+                self.assertEqual(store.take("k", 2, 10, 100.0), 0)
+                self.assertEqual(store.take("k", 2, 10, 100.0), 0)
+                self.assertAlmostEqual(store.take("k", 2, 10, 100.0), 5.0)
+                self.assertEqual(store.take("k", 2, 10, 105.0), 0)
+                store.hit("f", 60, 100.0)
+                store.hit("f", 60, 110.0)
+                self.assertEqual(store.count("f", 60, 110.0), 2)
+                self.assertAlmostEqual(store.count("f", 60, 150.0), 1.0)
+                self.assertEqual(store.count("f", 60, 300.0), 0)
+                store.reset("f")
+                self.assertEqual(store.count("f", 60, 110.0), 0)
+
+    def test_06_batched_logins_counted_per_client(self):
+        """Logins inside a batch count against the batch's client IP, not a shared key."""
+        def batch(ip, count):
+            logins = [{"method": "POST", "path": "/auth/login",
+                       "body": {"email": f"batched{ip}-{i}@example.com", "password": "x"}}
+                      for i in range(count)]
+            r = self.client.post("/api/v1/batch", json={"requests": logins},
+                                 environ_base={"REMOTE_ADDR": ip})
+            return [sub["status"] for sub in r.json["responses"]]
+
+        self.assertEqual(batch("10.0.3.1", 5), [401, 401, 401, 401, 429])
+        self.assertEqual(batch("10.0.3.2", 1), [401])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_07_sqlite_store_connection_not_shared_across_fork(self):
+        """The SQLite store keeps no connection from app creation and opens its own in a forked worker."""
+        import tempfile
+        from app.ratelimit import SQLiteRateLimitStore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteRateLimitStore(os.path.join(tmp, "rl.db"))
+            self.assertIsNone(getattr(store._local, "conn", None))
+            parent = store._connect()
+            store.hit("forked", 60, 100.0)
+            pid = os.fork()
+            if pid == 0:
+                fresh = store._connect() is not parent
+                store.hit("forked", 60, 100.0)
+                os._exit(0 if fresh else 1)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+            self.assertIs(store._connect(), parent)
+            self.assertEqual(store.count("forked", 60, 100.0), 2)
+
+
+# ---------------------------------------------------------------------------
+# Refresh tokens and revocation
+# ---------------------------------------------------------------------------
+
+class TestTokenRevocation(unittest.TestCase):
+
+    def _login(self):
+        r = _post("/api/v1/auth/login", json={"email": "jane_updated@example.com", "password": "password456"})
+        if r.status_code != 200:
+            r = _post("/api/v1/auth/login", json={"email": "jane@example.com", "password": "password456"})
+        self.assertEqual(r.status_code, 200)
+        return r.json
+
+    def test_01_login_returns_refresh_token(self):
+        """Login returns a refresh token next to the access token."""
+        tokens = self._login()
+        self.assertIn("refresh_token", tokens)
+
+    def test_02_refresh_rotates_token(self):
+        """A refresh token gives new tokens once, then is rejected."""
+        tokens = self._login()
+        r = _post("/api/v1/auth/refresh", token=tokens["refresh_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("access_token", r.json)
+        self.assertNotEqual(r.json["refresh_token"], tokens["refresh_token"])
+        r2 = _post("/api/v1/auth/refresh", token=tokens["refresh_token"])
+        self.assertEqual(r2.status_code, 401)
+        r3 = _post("/api/v1/auth/refresh", token=r.json["refresh_token"])
+        self.assertEqual(r3.status_code, 200)
+
+    def test_03_access_token_cannot_refresh(self):
+        """An access token is refused by the refresh endpoint."""
+        tokens = self._login()
+        r = _post("/api/v1/auth/refresh", token=tokens["access_token"])
+        self.assertIn(r.status_code, (401, 422))
+
+    def test_04_logout_revokes_access_token(self):
+        """A token is refused by protected endpoints after logout."""
+        tokens = self._login()
+        payload = {"title": "Before logout", "price": 20.0, "latitude": 0.0, "longitude": 0.0}
+        r = _post("/api/v1/places/", json=payload, token=tokens["access_token"])
+        self.assertEqual(r.status_code, 201)
+        r = _post("/api/v1/auth/logout", token=tokens["access_token"])
+        self.assertEqual(r.status_code, 200)
+        r = _post("/api/v1/places/", json=payload, token=tokens["access_token"])
+        self.assertEqual(r.status_code, 401)
+
+    def test_05_bloom_filter_has_no_false_negatives(self):
+        """Every added key is reported present; most others are not."""
+        import uuid
+        from app.revocation import BloomFilter
+
+        bloom = BloomFilter(1000)
+        keys = [str(uuid.uuid4()) for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_06_logout_revokes_refresh_token(self):
+        """Logging out with the access token also revokes the refresh token, and its successors."""
+        tokens = self._login()
+        refreshed = _post("/api/v1/auth/refresh", token=tokens["refresh_token"]).json
+        r = _post("/api/v1/auth/logout", token=refreshed["access_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(_post("/api/v1/auth/refresh", token=refreshed["refresh_token"]).status_code, 401)
+        payload = {"title": "After logout", "price": 20.0, "latitude": 0.0, "longitude": 0.0}
+        r = _post("/api/v1/places/", json=payload, token=tokens["access_token"])
+        self.assertEqual(r.status_code, 401)
+        # Another login is a new family, unaffected
+        other = self._login()
+        self.assertEqual(_post("/api/v1/auth/refresh", token=other["refresh_token"]).status_code, 200)
+
+    def test_07_revocation_does_not_commit_the_session(self):
+        """Revoking a token leaves the request's pending changes uncommitted."""
+        import uuid
+        from app import token_revocation
+        from app.models.amenity import Amenity
+
+        jti = str(uuid.uuid4())
+        with _app.test_request_context():
+            _db.session.add(Amenity(name="Never committed"))
+            self.assertTrue(token_revocation.revoke({"jti": jti, "exp": time.time() + 60}))
+            _db.session.rollback()
+            self.assertIsNone(Amenity.query.filter_by(name="Never committed").first())
+            self.assertTrue(token_revocation.is_revoked({"jti": jti}))
+
+    def test_08_table_created_at_startup(self):
+        """The revoked_tokens table exists once the app is created, before any token check."""
+        from sqlalchemy import inspect
+
+        app = create_app(TestConfig)
+        with app.app_context():
+            self.assertIn("revoked_tokens", inspect(_db.engine).get_table_names())
+
+    def _new_user(self, name, is_admin=False):
+        email = f"{name}@revocation.io"
+        r = _post("/api/v1/users/", json={"first_name": name, "last_name": "Token", "email": email,
+                                          "password": "secret123", "is_admin": is_admin},
+                  token=_state["admin_token"])
+        self.assertEqual(r.status_code, 201)
+        tokens = _post("/api/v1/auth/login", json={"email": email, "password": "secret123"}).json
+        return r.json["id"], tokens
+
+    def test_09_refresh_uses_current_role(self):
+        """A refresh after a demotion issues tokens without admin rights."""
+        from flask_jwt_extended import decode_token
+
+        user_id, tokens = self._new_user("demoted", is_admin=True)
+        r = _put(f"/api/v1/users/{user_id}", json={"is_admin": False}, token=_state["admin_token"])
+        self.assertEqual(r.status_code, 200)
+        r = _post("/api/v1/auth/refresh", token=tokens["refresh_token"])
+        self.assertEqual(r.status_code, 200)
+        with _app.app_context():
+            self.assertFalse(decode_token(r.json["access_token"])["is_admin"])
+        r = _get_with_token("/api/v1/auth/login/metrics", r.json["access_token"])
+        self.assertEqual(r.status_code, 403)
+
+    def test_10_deleted_user_tokens_refused(self):
+        """Once a user is deleted, its refresh and access tokens are refused."""
+        user_id, tokens = self._new_user("deleted")
+        self.assertEqual(_delete(f"/api/v1/users/{user_id}", token=_state["admin_token"]).status_code, 200)
+        self.assertEqual(_post("/api/v1/auth/refresh", token=tokens["refresh_token"]).status_code, 401)
+        r = _get_with_token("/api/v1/auth/login/metrics", tokens["access_token"])
+        self.assertEqual(r.status_code, 401)
+
+
+# ---------------------------------------------------------------------------
+# Current user loading
+# ---------------------------------------------------------------------------
+
+class TestCurrentUser(unittest.TestCase):
+
+    def _create_place(self, token, title):
+        return _post("/api/v1/places/", json={
+            "title": title, "price": 30.0, "latitude": 2.0, "longitude": 2.0
+        }, token=token)
+
+    def test_01_repeated_writes_do_not_reload_user(self):
+        """The user behind a token is cached: a second write runs no users query."""
+        r = self._create_place(_state["user_token"], "Cached Owner 1")
+        self.assertEqual(r.status_code, 201)
+        with _count_queries() as statements:
+            r = self._create_place(_state["user_token"], "Cached Owner 2")
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(statements.selects_from("users"), 0)
+
+        with _count_queries() as statements:
+            r = _post("/api/v1/reviews/", json={
+                "text": "Lovely", "rating": 5, "place_id": r.json["id"]
+            }, token=_state["user2_token"])
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(statements.selects_from("users"), 0)
+
+    def test_02_user_update_drops_cached_user(self):
+        """Updating a user through the facade drops its cached snapshot."""
+        from app import user_loader
+        from app.services import facade
+
+        with _app.app_context():
+            user_id = facade.get_user_by_email("admin@hbnb.io")["id"]
+            state = _app.extensions["current_user_loader"]
+            state.entries[(user_id, 0)] = (object(), time.monotonic() + 60)
+            facade.admin_update_user(user_id, {"first_name": "Admin"})
+            self.assertNotIn((user_id, 0), state.entries)
+            user_loader.invalidate("missing")
+
+    def test_03_token_of_missing_user(self):
+        """A token whose user no longer exists cannot create a place."""
+        from flask_jwt_extended import create_access_token
+
+        with _app.app_context():
+            token = create_access_token(identity="missing-user")
+        r = self._create_place(token, "Nobody's Place")
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("does not exist", r.json["message"])
+
+
+# ---------------------------------------------------------------------------
+# Uniqueness enforced by database constraints
+# ---------------------------------------------------------------------------
+
+class TestUniqueConstraints(unittest.TestCase):
+
+    def test_01_user_creation_skips_email_lookup(self):
+        """POST /users runs no email lookup; a duplicate email still returns 400."""
+        payload = {"first_name": "Una", "last_name": "Nique",
+                   "email": "unique@example.com", "password": "secret123"}
+        with _count_queries() as statements:
+            r = _post("/api/v1/users/", json=payload)
+        self.assertEqual(r.status_code, 201)
+        self.assertFalse(any("WHERE users.email" in st for st in statements))
+
+        r = _post("/api/v1/users/", json=dict(payload, email="Unique@Example.com"))
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json["message"], "Email already registered")
+
+    def test_02_duplicate_review_rejected_by_index(self):
+        """A second review of the same place by the same user returns 400 without a reviews scan."""
+        r = _post("/api/v1/places/", json={
+            "title": "Reviewed Once", "price": 25.0, "latitude": 3.0, "longitude": 3.0
+        }, token=_state["user_token"])
+        payload = {"text": "Nice", "rating": 4, "place_id": r.json["id"]}
+        self.assertEqual(_post("/api/v1/reviews/", json=payload, token=_state["user2_token"]).status_code, 201)
+
+        with _count_queries() as statements:
+            r = _post("/api/v1/reviews/", json=payload, token=_state["user2_token"])
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json["message"], "You have already reviewed this place")
+        self.assertEqual(statements.selects_from("reviews"), 0)
+
+    def test_03_amenity_rename_saved_and_checked(self):
+        """Renaming an amenity is saved, and renaming onto a taken name returns 400."""
+        r = _post("/api/v1/amenities/", json={"name": "Plunge Pool"}, token=_state["admin_token"])
+        _post("/api/v1/amenities/", json={"name": "Hot Tub"}, token=_state["admin_token"])
+        amenity_id = r.json["id"]
+
+        r = _put(f"/api/v1/amenities/{amenity_id}", json={"name": "Hot Tub"}, token=_state["admin_token"])
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json["message"], "Amenity 'Hot Tub' already exists")
+
+        r = _put(f"/api/v1/amenities/{amenity_id}", json={"name": "Steam Room"}, token=_state["admin_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(_get(f"/api/v1/amenities/{amenity_id}").json["name"], "Steam Room")
+
+    def test_04_review_index_added_to_existing_table(self):
+        """The unique review index is created at startup on a reviews table that lacks it."""
+        from sqlalchemy import inspect, text
+        from app.persistence.indexes import ensure_indexes
+
+        with _app.app_context():
+            _db.session.execute(text("DROP INDEX uq_reviews_user_place"))
+            _db.session.commit()
+            report = ensure_indexes(_db.engine, _db.metadata)
+            names = [ix["name"] for ix in inspect(_db.engine).get_indexes("reviews")]
+        self.assertEqual(report, {"created": ["uq_reviews_user_place"], "duplicates": {}})
+        self.assertIn("uq_reviews_user_place", names)
+
+    def test_05_duplicates_reported_instead_of_indexed(self):
+        """Existing duplicate reviews are reported and leave the index out until resolved."""
+        import uuid
+        from sqlalchemy import inspect, text
+        from app.persistence.indexes import ensure_indexes
+
+        duplicate_id = str(uuid.uuid4())
+        with _app.app_context():
+            _db.session.execute(text("DROP INDEX uq_reviews_user_place"))
+            _db.session.execute(text(
+                "INSERT INTO reviews (id, text, rating, user_id, place_id, created_at, updated_at) "
+                "SELECT :id, text, rating, user_id, place_id, created_at, updated_at "
+                "FROM reviews LIMIT 1"), {"id": duplicate_id})
+            _db.session.commit()
+            try:
+                report = ensure_indexes(_db.engine, _db.metadata)
+                names = [ix["name"] for ix in inspect(_db.engine).get_indexes("reviews")]
+            finally:
+                _db.session.execute(text("DELETE FROM reviews WHERE id = :id"), {"id": duplicate_id})
+                _db.session.commit()
+                fixed = ensure_indexes(_db.engine, _db.metadata)
+        self.assertEqual(report["created"], [])
+        self.assertEqual([row["count"] for row in report["duplicates"]["uq_reviews_user_place"]], [2])
+        self.assertNotIn("uq_reviews_user_place", names)
+        self.assertEqual(fixed["created"], ["uq_reviews_user_place"])
+
+    def test_06_other_integrity_errors_not_translated(self):
+        """Only the named unique constraint becomes a ValueError; other violations are raised as is."""
+        from sqlalchemy import text
+        from sqlalchemy.exc import IntegrityError
+        from app.services.facade import _unique
+
+        with _app.app_context():
+            with self.assertRaises(IntegrityError):
+                with _unique("Amenity already exists", "amenities.name"):
+                    _db.session.execute(text("INSERT INTO amenities (id) VALUES ('no-name')"))
+                    _db.session.commit()
+            _db.session.execute(text(
+                "INSERT INTO amenities (id, name, created_at, updated_at) "
+                "VALUES ('a1', 'Taken twice', '2024-01-01', '2024-01-01')"))
+            _db.session.commit()
+            with self.assertRaises(IntegrityError):
+                with _unique("Email already registered", "users.email"):
+                    _db.session.execute(text(
+                        "INSERT INTO amenities (id, name, created_at, updated_at) "
+                        "VALUES ('a2', 'Taken twice', '2024-01-01', '2024-01-01')"))
+                    _db.session.commit()
+            with self.assertRaisesRegex(ValueError, "Amenity already exists"):
+                with _unique("Amenity already exists", "amenities.name"):
+                    _db.session.execute(text(
+                        "INSERT INTO amenities (id, name, created_at, updated_at) "
+                        "VALUES ('a3', 'Taken twice', '2024-01-01', '2024-01-01')"))
+                    _db.session.commit()
+            _db.session.execute(text("DELETE FROM amenities WHERE id = 'a1'"))
+            _db.session.commit()
+
+
+# ---------------------------------------------------------------------------
+# Bulk user import
+# ---------------------------------------------------------------------------
+
+class TestUserImport(unittest.TestCase):
+
+    def _import(self, body, content_type, token=None):
+        token = token or _state["admin_token"]
+        return _client.post("/api/v1/users/import", data=body, content_type=content_type,
+                            headers={"Authorization": f"Bearer {token}"})
+
+    def test_01_ndjson_import_reports_row_errors(self):
+        """Valid rows are created; invalid and duplicate rows are reported by line."""
+        import json
+        rows = [
+            {"first_name": "Ada", "last_name": "One", "email": "ada@import.io", "password": "pw1"},
+            {"first_name": "", "last_name": "Two", "email": "two@import.io", "password": "pw2"},
+            {"first_name": "Bob", "last_name": "Three", "email": "ADA@import.io", "password": "pw3"},
+            {"first_name": "Cy", "last_name": "Four", "email": "john@example.com", "password": "pw4"},
+            {"first_name": "Di", "last_name": "Five", "email": "not-an-email", "password": "pw5"},
+            {"first_name": "Ed", "last_name": "Six", "email": "ed@import.io"},
+        ]
+        body = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"
+        r = self._import(body, "application/x-ndjson")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["processed"], 7)
+        self.assertEqual(r.json["created"], 1)
+        self.assertEqual(r.json["errors"], [
+            {"row": 2, "error": "first_name is required"},
+            {"row": 3, "error": "Email already registered"},
+            {"row": 5, "error": "email format is invalid"},
+            {"row": 6, "error": "password is required"},
+            {"row": 7, "error": "invalid JSON"},
+            {"row": 4, "error": "Email already registered"},
+        ])
+        r = _post("/api/v1/auth/login", json={"email": "ada@import.io", "password": "pw1"})
+        self.assertEqual(r.status_code, 200)
+
+    def test_02_csv_import_in_batches(self):
+        """CSV rows are imported in batches, with progress after each one."""
+        from app.services import facade
+        from app.services.user_import import read_rows
+        import io
+
+        lines = ["first_name,last_name,email,password,is_admin"]
+        lines += [f"Csv,User{i},csv{i}@import.io,secret{i},{'true' if i == 0 else ''}" for i in range(5)]
+        progress = []
+        with _app.app_context():
+            report = facade.import_users(read_rows(io.StringIO("\n".join(lines)), "csv"),
+                                         batch_size=2, progress=lambda rep: progress.append(rep.created))
+            admin = facade.get_user_by_email("csv0@import.io")
+            other = facade.get_user_by_email("csv1@import.io")
+        self.assertEqual(report["created"], 5)
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertTrue(admin["is_admin"])
+        self.assertFalse(other["is_admin"])
+
+        r = self._import("\n".join(lines), "text/csv")
+        self.assertEqual(r.json["created"], 0)
+        self.assertEqual(r.json["failed"], 5)
+
+    def test_03_import_requires_admin(self):
+        """A regular user cannot import users; an unknown format is refused."""
+        r = self._import("{}", "application/x-ndjson", token=_state["user_token"])
+        self.assertEqual(r.status_code, 403)
+        r = _client.post("/api/v1/users/import?format=xml", data="<users/>",
+                         headers={"Authorization": f"Bearer {_state['admin_token']}"})
+        self.assertEqual(r.status_code, 400)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic datasets
+# ---------------------------------------------------------------------------
+
+class TestSyntheticDataset(unittest.TestCase):
+
+    def _generator(self, seed=7):
+        from app.persistence.dataset import DatasetGenerator
+        return DatasetGenerator(users=30, places=40, reviews=300, amenities=25, seed=seed)
+
+    def _rows(self, generator):
+        return {name: list(rows) for name, rows in generator.tables()}
+
+    def test_01_same_seed_same_rows(self):
+        """A seed always produces the same rows; another seed does not."""
+        self.assertEqual(self._rows(self._generator()), self._rows(self._generator()))
+        self.assertNotEqual(self._rows(self._generator())["places"],
+                            self._rows(self._generator(seed=8))["places"])
+
+    def test_02_rows_respect_model_rules(self):
+        """Generated places are valid and reviews are unique and never by the owner."""
+        from app.models.place import Place
+
+        rows = self._rows(self._generator())
+        owners = {place["id"]: place["owner_id"] for place in rows["places"]}
+        for place in rows["places"]:
+            Place._validate_price(place["price"])
+            Place._validate_latitude(place["latitude"])
+            Place._validate_longitude(place["longitude"])
+        pairs = [(review["user_id"], review["place_id"]) for review in rows["reviews"]]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertTrue(all(owners[place_id] != user_id for user_id, place_id in pairs))
+        self.assertEqual(len({amenity["name"] for amenity in rows["amenities"]}), 25)
+
+    def test_03_sqlalchemy_writer_bulk_inserts(self):
+        """SQLAlchemyWriter writes every table in batches."""
+        from sqlalchemy import create_engine, text
+        from app.persistence.dataset import SQLAlchemyWriter, populate
+
+        engine = create_engine("sqlite://")
+        _db.metadata.create_all(engine)
+        written = populate(self._generator(), SQLAlchemyWriter(engine, batch_size=64))
+        with engine.connect() as conn:
+            for table in ("users", "places", "reviews", "place_amenity"):
+                count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                self.assertEqual(count, written[table])
+        self.assertEqual(written["reviews"], 300)
+
+    def test_04_in_memory_writer(self):
+        """InMemoryWriter fills repositories and links amenities to places."""
+        from app.persistence.dataset import InMemoryWriter, populate
+        from app.persistence.repository import InMemoryRepository
+
+        repos = {name: InMemoryRepository() for name in ("users", "amenities", "places", "reviews")}
+        written = populate(self._generator(), InMemoryWriter(repos))
+        self.assertEqual(len(repos["reviews"].get_all()), 300)
+        linked = sum(len(place.amenities) for place in repos["places"].get_all())
+        self.assertEqual(linked, written["place_amenity"])
+
+
+# ---------------------------------------------------------------------------
+# Query budgets
+# ---------------------------------------------------------------------------
+
+# Most SQL statements each endpoint may run, whatever the number of rows
+QUERY_BUDGETS = {
+    # places; no relationship (PlaceRepository.LIST_LOAD)
+    "GET /places/": 1,
+    # place + owner (join), amenities (selectin), reviews + authors (selectin + join)
+    "GET /places/<id>": 3,
+    # amenity per id given, insert place, insert links, refresh place after commit
+    "POST /places/": 4,
+    # place, update, refresh place, amenities for the response
+    "PUT /places/<id>": 4,
+    # owner of the place, then one DELETE each for reviews, amenity links, the place
+    "DELETE /places/<id>": 4,
+    # one DELETE each: own reviews, reviews of owned places, their links, places, user
+    "DELETE /users/<id>": 5,
+    # one DELETE each: amenity links, the amenity
+    "DELETE /amenities/<id>": 2,
+    "GET /users/": 1,
+    "GET /users/<id>": 1,
+    "POST /users/": 2,
+    "PUT /users/<id>": 3,
+    "GET /reviews/": 1,
+    "GET /reviews/<id>": 1,
+    # place (own columns only), insert, refresh review
+    "POST /reviews/": 3,
+    "PUT /reviews/<id>": 3,
+    "DELETE /reviews/<id>": 2,
+    "GET /amenities/": 1,
+    "GET /amenities/<id>": 1,
+    "POST /amenities/": 2,
+    "PUT /amenities/<id>": 3,
+    "POST /auth/login": 1,
+}
+
+
+class TestQueryBudgets(unittest.TestCase):
+    """Endpoints stay within their query budget and run no N+1 pattern."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Enough rows that a per-row query would show up as a repeated shape
+        for i in range(3):
+            r = _post("/api/v1/places/", json={
+                "title": f"Budget {i}", "price": 10.0 + i, "latitude": 1.0, "longitude": 1.0,
+                "amenities": [_state["amenity_id"]]
+            }, token=_state["user_token"])
+            _post("/api/v1/reviews/", json={"text": "Budget review", "rating": 3,
+                                            "place_id": r.json["id"]}, token=_state["user2_token"])
+        cls.place_id = r.json["id"]
+        cls.user_id = _get(f"/api/v1/places/{cls.place_id}").json["owner_id"]
+
+    def _check(self, name, send, expected=200):
+        with _count_queries() as statements:
+            r = send()
+        statements = statements.per_request()
+        self.assertEqual(r.status_code, expected, r.get_json())
+        self.assertLessEqual(len(statements), QUERY_BUDGETS[name],
+                             f"{name} ran {len(statements)} queries:\n" + "\n".join(statements))
+        self.assertEqual(statements.repeated(), {}, f"{name} looks like an N+1")
+        return r
+
+    def test_01_place_endpoints(self):
+        """Place list, detail, create and update."""
+        self._check("GET /places/", lambda: _get("/api/v1/places/"))
+        self._check("GET /places/<id>", lambda: _get(f"/api/v1/places/{self.place_id}"))
+        self._check("POST /places/", lambda: _post("/api/v1/places/", json={
+            "title": "Budget new", "price": 50.0, "latitude": 2.0, "longitude": 2.0,
+            "amenities": [_state["amenity_id"]]}, token=_state["user_token"]), 201)
+        self._check("PUT /places/<id>", lambda: _put(f"/api/v1/places/{self.place_id}",
+                                                     json={"price": 12.5}, token=_state["user_token"]))
+
+    def test_02_user_endpoints(self):
+        """User list, detail, create and update."""
+        self._check("GET /users/", lambda: _get("/api/v1/users/"))
+        self._check("GET /users/<id>", lambda: _get(f"/api/v1/users/{self.user_id}"))
+        self._check("POST /users/", lambda: _post("/api/v1/users/", json={
+            "first_name": "Budget", "last_name": "User", "email": "budget@example.com",
+            "password": "secret123"}), 201)
+        self._check("PUT /users/<id>", lambda: _put(f"/api/v1/users/{self.user_id}",
+                                                   json={"last_name": "Doe"}, token=_state["user_token"]))
+
+    def test_03_review_endpoints(self):
+        """Review list, detail, create, update and delete."""
+        r = _post("/api/v1/places/", json={"title": "Budget reviewed", "price": 30.0,
+                                           "latitude": 0.0, "longitude": 0.0}, token=_state["user_token"])
+        place_id = r.json["id"]
+        r = self._check("POST /reviews/", lambda: _post("/api/v1/reviews/", json={
+            "text": "Budget", "rating": 5, "place_id": place_id}, token=_state["user2_token"]), 201)
+        review_id = r.json["id"]
+        self._check("GET /reviews/", lambda: _get("/api/v1/reviews/"))
+        self._check("GET /reviews/<id>", lambda: _get(f"/api/v1/reviews/{review_id}"))
+        self._check("PUT /reviews/<id>", lambda: _put(f"/api/v1/reviews/{review_id}",
+                                                     json={"rating": 4}, token=_state["user2_token"]))
+        self._check("DELETE /reviews/<id>", lambda: _delete(f"/api/v1/reviews/{review_id}",
+                                                           token=_state["user2_token"]))
+
+    def test_04_amenity_and_auth_endpoints(self):
+        """Amenity list, detail, create, update, and login."""
+        self._check("GET /amenities/", lambda: _get("/api/v1/amenities/"))
+        self._check("GET /amenities/<id>", lambda: _get(f"/api/v1/amenities/{_state['amenity_id']}"))
+        r = self._check("POST /amenities/", lambda: _post("/api/v1/amenities/", json={"name": "Budget"},
+                                                          token=_state["admin_token"]), 201)
+        self._check("PUT /amenities/<id>", lambda: _put(f"/api/v1/amenities/{r.json['id']}",
+                                                       json={"name": "Budget 2"}, token=_state["admin_token"]))
+        self._check("POST /auth/login", lambda: _post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"}))
+
+    def test_05_reviews_by_place_single_query(self):
+        """Reviews of a place are loaded with their authors in one query."""
+        from app.services import facade
+        with _app.app_context(), _count_queries() as statements:
+            reviews = facade.get_reviews_by_place(self.place_id)
+        self.assertTrue(reviews and all(r["user_email"] for r in reviews))
+        self.assertEqual(statements.selects_from("users"), 0)
+        self.assertEqual(statements.repeated(threshold=2), {})
+
+    def test_06_repeated_shapes_are_flagged(self):
+        """The detector reports a statement repeated with different parameters."""
+        log = _QueryLog(["SELECT users.id FROM users WHERE users.id = ?"] * 3
+                        + ["SELECT places.id FROM places WHERE places.id IN (?, ?)",
+                           "SELECT places.id FROM places WHERE places.id IN (?, ?, ?)"])
+        self.assertEqual(list(log.repeated().values()), [3])
+        self.assertEqual(log.repeated(threshold=2)[
+            "SELECT places.id FROM places WHERE places.id IN (?)"], 2)
+
+
+# ---------------------------------------------------------------------------
+# NDJSON backup
+# ---------------------------------------------------------------------------
+
+class TestBackup(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from sqlalchemy import create_engine
+        from app.persistence.dataset import DatasetGenerator, SQLAlchemyWriter, populate
+
+        cls.source = create_engine("sqlite://")
+        _db.metadata.create_all(cls.source)
+        cls.written = populate(DatasetGenerator(users=20, places=30, reviews=120, seed=3),
+                               SQLAlchemyWriter(cls.source))
+
+    def _export(self, compressed=False, batch_size=16):
+        import io
+        from app.persistence.backup import export_database, text_dump
+
+        buffer = io.BytesIO()
+        stream = text_dump(buffer, "w", compressed)
+        with _app.app_context():
+            counts = export_database(self.source, stream, batch_size=batch_size)
+        stream.flush()
+        if compressed:
+            stream.buffer.close()
+        return counts, buffer.getvalue()
+
+    def _import(self, data, compressed=False, checkpoint=None):
+        import io
+        from sqlalchemy import create_engine
+        from app.persistence.backup import import_database, text_dump
+
+        engine = create_engine("sqlite://")
+        _db.metadata.create_all(engine)
+        with _app.app_context():
+            counts = import_database(engine, text_dump(io.BytesIO(data), "r", compressed),
+                                     batch_size=25, checkpoint=checkpoint)
+        return engine, counts
+
+    def _dump_lines(self, engine):
+        import io
+        from app.persistence.backup import export_database
+
+        stream = io.StringIO()
+        with _app.app_context():
+            export_database(engine, stream)
+        return stream.getvalue().splitlines()
+
+    def test_01_round_trip(self):
+        """An export restored into an empty database gives the same dump back."""
+        counts, data = self._export()
+        self.assertEqual(counts, self.written)
+        engine, restored = self._import(data)
+        self.assertEqual(restored, self.written)
+        self.assertEqual(self._dump_lines(engine), data.decode().splitlines())
+
+    def test_02_gzip(self):
+        """Compressed dumps are smaller and restore the same rows."""
+        _, plain = self._export()
+        _, compressed = self._export(compressed=True)
+        self.assertLess(len(compressed), len(plain))
+        engine, restored = self._import(compressed, compressed=True)
+        self.assertEqual(restored, self.written)
+        self.assertEqual(self._dump_lines(engine), plain.decode().splitlines())
+
+    def test_03_resume_from_checkpoint(self):
+        """A resumed import skips restored lines and tolerates a replayed batch."""
+        import io
+        import os
+        import tempfile
+        from app.persistence.backup import Checkpoint, import_database, text_dump
+
+        _, data = self._export()
+        lines = data.decode().splitlines(keepends=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dump.checkpoint")
+            # First run stopped after the users, its last batch committed but not recorded
+            engine, _ = self._import("".join(lines[:1 + self.written["users"]]).encode(),
+                                     checkpoint=Checkpoint(path))
+            checkpoint = Checkpoint(path)
+            checkpoint.lines = 1 + self.written["users"] - 5
+            checkpoint.rows["users"] = self.written["users"] - 5
+            with _app.app_context():
+                restored = import_database(engine, text_dump(io.BytesIO(data), "r"),
+                                           batch_size=25, checkpoint=checkpoint)
+            self.assertFalse(os.path.exists(path))
+        self.assertEqual(restored, self.written)
+        self.assertEqual(self._dump_lines(engine), data.decode().splitlines())
+
+    def test_04_rejects_other_files(self):
+        """A file without the dump header is refused before anything is inserted."""
+        with self.assertRaises(ValueError):
+            self._import(b'{"email": "someone@example.com"}\n')
+        with self.assertRaises(ValueError):
+            self._import(b"")
+
+    def test_05_resume_drops_existing_keys(self):
+        """The replayed batch loses its existing rows by primary key, composite keys included."""
+        from sqlalchemy import select
+        from app.persistence.backup import _missing_rows
+
+        table = _db.metadata.tables["place_amenity"]
+        with self.source.connect() as conn:
+            existing = [dict(row) for row in conn.execute(select(table).limit(2)).mappings()]
+            new = {"place_id": existing[0]["place_id"], "amenity_id": "not-an-amenity"}
+            missing = _missing_rows(conn, table, existing + [new])
+        self.assertEqual(len(existing), 2)
+        self.assertEqual(missing, [new])
+
+
+# ---------------------------------------------------------------------------
+# SQLite engine profile
+# ---------------------------------------------------------------------------
+
+class TestSQLiteProfile(unittest.TestCase):
+
+    def _app(self, **settings):
+        import os
+        import tempfile
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        config = type("ProfileConfig", (TestConfig,), dict(
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp.name, 'profile.db')}", **settings))
+        app = create_app(config)
+
+        def dispose():
+            with app.app_context():
+                _db.engine.dispose()
+        self.addCleanup(dispose)
+        return app
+
+    def _pragmas(self, app):
+        from app.sqlite_pragmas import read_pragmas
+        with app.app_context(), _db.engine.connect() as conn:
+            return read_pragmas(conn, ["journal_mode", "synchronous", "busy_timeout", "mmap_size"])
+
+    def test_01_production_pragmas_on_every_connection(self):
+        """Every new connection gets the configured pragmas, and the pool options apply."""
+        from config import ProductionConfig
+        app = self._app(SQLITE_PRAGMAS=ProductionConfig.SQLITE_PRAGMAS,
+                        SQLALCHEMY_ENGINE_OPTIONS=dict(ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS,
+                                                       pool_size=3))
+        self.assertEqual(self._pragmas(app), {"journal_mode": "wal", "synchronous": 1,
+                                              "busy_timeout": 5000, "mmap_size": 256 * 1024 * 1024})
+        with app.app_context():
+            _db.engine.dispose()
+            self.assertEqual(_db.engine.pool.size(), 3)
+            self.assertTrue(_db.engine.pool._pre_ping)
+        self.assertEqual(self._pragmas(app)["synchronous"], 1)
+
+    def test_02_defaults_without_profile(self):
+        """Without SQLITE_PRAGMAS connections keep SQLite's defaults."""
+        pragmas = self._pragmas(self._app())
+        self.assertEqual(pragmas["journal_mode"], "delete")
+        self.assertEqual(pragmas["synchronous"], 2)
+
+
+# ---------------------------------------------------------------------------
+# Read/write splitting
+# ---------------------------------------------------------------------------
+
+class TestReadReplica(unittest.TestCase):
+    """The replica is a separate file here, so it lags behind every write."""
+
+    def _app(self, **settings):
+        import os
+        import tempfile
+        from sqlalchemy import create_engine
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        primary, replica = (os.path.join(tmp.name, name) for name in ("primary.db", "replica.db"))
+        config = type("ReplicaConfig", (TestConfig,), dict(
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{primary}",
+            SQLALCHEMY_READ_URI=f"sqlite:///{replica}", **settings))
+        app = create_app(config)
+        with app.app_context():
+            _db.create_all()
+        self.replica = create_engine(f"sqlite:///{replica}")
+        _db.metadata.create_all(self.replica)
+
+        def dispose():
+            self.replica.dispose()
+            with app.app_context():
+                for engine in _db.engines.values():
+                    engine.dispose()
+        self.addCleanup(dispose)
+        return app
+
+    def _replicate_amenity(self, amenity_id, name):
+        from datetime import datetime
+        with self.replica.begin() as conn:
+            conn.execute(_db.metadata.tables["amenities"].insert(), {
+                "id": amenity_id, "name": name,
+                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()})
+
+    def test_01_reads_use_the_replica(self):
+        """Read-only calls are answered from the read engine."""
+        app = self._app()
+        amenity_id = "0192f5a0-0000-7000-8000-000000000001"
+        self._replicate_amenity(amenity_id, "Observatory")
+        r = app.test_client().get(f"/api/v1/amenities/{amenity_id}")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.get_json()["name"], "Observatory")
+        with app.app_context():
+            from app.models.amenity import Amenity
+            self.assertIsNone(_db.session.get(Amenity, amenity_id))
+
+    def test_02_read_your_writes(self):
+        """After a commit, the rest of the app context reads the primary."""
+        from app.services import facade
+        app = self._app()
+        with app.app_context():
+            amenity_id = facade.create_amenity({"name": "Rooftop"})["id"]
+            self.assertEqual(facade.get_amenity(amenity_id)["name"], "Rooftop")
+        with app.app_context(), self.assertRaises(ValueError):
+            facade.get_amenity(amenity_id)
+
+    def test_03_read_your_writes_disabled(self):
+        """With READ_YOUR_WRITES off, reads stay on the lagging replica."""
+        from app.services import facade
+        app = self._app(READ_YOUR_WRITES=False)
+        with app.app_context():
+            amenity_id = facade.create_amenity({"name": "Rooftop"})["id"]
+            with self.assertRaises(ValueError):
+                facade.get_amenity(amenity_id)
+
+    def test_04_updates_load_from_the_primary(self):
+        """A row changed by the facade is loaded from and written to the primary."""
+        from app.models.amenity import Amenity
+        from app.services import facade
+        app = self._app()
+        with app.app_context():
+            amenity_id = facade.create_amenity({"name": "Cellar"})["id"]
+        self._replicate_amenity(amenity_id, "Cellar")
+        with app.app_context():
+            self.assertEqual(facade.update_amenity(amenity_id, {"name": "Wine cellar"})["name"],
+                             "Wine cellar")
+        with app.app_context():
+            self.assertEqual(_db.session.get(Amenity, amenity_id).name, "Wine cellar")
+            self.assertEqual(facade.get_amenity(amenity_id)["name"], "Cellar")
+
+
+# ---------------------------------------------------------------------------
+# Primary key ids
+# ---------------------------------------------------------------------------
+
+class TestIds(unittest.TestCase):
+
+    def test_01_uuid7_is_time_ordered(self):
+        """UUIDv7 ids carry their creation time and sort in creation order."""
+        import uuid
+        from app.models.types import uuid7, uuid7_time
+
+        ids = [str(uuid7()) for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(uuid.UUID(ids[0]).version, 7)
+        self.assertAlmostEqual(uuid7_time(ids[-1]), time.time(), delta=5)
+
+    def test_02_new_rows_get_uuid7_ids(self):
+        """Created rows get UUIDv7 ids unless ID_VERSION is 4."""
+        import uuid
+        r = _post("/api/v1/amenities/", json={"name": "Game room"}, token=_state["admin_token"])
+        self.assertEqual(uuid.UUID(r.json["id"]).version, 7)
+
+        from app.models.types import new_id
+        version4 = create_app(type("V4Config", (TestConfig,), {"ID_VERSION": 4}))
+        with version4.app_context():
+            self.assertEqual(uuid.UUID(new_id()).version, 4)
+
+    def test_03_binary_storage(self):
+        """Binary ids are stored as 16 bytes and read back as strings."""
+        from sqlalchemy import Column, MetaData, Table, create_engine, select, text
+        from app.models.types import UUID, new_id
+
+        table = Table("things", MetaData(), Column("id", UUID("binary"), primary_key=True))
+        engine = create_engine("sqlite://")
+        table.metadata.create_all(engine)
+        thing_id = new_id()
+        with engine.begin() as conn:
+            conn.execute(table.insert(), [{"id": thing_id}])
+            self.assertEqual(conn.execute(text("SELECT length(id), typeof(id) FROM things")).one(),
+                             (16, "blob"))
+            self.assertEqual(conn.execute(select(table.c.id).where(table.c.id == thing_id.upper()))
+                             .scalar(), thing_id)
+            self.assertIsNone(conn.execute(select(table.c.id).where(table.c.id == "not-a-uuid"))
+                              .scalar())
+
+    def test_04_migration_round_trip(self):
+        """Text ids convert to binary and back, keeping their value and links."""
+        from sqlalchemy import create_engine, text
+        from app.persistence.dataset import DatasetGenerator, SQLAlchemyWriter, populate
+        from app.persistence.id_migration import migrate_ids
+
+        engine = create_engine("sqlite://")
+        _db.metadata.create_all(engine)
+        written = populate(DatasetGenerator(users=10, places=15, reviews=40, seed=5),
+                           SQLAlchemyWriter(engine))
+        # Start from text ids, whatever HBNB_ID_STORAGE the models use
+        migrate_ids(engine, "text")
+        query = text("SELECT reviews.id, users.email FROM reviews JOIN users ON users.id = "
+                     "reviews.user_id JOIN places ON places.id = reviews.place_id ORDER BY reviews.id")
+        with engine.connect() as conn:
+            before = conn.execute(query).all()
+
+        report = migrate_ids(engine, "binary")
+        self.assertEqual(report["converted"]["reviews.id"], written["reviews"])
+        self.assertEqual(report["unconverted"], {})
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT DISTINCT typeof(owner_id) FROM places")).all(),
+                             [("blob",)])
+            self.assertEqual(len(conn.execute(query).all()), len(before))
+        self.assertEqual(migrate_ids(engine, "binary")["converted"]["reviews.id"], 0)
+
+        migrate_ids(engine, "text")
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(query).all(), before)
+
+
+# ---------------------------------------------------------------------------
+# Bulk place import
+# ---------------------------------------------------------------------------
+
+class TestPlaceImport(unittest.TestCase):
+
+    ROWS = [
+        {"title": "  Loft  ", "price": 80, "latitude": 48.8, "longitude": 2.3},
+        {"title": "   ", "price": 80, "latitude": 0, "longitude": 0},
+        {"title": "x" * 101, "price": "80", "latitude": 0, "longitude": 0},
+        {"title": "Hut", "price": 0, "latitude": 0, "longitude": 0},
+        {"title": "Hut", "price": 10, "latitude": 90.5, "longitude": None},
+        {"title": "Hut", "price": 10, "latitude": True, "longitude": -181},
+        {"title": None, "price": "free", "latitude": 0, "longitude": 0},
+        {"title": "Hut", "price": 10 ** 400, "latitude": -90, "longitude": 180},
+        {"title": "Hut", "description": {"x": 1}, "price": 10, "latitude": 0, "longitude": 0},
+        {"title": "Hut", "description": 5, "price": "free", "latitude": 0, "longitude": 0},
+    ]
+
+    @staticmethod
+    def _columns(rows):
+        from app.services.place_import import COLUMNS
+        return {name: [row.get(name) for row in rows] for name in COLUMNS}
+
+    @staticmethod
+    def _place_error(row):
+        from app.models.place import Place
+        try:
+            Place(row["title"], row.get("description"), row["price"], row["latitude"],
+                  row["longitude"], "owner")
+        except ValueError as e:
+            return str(e)
+        return None
+
+    def test_01_column_checks_match_place(self):
+        """Each row gets the message the Place model raises first, or None."""
+        from app.services.place_import import validate_place_columns
+
+        with _app.app_context():
+            checked = validate_place_columns(self._columns(self.ROWS))
+            expected = [self._place_error(row) for row in self.ROWS]
+        self.assertEqual(checked.errors, expected)
+        self.assertEqual(checked.errors[0], None)
+        self.assertEqual(list(checked.valid), [error is None for error in expected])
+        self.assertEqual([row["title"] for row in checked.rows()], ["Loft"])
+        # A row breaking several rules is flagged by each of them
+        self.assertTrue(checked.masks["title_type"][6] and checked.masks["price_type"][6])
+
+    def test_02_numpy_and_fallback_agree(self):
+        """The NumPy path and the row by row fallback give the same result."""
+        from app.services import place_import
+
+        if place_import.np is None:
+            self.skipTest("NumPy is not installed")
+        columns = self._columns(self.ROWS * 3)
+        with _app.app_context():
+            arrays = place_import._validate_arrays(columns, len(self.ROWS) * 3)
+            rows = place_import._validate_rows(columns, len(self.ROWS) * 3)
+        self.assertEqual(arrays.errors, rows.errors)
+        for rule in arrays.masks:
+            self.assertEqual(list(arrays.masks[rule]), list(rows.masks[rule]), rule)
+        self.assertEqual(list(arrays.rows()), list(rows.rows()))
+
+    def test_03_import_endpoint(self):
+        """Valid rows are inserted; invalid rows and unknown owners are reported by line."""
+        import json
+        from app.services import facade
+
+        with _app.app_context():
+            owner_id = facade.get_user_by_email("john@example.com")["id"]
+        rows = [dict(row, owner_id=owner_id) for row in self.ROWS]
+        rows.append({"title": "Ghost house", "price": 5, "latitude": 1, "longitude": 1,
+                     "owner_id": "00000000-0000-7000-8000-000000000000"})
+        body = "\n".join(json.dumps(row) for row in rows) + "\n[]\n"
+        r = _client.post("/api/v1/places/import", data=body, content_type="application/x-ndjson",
+                         headers={"Authorization": f"Bearer {_state['admin_token']}"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["processed"], 12)
+        self.assertEqual(r.json["created"], 1)
+        errors = {error["row"]: error["error"] for error in r.json["errors"]}
+        self.assertEqual(errors[2], "title is required")
+        self.assertEqual(errors[8], "price must be a number")
+        self.assertEqual(errors[9], "description must be a string")
+        self.assertEqual(errors[10], "description must be a string")
+        self.assertEqual(errors[11], "Owner 00000000-0000-7000-8000-000000000000 does not exist")
+        self.assertEqual(errors[12], "row must be a JSON object")
+        self.assertNotIn(1, errors)
+
+        places = [p for p in _get("/api/v1/places/").json if p["title"] == "Loft"]
+        self.assertEqual(len(places), 1)
+        self.assertEqual(places[0]["owner_id"], owner_id)
+
+    def test_04_csv_import_requires_admin(self):
+        """CSV numbers are parsed; regular users cannot import places."""
+        from app.services import facade
+
+        with _app.app_context():
+            owner_id = facade.get_user_by_email("john@example.com")["id"]
+        body = ("title,description,price,latitude,longitude,owner_id\n"
+                f"Csv cabin,By the lake,55.5,45,-73,{owner_id}\n"
+                f"Csv tent,,cheap,45,-73,{owner_id}\n")
+        r = _client.post("/api/v1/places/import", data=body, content_type="text/csv",
+                         headers={"Authorization": f"Bearer {_state['user_token']}"})
+        self.assertEqual(r.status_code, 403)
+
+        r = _client.post("/api/v1/places/import", data=body, content_type="text/csv",
+                         headers={"Authorization": f"Bearer {_state['admin_token']}"})
+        self.assertEqual(r.json["created"], 1)
+        self.assertEqual(r.json["errors"], [{"row": 3, "error": "price must be a number"}])
+        cabin_id = [p for p in _get("/api/v1/places/").json if p["title"] == "Csv cabin"][0]["id"]
+        cabin = _get(f"/api/v1/places/{cabin_id}").json
+        self.assertEqual((cabin["price"], cabin["description"]), (55.5, "By the lake"))
+
+
+# ---------------------------------------------------------------------------
+# Relationship loading strategies
+# ---------------------------------------------------------------------------
+
+class TestLoadingStrategies(unittest.TestCase):
+    """Each strategy's query count, for the place list and detail."""
+
+    @classmethod
+    def setUpClass(cls):
+        amenities = [_post("/api/v1/amenities/", json={"name": f"Loading {i}"},
+                           token=_state["admin_token"]).json["id"] for i in range(3)]
+        cls.amenity_ids = amenities
+        with _count_queries() as statements:
+            r = _post("/api/v1/places/", json={
+                "title": "Loading loft", "price": 70.0, "latitude": 3.0, "longitude": 3.0,
+                "amenities": amenities}, token=_state["user_token"])
+        # The amenities are read once each, not refreshed again after the commit
+        cls.create_queries = len(statements.per_request())
+        cls.place_id = r.json["id"]
+
+    def _load(self, fetch):
+        """Run fetch() in a fresh session; return its result and query count."""
+        with _app.app_context(), _count_queries() as statements:
+            result = fetch()
+            return result, len(statements)
+
+    def test_01_list_strategies(self):
+        """The list loads no relationship by default; selectin adds one query, joined none."""
+        from app.services import facade
+        repo = facade.place_repo
+
+        def amenity_count(load):
+            def fetch():
+                place = next(p for p in repo.get_all(load=load) if p.id == self.place_id)
+                return len(place.amenities)
+            return self._load(fetch)
+
+        _, queries = self._load(lambda: repo.get_all(load=repo.LIST_LOAD))
+        self.assertEqual(queries, 1)
+        self.assertEqual(amenity_count({"amenities": "noload"}), (0, 1))
+        self.assertEqual(amenity_count({"amenities": "lazy"}), (3, 2))
+        self.assertEqual(amenity_count({"amenities": "selectin"}), (3, 2))
+        self.assertEqual(amenity_count({"amenities": "joined"}), (3, 1))
+
+    def test_02_detail_strategies(self):
+        """The detail loads everything in three queries; load can narrow it."""
+        from app.services import facade
+
+        details, queries = self._load(lambda: facade.get_place(self.place_id))
+        self.assertEqual(queries, 3)
+        self.assertEqual(sorted(a["id"] for a in details["amenities"]), sorted(self.amenity_ids))
+
+        bare, queries = self._load(lambda: facade.get_place(self.place_id, load={"*": "noload"}))
+        self.assertEqual(queries, 1)
+        self.assertEqual((bare["owner"], bare["amenities"], bare["reviews"]), (None, [], []))
+
+    def test_03_create_queries_do_not_grow_with_amenities(self):
+        """POST /places/ with three amenities stays within the one-amenity budget plus two reads."""
+        self.assertEqual(self.create_queries, QUERY_BUDGETS["POST /places/"] + 2)
+
+    def test_04_invalid_load(self):
+        """Unknown strategies and relationships are refused."""
+        from app.services import facade
+        with _app.app_context():
+            with self.assertRaises(ValueError):
+                facade.place_repo.get_all(load={"amenities": "eager"})
+            with self.assertRaises(ValueError):
+                facade.place_repo.get_all(load={"reviews.title": "joined"})
+
+    def test_05_list_then_detail_in_one_session(self):
+        """Places still held from the list are read in full by a later detail load."""
+        from app.services import facade
+        repo = facade.place_repo
+        with _app.app_context():
+            held = repo.get_all(load=repo.LIST_LOAD)
+            details = repo.get_place_details(self.place_id)
+            self.assertEqual(len(details.amenities), 3)
+            # noload would have left the held place with no amenities
+            self.assertIn(details, held)
+
+# ---------------------------------------------------------------------------
+# Cascading deletes
+# ---------------------------------------------------------------------------
+
+class TestCascadingDeletes(unittest.TestCase):
+    """Users, places and amenities are deleted with set-based cascades."""
+
+    def _user(self, name):
+        email = f"{name}@cascade.io"
+        user_id = _post("/api/v1/users/", json={"first_name": name, "last_name": "Cascade", "email": email,
+                                                "password": "secret123"}, token=_state["admin_token"]).json["id"]
+        r = _post("/api/v1/auth/login", json={"email": email, "password": "secret123"})
+        return user_id, r.json["access_token"]
+
+    def _place(self, token, title, amenities=()):
+        return _post("/api/v1/places/", json={"title": title, "price": 40.0, "latitude": 5.0,
+                                              "longitude": 5.0, "amenities": list(amenities)},
+                     token=token).json["id"]
+
+    @staticmethod
+    def _reviews_for(place_id, count):
+        """Insert `count` reviews of a place by as many new users, directly."""
+        from datetime import datetime
+        from sqlalchemy import insert
+        from app.models.review import Review
+        from app.models.types import new_id
+        from app.models.user import User
+
+        now = datetime.utcnow()
+        users = [{"id": new_id(), "first_name": "Bulk", "last_name": "Reviewer",
+                  "email": f"bulk-{i}-{place_id}@cascade.io", "password": "x", "is_admin": False,
+                  "created_at": now, "updated_at": now} for i in range(count)]
+        with _app.app_context():
+            _db.session.execute(insert(User), users)
+            _db.session.execute(insert(Review), [
+                {"id": new_id(), "text": "Bulk", "rating": 4, "user_id": user["id"],
+                 "place_id": place_id, "created_at": now, "updated_at": now} for user in users])
+            _db.session.commit()
+
+    def _delete(self, name, path, token):
+        with _count_queries() as statements:
+            r = _delete(path, token=token)
+        statements = statements.per_request()
+        self.assertLessEqual(len(statements), QUERY_BUDGETS[name], "\n".join(statements))
+        return r
+
+    def test_01_delete_place(self):
+        """Only the owner or an admin deletes a place; its reviews and links go with it."""
+        owner_id, token = self._user("placeowner")
+        place_id = self._place(token, "Doomed loft", [_state["amenity_id"]])
+        self._reviews_for(place_id, 30)
+
+        r = _delete(f"/api/v1/places/{place_id}", token=_state["user2_token"])
+        self.assertEqual(r.status_code, 403)
+        r = self._delete("DELETE /places/<id>", f"/api/v1/places/{place_id}", token)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["deleted"], {"reviews": 30, "place_amenity": 1, "places": 1})
+        self.assertEqual(_get(f"/api/v1/places/{place_id}").status_code, 404)
+        self.assertEqual(_get(f"/api/v1/amenities/{_state['amenity_id']}").status_code, 200)
+        self.assertEqual(_delete(f"/api/v1/places/{place_id}", token=token).status_code, 404)
+
+    def test_02_delete_user(self):
+        """Deleting a host removes their places, every review of them, and their own reviews."""
+        host_id, token = self._user("host")
+        places = [self._place(token, f"Host place {i}", [_state["amenity_id"]]) for i in range(2)]
+        for place_id in places:
+            self._reviews_for(place_id, 25)
+        _post("/api/v1/reviews/", json={"text": "Visited", "rating": 5, "place_id": _state["place_id"]},
+              token=token)
+
+        r = _delete(f"/api/v1/users/{host_id}", token=_state["user2_token"])
+        self.assertEqual(r.status_code, 403)
+        r = self._delete("DELETE /users/<id>", f"/api/v1/users/{host_id}", _state["admin_token"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json["deleted"], {"reviews": 51, "place_amenity": 2, "places": 2, "users": 1})
+        self.assertEqual(_get(f"/api/v1/users/{host_id}").status_code, 404)
+        self.assertTrue(all(_get(f"/api/v1/places/{p}").status_code == 404 for p in places))
+        self.assertEqual(_delete(f"/api/v1/users/{host_id}", token=_state["admin_token"]).status_code, 404)
+
+    def test_03_users_delete_themselves(self):
+        """A regular user can delete their own account, then no longer log in."""
+        user_id, token = self._user("leaver")
+        r = _delete(f"/api/v1/users/{user_id}", token=token)
+        self.assertEqual(r.json["deleted"]["users"], 1)
+        r = _post("/api/v1/auth/login", json={"email": "leaver@cascade.io", "password": "secret123"})
+        self.assertEqual(r.status_code, 401)
+
+    def test_04_delete_amenity(self):
+        """Only admins delete amenities; the places keep everything but the link."""
+        amenity_id = _post("/api/v1/amenities/", json={"name": "Cascade sauna"},
+                           token=_state["admin_token"]).json["id"]
+        place_id = self._place(_state["user_token"], "Sauna house", [amenity_id])
+
+        r = _delete(f"/api/v1/amenities/{amenity_id}", token=_state["user_token"])
+        self.assertEqual(r.status_code, 403)
+        r = self._delete("DELETE /amenities/<id>", f"/api/v1/amenities/{amenity_id}", _state["admin_token"])
+        self.assertEqual(r.json["deleted"], {"place_amenity": 1, "amenities": 1})
+        self.assertEqual(_get(f"/api/v1/places/{place_id}").json["amenities"], [])
+        r = _delete(f"/api/v1/amenities/{amenity_id}", token=_state["admin_token"])
+        self.assertEqual(r.status_code, 404)
+
+    def test_05_cascade_is_one_transaction(self):
+        """A failing statement rolls back the ones before it."""
+        from sqlalchemy import delete, func, select, text
+        from app.models.review import Review
+        from app.persistence.repository import _delete_all
+
+        with _app.app_context():
+            before = _db.session.scalar(select(func.count()).select_from(Review))
+            with self.assertRaises(Exception):
+                _delete_all([("reviews", delete(Review)), ("missing", text("DELETE FROM no_such_table"))])
+            self.assertEqual(_db.session.scalar(select(func.count()).select_from(Review)), before)
+
+    def test_06_foreign_key_index_added_at_startup(self):
+        """A foreign key index missing from an older database is created at startup, not on delete."""
+        from sqlalchemy import inspect, text
+        from app.persistence.indexes import ensure_indexes
+
+        with _app.app_context():
+            _db.session.execute(text("DROP INDEX ix_place_amenity_amenity_id"))
+            _db.session.commit()
+            report = ensure_indexes(_db.engine, _db.metadata)
+            names = [ix["name"] for ix in inspect(_db.engine).get_indexes("place_amenity")]
+        self.assertEqual(report, {"created": ["ix_place_amenity_amenity_id"], "duplicates": {}})
+        self.assertIn("ix_place_amenity_amenity_id", names)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -134,12 +134,46 @@ async function fetchPlaceDetails(placeId, token) {
   }
 }
 
-// Fetch full details for all places in parallel
+// Maximum number of sub-requests the API accepts in one batch
+const BATCH_MAX_REQUESTS = 50;
+
+// Fetch full details for a group of places in a single batch request
+async function fetchPlaceDetailsBatch(places, token) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (token) headers['Authorization'] = `Bearer ${token}`;
+
+  const body = {
+    requests: places.map(place => ({
+      method: 'GET',
+      path: `/places/${encodeURIComponent(place.id)}`
+    }))
+  };
+  const res = await fetch(`${API_BASE_URL}/batch`, {
+    method: 'POST',
+    headers,
+    body: JSON.stringify(body)
+  });
+  if (!res.ok) throw new Error(`Failed to fetch place details batch (${res.status})`);
+  const data = await res.json();
+  return (data.responses || []).map(r => (r.status === 200 ? r.body : null));
+}
+
+// Fetch full details for all places, BATCH_MAX_REQUESTS at a time
 async function fetchAllPlaceDetails(places, token) {
+  try {
+    const chunks = [];
+    for (let i = 0; i < places.length; i += BATCH_MAX_REQUESTS) {
+      chunks.push(places.slice(i, i + BATCH_MAX_REQUESTS));
+    }
+    const results = await Promise.all(chunks.map(chunk => fetchPlaceDetailsBatch(chunk, token)));
+    // Filter out any null responses
+    return results.flat().filter(p => p !== null);
+  } catch (err) {
+    console.error('index.js: batch fetch failed, falling back to one request per place', err);
+  }
   try {
     const detailPromises = places.map(place => fetchPlaceDetails(place.id, token));
     const detailedPlaces = await Promise.all(detailPromises);
-    // Filter out any null responses
     return detailedPlaces.filter(p => p !== null);
   } catch (err) {
     console.error('index.js: error fetching all place details', err);